@@ -4,12 +4,13 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
 from dotenv import load_dotenv
+from .pool import engine_options_from_env, instrument_pool
 #SQLAlchemy instance to be used in other modules
 db = SQLAlchemy()
 login_manager = LoginManager()
 migrate = Migrate()
 
-def create_app():
+def create_app(test_config=None):
     load_dotenv()
 
     app = Flask(__name__,
@@ -18,6 +19,37 @@ def create_app():
 
 
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "default_key")
+    app.config["MENU_CACHE_SIZE"] = int(os.getenv("MENU_CACHE_SIZE", "256"))
+    # con más platillos que esto el dashboard muestra las categorías colapsadas
+    app.config["DASHBOARD_COLLAPSE_ITEMS"] = int(os.getenv("DASHBOARD_COLLAPSE_ITEMS", "200"))
+    app.config["DASHBOARD_ITEMS_PAGE_SIZE"] = int(os.getenv("DASHBOARD_ITEMS_PAGE_SIZE", "50"))
+    app.config["MENU_IMPORT_MAX_BYTES"] = int(os.getenv("MENU_IMPORT_MAX_BYTES", str(10 * 1024 * 1024)))
+    # segundos que proxies/CDN pueden servir el menú JSON sin revalidar
+    app.config["MENU_API_MAX_AGE"] = int(os.getenv("MENU_API_MAX_AGE", "30"))
+    app.config["MENU_API_STALE_WHILE_REVALIDATE"] = int(os.getenv("MENU_API_STALE_WHILE_REVALIDATE", "300"))
+    app.config["USER_CACHE_ENABLED"] = os.getenv("USER_CACHE_ENABLED", "True").lower() == "true"
+    app.config["USER_CACHE_SIZE"] = int(os.getenv("USER_CACHE_SIZE", "1024"))
+    app.config["USER_CACHE_TTL"] = float(os.getenv("USER_CACHE_TTL", "60"))
+    app.config["UPLOAD_WORKERS"] = int(os.getenv("UPLOAD_WORKERS", "2"))
+    app.config["UPLOAD_MAX_ATTEMPTS"] = int(os.getenv("UPLOAD_MAX_ATTEMPTS", "3"))
+    app.config["UPLOAD_RETRY_DELAY"] = float(os.getenv("UPLOAD_RETRY_DELAY", "2"))
+    app.config["IMAGE_FORMAT"] = os.getenv("IMAGE_FORMAT", "WEBP").upper()
+    app.config["UPLOAD_SPOOL_DIR"] = os.getenv(
+        "UPLOAD_SPOOL_DIR", os.path.join(app.instance_path, "uploads")
+    )
+    # "supabase", "local" o "s3" (ver app/storage.py)
+    app.config["STORAGE_BACKEND"] = os.getenv("STORAGE_BACKEND", "supabase").lower()
+    app.config["SUPABASE_URL"] = os.getenv("SUPABASE_URL")
+    app.config["SUPABASE_KEY"] = os.getenv("SUPABASE_KEY")
+    app.config["SUPABASE_BUCKET"] = os.getenv("SUPABASE_BUCKET", "images")
+    app.config["LOCAL_STORAGE_DIR"] = os.getenv(
+        "LOCAL_STORAGE_DIR", os.path.join(app.instance_path, "media")
+    )
+    app.config["LOCAL_STORAGE_URL"] = os.getenv("LOCAL_STORAGE_URL")
+    app.config["S3_BUCKET"] = os.getenv("S3_BUCKET")
+    app.config["S3_ENDPOINT_URL"] = os.getenv("S3_ENDPOINT_URL")
+    app.config["S3_REGION"] = os.getenv("S3_REGION")
+    app.config["S3_PUBLIC_URL"] = os.getenv("S3_PUBLIC_URL")
 
     USER = os.getenv("user")
     PASSWORD = os.getenv("password")
@@ -28,14 +60,49 @@ def create_app():
     app.config["SQLALCHEMY_DATABASE_URI"] = (
         f"postgresql://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}"
     )
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options_from_env()
+    app.config["METRICS_TOKEN"] = os.getenv("METRICS_TOKEN")
+    # registrar consultas repetidas por petición (siempre activo en modo debug)
+    app.config["N_PLUS_ONE_LOG"] = os.getenv("N_PLUS_ONE_LOG", "False").lower() == "true"
+    app.config["N_PLUS_ONE_THRESHOLD"] = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+    # configuración adicional (p. ej. base de datos local en los tests)
+    if test_config:
+        app.config.from_mapping(test_config)
 
     db.init_app(app)
+    from . import instrumentation
+    with app.app_context():
+        instrument_pool(db.engine)
+        instrumentation.instrument_engine(db.engine)
+    instrumentation.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
     login_manager.login_view = "main.login"
     login_manager.login_message_category = "info"
 
+    from . import cache
+    cache.init_app(app)
+
+    from . import storage
+    storage.init_app(app)
+
+    from .uploads import upload_queue
+    upload_queue.init_app(app)
+
+    from .snapshots import menu_cli
+    app.cli.add_command(menu_cli)
+
+    from .seed import seed_command
+    app.cli.add_command(seed_command)
+
     from .routes import bp as main_bp
     app.register_blueprint(main_bp)
 
+    from .api import bp as api_bp
+    app.register_blueprint(api_bp)
+
+    from .metrics import bp as metrics_bp
+    app.register_blueprint(metrics_bp)
+
     return app
@@ -0,0 +1,52 @@
+from flask import Blueprint, current_app, request, abort, jsonify
+
+from .menu import get_menu_version, menu_json
+from .pagination import InvalidCursor
+from .search import MAX_LIMIT, SEARCHES
+
+bp = Blueprint("api", __name__, url_prefix="/api")
+
+
+@bp.route("/restaurants/<uuid:restaurant_id>/menu")
+def restaurant_menu(restaurant_id):
+    """Menú público en JSON para kioscos y plataformas de domicilios.
+
+    El ETag sale de menu_version: si el cliente ya tiene la versión actual
+    se responde 304 leyendo solo esa columna, sin tocar categorías ni platillos.
+    """
+    version = get_menu_version(restaurant_id)
+    if version is None:
+        abort(404)
+
+    etag = f"{restaurant_id}-{version}"
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(menu_json(restaurant_id, version), mimetype="application/json")
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = (
+        f"public, max-age={current_app.config['MENU_API_MAX_AGE']}, "
+        f"stale-while-revalidate={current_app.config['MENU_API_STALE_WHILE_REVALIDATE']}"
+    )
+    return response
+
+
+@bp.route("/search")
+def search():
+    """Búsqueda por relevancia: ?q=...&type=items|restaurants&limit=20&after=<cursor>."""
+    q = request.args.get("q", "").strip()
+    kind = request.args.get("type", "items")
+    if not q:
+        return jsonify(error="falta el parámetro q"), 400
+    if kind not in SEARCHES:
+        return jsonify(error="type debe ser items o restaurants"), 400
+
+    limit = min(max(request.args.get("limit", 20, type=int), 1), MAX_LIMIT)
+    run, serialize = SEARCHES[kind]
+    try:
+        rows, next_cursor = run(q, limit=limit, after=request.args.get("after"))
+    except InvalidCursor as e:
+        return jsonify(error=str(e)), 400
+
+    return jsonify(results=[serialize(row) for row in rows], next=next_cursor)
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+
+from .metrics import registry
+
+
+class LRUCache:
+    """Caché en memoria (por proceso) con tamaño máximo y desalojo LRU.
+
+    Si se indica ttl (segundos), las entradas además caducan. Lleva la
+    cuenta de aciertos y fallos para poder medir su efecto.
+    """
+
+    def __init__(self, maxsize=256, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            expires_at = time.monotonic() + self.ttl if self.ttl else None
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+
+# fragmentos HTML del menú, por (restaurante, versión del menú)
+menu_cache = LRUCache()
+
+# usuarios de la sesión (SessionUser), por id
+user_cache = LRUCache()
+
+
+_caches = {"menu": menu_cache, "user": user_cache}
+
+registry.counter("cache_hits_total", "Aciertos de las cachés en memoria.", ("cache",),
+                 fn=lambda: {(name,): cache.hits for name, cache in _caches.items()})
+registry.counter("cache_misses_total", "Fallos de las cachés en memoria.", ("cache",),
+                 fn=lambda: {(name,): cache.misses for name, cache in _caches.items()})
+registry.gauge("cache_entries", "Entradas guardadas en las cachés en memoria.", ("cache",),
+               fn=lambda: {(name,): len(cache) for name, cache in _caches.items()})
+
+
+def init_app(app):
+    menu_cache.maxsize = app.config["MENU_CACHE_SIZE"]
+    menu_cache.clear()
+
+    user_cache.maxsize = app.config["USER_CACHE_SIZE"]
+    user_cache.ttl = app.config["USER_CACHE_TTL"]
+    user_cache.clear()
@@ -0,0 +1,116 @@
+import time
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from .metrics import registry
+from .query_budget import repeated_statements
+
+QUERY_BUCKETS = (1, 2, 3, 4, 5, 8, 13, 21, 34, 55, 100)
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds", "Duración de cada petición por endpoint.",
+    labelnames=("endpoint", "method", "status"),
+)
+request_queries = registry.histogram(
+    "http_request_db_queries", "Consultas SQL por petición.",
+    labelnames=("endpoint",), buckets=QUERY_BUCKETS,
+)
+request_db_time = registry.histogram(
+    "http_request_db_seconds", "Tiempo en SQL por petición.", labelnames=("endpoint",),
+)
+db_queries = registry.counter(
+    "db_queries_total", "Consultas SQL ejecutadas (endpoint=background fuera de una petición).",
+    labelnames=("endpoint",),
+)
+db_query_errors = registry.counter(
+    "db_query_errors_total", "Sentencias SQL que fallaron (también cuentan en db_queries_total).",
+    labelnames=("endpoint",),
+)
+db_query_time = registry.counter(
+    "db_query_seconds_total", "Tiempo total en SQL.", labelnames=("endpoint",),
+)
+
+
+def _endpoint():
+    # el nombre de la regla, no la URL: así los ids no disparan la cardinalidad
+    return request.url_rule.endpoint if request.url_rule else "unmatched"
+
+
+def _log_n_plus_one():
+    return current_app.debug or current_app.config["N_PLUS_ONE_LOG"]
+
+
+def _start_request():
+    g._request_start = time.perf_counter()
+    g._sql_count = 0
+    g._sql_time = 0.0
+    if _log_n_plus_one():
+        g._sql_statements = []
+
+
+def _finish_request(response):
+    start = g.pop("_request_start", None)
+    if start is not None:
+        endpoint = _endpoint()
+        request_duration.observe(time.perf_counter() - start, endpoint=endpoint,
+                                 method=request.method, status=response.status_code)
+        request_queries.observe(g.pop("_sql_count", 0), endpoint=endpoint)
+        request_db_time.observe(g.pop("_sql_time", 0.0), endpoint=endpoint)
+
+    statements = g.pop("_sql_statements", None)
+    if statements:
+        threshold = current_app.config["N_PLUS_ONE_THRESHOLD"]
+        for statement, count in repeated_statements(statements, threshold):
+            current_app.logger.warning(
+                "Posible N+1 en %s: la misma consulta se ejecutó %d veces: %s",
+                request.endpoint, count, " ".join(statement.split()),
+            )
+    return response
+
+
+def _record_query(statement, elapsed):
+    if has_request_context() and "_sql_count" in g:
+        g._sql_count += 1
+        g._sql_time += elapsed
+        if "_sql_statements" in g:
+            g._sql_statements.append(statement)
+        endpoint = _endpoint()
+    else:
+        endpoint = "background"
+    db_queries.inc(endpoint=endpoint)
+    db_query_time.inc(elapsed, endpoint=endpoint)
+    return endpoint
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # en el contexto de la ejecución, no en conn.info: así no queda nada
+    # guardado en la conexión del pool si la sentencia falla
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_query(statement, time.perf_counter() - context._query_start)
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute no se llama si la sentencia falla (p. ej. IntegrityError)
+    start = getattr(exception_context.execution_context, "_query_start", None)
+    if start is None:
+        # falló antes de llegar a ejecutarse (al conectar, al compilar...)
+        return
+    endpoint = _record_query(exception_context.statement, time.perf_counter() - start)
+    db_query_errors.inc(endpoint=endpoint)
+
+
+def instrument_engine(engine):
+    """Cuenta y mide cada sentencia SQL del engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def init_app(app):
+    """Latencia por endpoint y consultas SQL por petición, exportadas en /metrics."""
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
@@ -0,0 +1,129 @@
+import json
+import uuid
+
+from flask import current_app, render_template
+from markupsafe import Markup
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .cache import menu_cache
+from .models import db, Restaurant, Category, MenuItem
+from .pagination import decode_cursor, encode_cursor
+from .snapshots import get_snapshot
+
+
+def load_menu_summary(restaurant_id):
+    """Categorías del restaurante con su número de platillos, en una consulta.
+
+    Devuelve (categorías, {category_id: cantidad}) sin cargar los platillos.
+    """
+    rows = db.session.execute(
+        db.select(Category, db.func.count(MenuItem.id))
+        .outerjoin(MenuItem, MenuItem.category_id == Category.id)
+        .where(Category.restaurant_id == restaurant_id)
+        .group_by(Category.id)
+        .order_by(Category.category)
+    ).all()
+    return [category for category, _ in rows], {category.id: count for category, count in rows}
+
+
+def item_counts(restaurant_id):
+    """{category_id: número de platillos} del restaurante."""
+    return dict(db.session.execute(
+        db.select(Category.id, db.func.count(MenuItem.id))
+        .outerjoin(MenuItem, MenuItem.category_id == Category.id)
+        .where(Category.restaurant_id == restaurant_id)
+        .group_by(Category.id)
+    ).all())
+
+
+def is_collapsed(counts):
+    """Con muchos platillos el dashboard muestra las categorías colapsadas."""
+    return sum(counts.values()) > current_app.config["DASHBOARD_COLLAPSE_ITEMS"]
+
+
+def _attach_items(categories):
+    # carga los platillos de todas las categorías en una consulta
+    items = {category.id: [] for category in categories}
+    if items:
+        for item in MenuItem.query.filter(MenuItem.category_id.in_(items)).order_by(MenuItem.name):
+            items[item.category_id].append(item)
+    for category in categories:
+        set_committed_value(category, "items", items[category.id])
+
+
+def load_items_page(category_id, limit, after=None):
+    """Una página de platillos de la categoría en el orden del menú.
+
+    Paginación por llave sobre (name, id), apoyada en el índice
+    (category_id, name): cada página cuesta lo mismo sin importar su posición.
+    Devuelve (platillos, cursor de la página siguiente o None).
+    """
+    query = MenuItem.query.filter(MenuItem.category_id == category_id)
+    if after:
+        after_name, after_id = decode_cursor(after, str, uuid.UUID)
+        query = query.filter(db.or_(
+            MenuItem.name > after_name,
+            db.and_(MenuItem.name == after_name, MenuItem.id > after_id),
+        ))
+    items = query.order_by(MenuItem.name, MenuItem.id).limit(limit + 1).all()
+    if len(items) <= limit:
+        return items, None
+    return items[:limit], encode_cursor(items[limit - 1].name, items[limit - 1].id)
+
+
+def get_menu_version(restaurant_id):
+    return db.session.execute(
+        db.select(Restaurant.menu_version).where(Restaurant.id == restaurant_id)
+    ).scalar()
+
+
+def bump_menu_version(restaurant_id):
+    """Marca el menú como modificado. Se confirma junto con el resto de la transacción.
+
+    Una sola sentencia: el snapshot queda atrasado y se reconstruye en la
+    próxima lectura del menú público (ver menu_json), no en cada escritura.
+    """
+    db.session.execute(
+        db.update(Restaurant)
+        .where(Restaurant.id == restaurant_id)
+        .values(menu_version=Restaurant.menu_version + 1)
+    )
+
+
+def render_menu(restaurant_id):
+    """Devuelve (html, hit) con la sección del menú del dashboard.
+
+    El fragmento se guarda por (restaurante, versión): cualquier escritura
+    incrementa la versión, así que nunca se sirve un menú desactualizado.
+    """
+    key = (str(restaurant_id), get_menu_version(restaurant_id))
+    html = menu_cache.get(key)
+    if html is not None:
+        return Markup(html), True
+
+    categories, counts = load_menu_summary(restaurant_id)
+    if is_collapsed(counts):
+        # menú grande: categorías colapsadas, los platillos se piden por páginas
+        html = render_template("_menu.html", categories=categories, counts=counts)
+    else:
+        _attach_items(categories)
+        html = render_template("_menu.html", categories=categories, counts=None)
+    menu_cache.set(key, html)
+    return Markup(html), False
+
+
+def menu_json(restaurant_id, version):
+    """Devuelve el menú público del restaurante serializado en JSON, cacheado por versión.
+
+    Lee el snapshot (una fila). Si no existe o está atrasado porque hubo
+    escrituras desde la última lectura, se reconstruye desde las tablas.
+    """
+    key = (str(restaurant_id), version, "json")
+    body = menu_cache.get(key)
+    if body is not None:
+        return body
+
+    document = get_snapshot(restaurant_id, version)
+    body = json.dumps(document, ensure_ascii=False)
+    menu_cache.set(key, body)
+    return body
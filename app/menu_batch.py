@@ -0,0 +1,93 @@
+"""Edición de muchos platillos en una sola transacción (p. ej. ajuste de precios)."""
+import math
+import uuid
+
+from .menu import bump_menu_version
+from .menu_import import MAX_NAME_LENGTH
+from .models import db, Category, MenuItem
+
+MAX_CHANGES = 1000
+EDITABLE = ("name", "price", "description")
+
+
+def _validate(change):
+    """Devuelve (item_id, valores) o lanza ValueError con el motivo."""
+    if not isinstance(change, dict):
+        raise ValueError("cada cambio debe ser un objeto")
+    try:
+        item_id = uuid.UUID(str(change.get("item_id")))
+    except ValueError:
+        raise ValueError("item_id inválido")
+
+    unknown = set(change) - {"item_id", *EDITABLE}
+    if unknown:
+        raise ValueError(f"campos desconocidos: {', '.join(sorted(unknown))}")
+
+    values = {field: change[field] for field in EDITABLE if field in change}
+    if not values:
+        raise ValueError("no hay campos para actualizar")
+    if "name" in values:
+        if not isinstance(values["name"], str):
+            raise ValueError("el nombre debe ser texto")
+        name = values["name"].strip()
+        if not name or len(name) > MAX_NAME_LENGTH:
+            raise ValueError(f"el nombre debe tener entre 1 y {MAX_NAME_LENGTH} caracteres")
+        values["name"] = name
+    if "price" in values:
+        if isinstance(values["price"], bool):
+            raise ValueError("el precio debe ser un número mayor o igual a 0")
+        try:
+            price = float(values["price"])
+        except (TypeError, ValueError):
+            price = -1
+        if not math.isfinite(price) or price < 0:
+            raise ValueError("el precio debe ser un número mayor o igual a 0")
+        values["price"] = price
+    if "description" in values and values["description"] is not None:
+        if not isinstance(values["description"], str):
+            raise ValueError("la descripción debe ser texto o null")
+    return item_id, values
+
+
+def apply_item_changes(restaurant_id, changes):
+    """Aplica los cambios válidos y devuelve el resultado de cada uno, en orden.
+
+    La propiedad de todos los platillos se verifica con una sola consulta y
+    las filas se actualizan con un UPDATE por lotes (executemany por llave
+    primaria). El commit lo hace quien llama.
+    """
+    results, pending, seen = [], [], set()
+    for change in changes:
+        try:
+            item_id, values = _validate(change)
+        except ValueError as e:
+            results.append({"item_id": change.get("item_id") if isinstance(change, dict) else None,
+                            "status": "invalid", "error": str(e)})
+            continue
+        if item_id in seen:
+            results.append({"item_id": str(item_id), "status": "invalid", "error": "platillo repetido"})
+            continue
+        seen.add(item_id)
+        result = {"item_id": str(item_id), "status": "updated"}
+        results.append(result)
+        pending.append((result, item_id, values))
+
+    owners = dict(db.session.execute(
+        db.select(MenuItem.id, Category.restaurant_id)
+        .join(Category, MenuItem.category_id == Category.id)
+        .where(MenuItem.id.in_(seen))
+    ).all()) if seen else {}
+
+    rows = []
+    for result, item_id, values in pending:
+        if item_id not in owners:
+            result.update(status="not_found")
+        elif owners[item_id] != restaurant_id:
+            result.update(status="forbidden", error="No tienes permiso para editar este platillo.")
+        else:
+            rows.append({"id": item_id, **values})
+
+    if rows:
+        db.session.execute(db.update(MenuItem), rows)
+        bump_menu_version(restaurant_id)
+    return results, len(rows)
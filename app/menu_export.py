@@ -0,0 +1,62 @@
+"""Exportación del menú en streaming (CSV o NDJSON).
+
+Las filas se leen con yield_per, que en Postgres usa un cursor del lado
+del servidor: la memoria no crece con el tamaño del menú. El CSV tiene las
+mismas columnas que acepta la importación masiva.
+"""
+import csv
+import io
+import json
+
+from .menu_import import FIELDS
+from .models import db, Category, MenuItem
+
+YIELD_PER = 1000
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def menu_rows(restaurant_id):
+    """Genera (category, name, price, description, image_url) en el orden del menú."""
+    result = db.session.execute(
+        db.select(Category.category, MenuItem.name, MenuItem.price, MenuItem.description, MenuItem.image)
+        .join(MenuItem, MenuItem.category_id == Category.id)
+        .where(Category.restaurant_id == restaurant_id)
+        .order_by(Category.category, MenuItem.name, MenuItem.id)
+        .execution_options(yield_per=YIELD_PER)
+    )
+    try:
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        result.close()
+
+
+def export_csv(restaurant_id):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    for count, row in enumerate(menu_rows(restaurant_id), start=1):
+        writer.writerow(row)
+        # se envía por bloques, no una escritura por fila
+        if count % YIELD_PER == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_ndjson(restaurant_id):
+    lines = []
+    for row in menu_rows(restaurant_id):
+        lines.append(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + "\n")
+        if len(lines) == YIELD_PER:
+            yield "".join(lines)
+            lines.clear()
+    yield "".join(lines)
+
+
+EXPORTERS = {"csv": export_csv, "ndjson": export_ndjson}
@@ -0,0 +1,168 @@
+"""Importación masiva del menú (categorías + platillos) desde CSV o JSON.
+
+Formato CSV: encabezado con category,name,price,description,image_url
+(description e image_url son opcionales). Formato JSON: una lista de
+objetos con esos mismos campos, o {"categories": [{"category": ...,
+"items": [{...}, ...]}, ...]}.
+
+Todo el lote se valida antes de escribir: si hay un error no se inserta
+nada. Si es válido, se inserta con executemany por lotes en una sola
+transacción.
+"""
+import csv
+import io
+import json
+import math
+import uuid
+
+from .menu import bump_menu_version
+from .models import db, Category, MenuItem
+
+FIELDS = ("category", "name", "price", "description", "image_url")
+BATCH_SIZE = 1000
+MAX_NAME_LENGTH = 120
+MAX_URL_LENGTH = 255
+MAX_FILE_SIZE = 10 * 1024 * 1024
+
+
+class MenuImportError(ValueError):
+    """El archivo no se pudo leer o tiene filas inválidas."""
+
+    def __init__(self, message, row_errors=()):
+        super().__init__(message)
+        # [(número de fila, mensaje), ...]
+        self.row_errors = list(row_errors)
+
+
+def parse_rows(stream, filename, max_bytes=MAX_FILE_SIZE):
+    """Lee el archivo y devuelve [(número de fila, dict), ...]."""
+    # se lee un byte de más para saber si se pasó, sin cargar el archivo completo
+    data = stream.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise MenuImportError(f"El archivo supera el máximo de {max_bytes / (1024 * 1024):.2g} MB.")
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise MenuImportError("El archivo debe estar en UTF-8.")
+
+    if filename.lower().endswith(".json"):
+        return _parse_json(text)
+    if filename.lower().endswith(".csv"):
+        return _parse_csv(text)
+    raise MenuImportError("El archivo debe ser .csv o .json.")
+
+
+def _parse_csv(text):
+    reader = csv.DictReader(io.StringIO(text))
+    missing = {"category", "name", "price"} - set(reader.fieldnames or ())
+    if missing:
+        raise MenuImportError(f"Faltan columnas en el CSV: {', '.join(sorted(missing))}.")
+    # la fila 1 es el encabezado
+    rows = []
+    try:
+        for number, row in enumerate(reader, start=2):
+            rows.append((number, row))
+    except csv.Error as e:
+        # p. ej. un campo más largo que csv.field_size_limit() o comillas sin cerrar
+        raise MenuImportError(f"CSV inválido en la fila {len(rows) + 2}: {e}.")
+    return rows
+
+
+def _parse_json(text):
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise MenuImportError(f"JSON inválido: {e.msg} (línea {e.lineno}).")
+
+    if isinstance(data, dict) and isinstance(data.get("categories"), list):
+        rows = []
+        for category in data["categories"]:
+            if not isinstance(category, dict):
+                raise MenuImportError("Cada categoría debe ser un objeto.")
+            for item in category.get("items") or []:
+                rows.append({**item, "category": category.get("category")} if isinstance(item, dict) else item)
+        data = rows
+
+    if not isinstance(data, list):
+        raise MenuImportError('El JSON debe ser una lista de platillos o {"categories": [...]}.')
+    return list(enumerate(data, start=1))
+
+
+def _clean(value):
+    return "" if value is None else str(value).strip()
+
+
+def validate_rows(rows):
+    """Valida todas las filas y devuelve las limpias; lanza MenuImportError con los errores por fila."""
+    valid, errors = [], []
+    for number, row in rows:
+        if not isinstance(row, dict):
+            errors.append((number, "la fila debe ser un objeto"))
+            continue
+
+        category, name = _clean(row.get("category")), _clean(row.get("name"))
+        description, image_url = _clean(row.get("description")), _clean(row.get("image_url"))
+        row_errors = []
+
+        if not category:
+            row_errors.append("falta la categoría")
+        elif len(category) > MAX_NAME_LENGTH:
+            row_errors.append(f"la categoría supera {MAX_NAME_LENGTH} caracteres")
+        if not name:
+            row_errors.append("falta el nombre")
+        elif len(name) > MAX_NAME_LENGTH:
+            row_errors.append(f"el nombre supera {MAX_NAME_LENGTH} caracteres")
+
+        try:
+            price = float(_clean(row.get("price")))
+            if not math.isfinite(price) or price < 0:
+                raise ValueError
+        except ValueError:
+            row_errors.append("el precio debe ser un número mayor o igual a 0")
+
+        if image_url and (not image_url.startswith(("http://", "https://")) or len(image_url) > MAX_URL_LENGTH):
+            row_errors.append("image_url debe ser una URL http(s) válida")
+
+        if row_errors:
+            errors.append((number, "; ".join(row_errors)))
+        else:
+            valid.append({"category": category, "name": name, "price": price,
+                          "description": description or None, "image": image_url or None})
+
+    if errors:
+        raise MenuImportError(f"{len(errors)} filas con errores, no se importó nada.", errors)
+    if not valid:
+        raise MenuImportError("El archivo no tiene platillos.")
+    return valid
+
+
+def import_rows(restaurant_id, rows):
+    """Inserta las filas ya validadas. Devuelve (platillos, categorías nuevas).
+
+    Reutiliza las categorías existentes con el mismo nombre. El commit lo
+    hace quien llama, junto con el incremento de menu_version.
+    """
+    category_ids = dict(db.session.execute(
+        db.select(Category.category, Category.id).where(Category.restaurant_id == restaurant_id)
+    ).all())
+
+    new_categories = []
+    for row in rows:
+        if row["category"] not in category_ids:
+            category_ids[row["category"]] = uuid.uuid4()
+            new_categories.append({"id": category_ids[row["category"]], "category": row["category"],
+                                   "restaurant_id": restaurant_id})
+
+    items = [
+        {"id": uuid.uuid4(), "category_id": category_ids[row["category"]], "name": row["name"],
+         "price": row["price"], "description": row["description"], "image": row["image"]}
+        for row in rows
+    ]
+
+    # ids generados aquí: executemany sin RETURNING ni una sentencia por fila
+    for table, values in ((Category.__table__, new_categories), (MenuItem.__table__, items)):
+        for start in range(0, len(values), BATCH_SIZE):
+            db.session.execute(table.insert(), values[start:start + BATCH_SIZE])
+
+    bump_menu_version(restaurant_id)
+    return len(items), len(new_categories)
@@ -1,21 +1,36 @@
 from . import db, login_manager
+from .cache import user_cache
+from flask import current_app
 from flask_login import UserMixin
 import uuid
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import JSONB
 from werkzeug.security import generate_password_hash, check_password_hash
 
 class Restaurant(UserMixin, db.Model):
     __tablename__ = "restaurants"
     __table_args__ = {"schema": "restaurant"}
 
-    id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
     name = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     schedule = db.Column(db.String(255))
     location = db.Column(db.String(255))
     image = db.Column(db.String(255))
+    image_variants = db.Column(db.JSON)
     description = db.Column(db.Text)
+    # se incrementa cada vez que cambian sus categorías, platillos o imagen
+    menu_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
-    categories = db.relationship("Category", back_populates="restaurant", cascade="all, delete-orphan")
+    # passive_deletes: el ON DELETE CASCADE de la base borra las filas hijas,
+    # SQLAlchemy no las carga para borrarlas una por una
+    categories = db.relationship("Category", back_populates="restaurant", cascade="all, delete-orphan",
+                                 passive_deletes=True, order_by="Category.category")
+
+    @classmethod
+    def find_by_name(cls, name):
+        """Busca sin distinguir mayúsculas (usa el índice único sobre lower(name))."""
+        return cls.query.filter(db.func.lower(cls.name) == name.lower()).first()
 
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -26,31 +41,183 @@ class Restaurant(UserMixin, db.Model):
 
 class Category(db.Model):
     __tablename__ = "categories"
-    __table_args__ = {"schema": "restaurant"}
+    __table_args__ = (
+        # FK + orden del menú: WHERE restaurant_id = ? ORDER BY category
+        db.Index("ix_categories_restaurant_id_category", "restaurant_id", "category"),
+        {"schema": "restaurant"},
+    )
 
-    id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
     category = db.Column(db.String(120), nullable=False)
 
-    restaurant_id = db.Column(db.String, db.ForeignKey("restaurant.restaurants.id"), nullable=False)
+    restaurant_id = db.Column(db.Uuid, db.ForeignKey("restaurant.restaurants.id", ondelete="CASCADE"),
+                              nullable=False)
     restaurant = db.relationship("Restaurant", back_populates="categories")
 
-    items = db.relationship("MenuItem", back_populates="category", cascade="all, delete-orphan")
+    items = db.relationship("MenuItem", back_populates="category", cascade="all, delete-orphan",
+                            passive_deletes=True, order_by="MenuItem.name")
 
 
 class MenuItem(db.Model):
     __tablename__ = "menu_items"
-    __table_args__ = {"schema": "restaurant"}
+    __table_args__ = (
+        # FK + orden del menú: WHERE category_id IN (...) ORDER BY name
+        db.Index("ix_menu_items_category_id_name", "category_id", "name"),
+        {"schema": "restaurant"},
+    )
 
-    id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
     name = db.Column(db.String(120), nullable=False)
     price = db.Column(db.Float, nullable=False)
     image = db.Column(db.String(255))
+    image_variants = db.Column(db.JSON)
     description = db.Column(db.Text)
 
-    category_id = db.Column(db.String, db.ForeignKey("restaurant.categories.id"), nullable=False)
+    category_id = db.Column(db.Uuid, db.ForeignKey("restaurant.categories.id", ondelete="CASCADE"),
+                            nullable=False)
     category = db.relationship("Category", back_populates="items")
 
+    @classmethod
+    def owned_by(cls, restaurant_id):
+        """Condición WHERE para los platillos del restaurante, sin cargar la categoría."""
+        return cls.category_id.in_(
+            db.select(Category.id).where(Category.restaurant_id == restaurant_id)
+        )
+
+
+# el login busca por lower(name): "Foo" y "foo" no pueden ser dos restaurantes
+db.Index("ix_restaurants_name_lower", db.func.lower(Restaurant.name), unique=True)
+
+# tsvector de la búsqueda (app/search.py): nombre con peso A, descripción con peso B
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('spanish'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('spanish'::regconfig, coalesce(description, '')), 'B')"
+)
+
+
+def _search_columns_ddl(table):
+    """search_vector y los índices GIN de la búsqueda, solo en Postgres.
+
+    La columna no se mapea (los SELECT del ORM y SQLite no la ven): solo la
+    leen las consultas de app/search.py. Con esto db.create_all() deja la
+    base igual que la migración f2b6d0e9a471.
+    """
+    for statement in (
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"ALTER TABLE {table.fullname} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED",
+        f"CREATE INDEX ix_{table.name}_search_vector ON {table.fullname} USING gin (search_vector)",
+        f"CREATE INDEX ix_{table.name}_name_trgm ON {table.fullname} USING gin (name gin_trgm_ops)",
+    ):
+        db.event.listen(table, "after_create", db.DDL(statement).execute_if(dialect="postgresql"))
+
+
+for _table in (Restaurant.__table__, MenuItem.__table__):
+    _search_columns_ddl(_table)
+
+
+class ImageUpload(db.Model):
+    """Subida de imagen pendiente: el archivo queda en disco y un worker lo sube."""
+    __tablename__ = "image_uploads"
+    __table_args__ = {"schema": "restaurant"}
+
+    PENDING = "pending"
+    UPLOADING = "uploading"
+    DONE = "done"
+    FAILED = "failed"
+
+    id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
+    target_type = db.Column(db.String(20), nullable=False)  # "restaurant" o "menu_item"
+    target_id = db.Column(db.Uuid, nullable=False)
+    restaurant_id = db.Column(db.Uuid, nullable=False)
+    folder = db.Column(db.String(50), nullable=False)
+    filename = db.Column(db.String(255), nullable=False)
+    staged_path = db.Column(db.String(500), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=PENDING, index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    url = db.Column(db.String(255))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class StoredImage(db.Model):
+    """Índice de objetos ya subidos a cada backend, por el hash SHA-256 de su contenido."""
+    __tablename__ = "stored_images"
+    __table_args__ = {"schema": "restaurant"}
+
+    # Storage.location: al cambiar STORAGE_BACKEND el contenido se vuelve a subir
+    storage = db.Column(db.String(255), primary_key=True)
+    content_hash = db.Column(db.String(64), primary_key=True)
+    url = db.Column(db.String(255), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class MenuSnapshot(db.Model):
+    """Menú completo de un restaurante en un solo documento (JSONB en Postgres).
+
+    Las escrituras solo incrementan Restaurant.menu_version; el snapshot se
+    reconstruye en la primera lectura que lo encuentra atrasado, así que las
+    demás lecturas del menú público son una sola fila.
+    """
+    __tablename__ = "menu_snapshots"
+    __table_args__ = {"schema": "restaurant"}
+
+    restaurant_id = db.Column(db.Uuid, db.ForeignKey("restaurant.restaurants.id", ondelete="CASCADE"),
+                              primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    document = db.Column(db.JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SessionUser(UserMixin):
+    """Copia liviana de un Restaurant, sin sesión de SQLAlchemy, para current_user.
+
+    Se puede guardar en user_cache y compartir entre peticiones.
+    """
+
+    FIELDS = ("id", "name", "schedule", "location", "image", "image_variants", "description")
+
+    def __init__(self, restaurant):
+        for field in self.FIELDS:
+            setattr(self, field, getattr(restaurant, field))
+
+
+@db.event.listens_for(Restaurant, "after_update")
+@db.event.listens_for(Restaurant, "after_delete")
+def _collect_cached_user(mapper, connection, target):
+    # el flush todavía no es visible para otras peticiones: se invalida al confirmar
+    db.inspect(target).session.info.setdefault("invalidate_users", set()).add(str(target.id))
+
+
+@db.event.listens_for(db.session, "after_commit")
+def _invalidate_cached_users(session):
+    for user_id in session.info.pop("invalidate_users", ()):
+        user_cache.invalidate(user_id)
+
+
+@db.event.listens_for(db.session, "after_rollback")
+def _discard_cached_users(session):
+    session.info.pop("invalidate_users", None)
+
 
 @login_manager.user_loader
 def load_user(user_id):
-    return Restaurant.query.get(user_id)
+    try:
+        restaurant_id = uuid.UUID(user_id)
+    except ValueError:
+        # id de sesión mal formado
+        return None
+
+    if not current_app.config["USER_CACHE_ENABLED"]:
+        return db.session.get(Restaurant, restaurant_id)
+
+    user = user_cache.get(user_id)
+    if user is None:
+        restaurant = db.session.get(Restaurant, restaurant_id)
+        if restaurant is None:
+            return None
+        user = SessionUser(restaurant)
+        user_cache.set(user_id, user)
+    return user
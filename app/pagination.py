@@ -0,0 +1,32 @@
+"""Cursores opacos para paginación por llave (keyset)."""
+import base64
+import json
+import uuid
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# tipo JSON que debe tener cada valor antes de convertirlo
+JSON_TYPES = {uuid.UUID: str, float: (int, float), int: int, str: str}
+
+
+def encode_cursor(*values):
+    raw = json.dumps([str(v) if isinstance(v, uuid.UUID) else v for v in values]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, *types):
+    """Decodifica el cursor y convierte cada valor con el tipo correspondiente."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        for kind, value in zip(types, values):
+            if isinstance(value, bool) or not isinstance(value, JSON_TYPES[kind]):
+                raise ValueError
+        return tuple(kind(value) for kind, value in zip(types, values))
+    except (ValueError, TypeError):
+        raise InvalidCursor("cursor inválido")
@@ -0,0 +1,93 @@
+import os
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import NullPool, QueuePool
+
+from .metrics import registry
+
+checkout_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Tiempo esperando una conexión libre del pool.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+checkouts = registry.counter("db_pool_checkouts_total", "Conexiones entregadas por el pool.")
+checked_out = registry.gauge("db_pool_checked_out", "Conexiones del pool en uso.")
+connects = registry.counter("db_pool_connects_total", "Conexiones nuevas abiertas contra la base de datos.")
+invalidations = registry.counter(
+    "db_pool_invalidations_total", "Conexiones descartadas por errores (p. ej. tras un failover)."
+)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool que mide cuánto espera cada checkout por una conexión."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            checkout_wait.observe(time.perf_counter() - start)
+
+
+def _env_bool(name, default):
+    return os.getenv(name, default).lower() == "true"
+
+
+def engine_options_from_env():
+    """Opciones del engine según DB_POOL_PROFILE y las variables DB_POOL_*.
+
+    - "default": pool propio por proceso con pre-ping y reciclado, para
+      conectarse directo a Postgres.
+    - "pgbouncer": sin pool propio (NullPool). PgBouncer en modo transaction
+      ya agrupa conexiones; mantener otro pool por worker solo acapara
+      conexiones del servidor.
+    """
+    profile = os.getenv("DB_POOL_PROFILE", "default").lower()
+
+    if profile == "pgbouncer":
+        return {
+            "poolclass": NullPool,
+            "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", "False"),
+        }
+
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        # menor que el idle timeout de Postgres/balanceadores
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        # descarta conexiones muertas después de un failover
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", "True"),
+    }
+
+
+def instrument_pool(engine):
+    """Registra los eventos del pool del engine para exportar sus métricas."""
+    pool = engine.pool
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connects.inc()
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts.inc()
+        checked_out.inc()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        invalidations.inc()
+
+    if isinstance(pool, QueuePool):
+        registry.gauge("db_pool_size", "Tamaño configurado del pool.", fn=pool.size)
+        registry.gauge(
+            "db_pool_overflow",
+            "Conexiones abiertas por encima de pool_size (negativo: espacio libre en el pool).",
+            fn=pool.overflow,
+        )
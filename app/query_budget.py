@@ -0,0 +1,59 @@
+"""Presupuesto de consultas SQL para detectar regresiones N+1.
+
+    with QueryBudget(4):
+        client.get("/dashboard")
+
+    @QueryBudget(6)
+    def test_edit_item(...): ...
+
+Se excede el presupuesto -> QueryBudgetExceeded (un AssertionError, así
+que en pytest el test falla mostrando las sentencias ejecutadas).
+"""
+from collections import Counter
+from contextlib import ContextDecorator
+
+from sqlalchemy import event
+
+from . import db
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def repeated_statements(statements, threshold):
+    """Sentencias idénticas ejecutadas al menos threshold veces (patrón N+1)."""
+    return [(statement, count) for statement, count in Counter(statements).most_common()
+            if count >= threshold]
+
+
+class QueryBudget(ContextDecorator):
+    """Cuenta las sentencias SQL ejecutadas dentro del bloque y falla si pasan de limit."""
+
+    def __init__(self, limit=None, engine=None):
+        self.limit = limit
+        self.engine = engine
+        self.statements = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def __enter__(self):
+        self.statements = []
+        self._engine = self.engine or db.engine
+        event.listen(self._engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(self._engine, "before_cursor_execute", self._before_cursor_execute)
+        if exc_type is None and self.limit is not None and self.count > self.limit:
+            listing = "\n".join(f"  {i}. {s.splitlines()[0]}" for i, s in enumerate(self.statements, 1))
+            raise QueryBudgetExceeded(
+                f"{self.count} consultas SQL, el presupuesto es {self.limit}:\n{listing}"
+            )
+        return False
+
@@ -1,8 +1,18 @@
 import re
-from flask import Blueprint, render_template, redirect, url_for, flash, request
-from flask_login import login_user, logout_user, login_required, current_user
+from urllib.parse import quote
 
-from app.utils import upload_image_to_supabase
+from flask import (Blueprint, Response, render_template, redirect, url_for, flash, request, make_response,
+                   abort, stream_with_context, jsonify, current_app)
+from flask_login import login_user, logout_user, login_required, current_user
+from sqlalchemy.exc import IntegrityError
+
+from .utils import image_srcset
+from .menu import render_menu, bump_menu_version, load_items_page, item_counts, is_collapsed
+from .pagination import InvalidCursor
+from .menu_import import MenuImportError, parse_rows, validate_rows, import_rows
+from .menu_export import EXPORTERS, FORMATS
+from .menu_batch import MAX_CHANGES, apply_item_changes
+from .uploads import upload_queue
 from .models import db, Restaurant, Category, MenuItem
 
 bp = Blueprint("main", __name__, template_folder="../templates")
@@ -12,6 +22,12 @@ DASHBOARD_ROUTE = "main.dashboard"
 LOGIN_ROUTE = "main.login"
 REGISTER_ROUTE = "main.register"
 INDEX_ROUTE = "main.index"
+IMPORT_ROUTE = "main.import_menu"
+
+
+@bp.app_template_filter("srcset")
+def srcset_filter(variants):
+    return image_srcset(variants)
 
 
 @bp.route("/", methods=["GET", "POST"])
@@ -23,7 +39,7 @@ def index():
         name = request.form.get("name", "").strip()
         password = request.form.get("password", "").strip()
 
-        restaurant = Restaurant.query.filter_by(name=name).first()
+        restaurant = Restaurant.find_by_name(name)
         if restaurant and restaurant.check_password(password):
             login_user(restaurant)
             flash("Inicio de sesión exitoso.", "success")
@@ -43,7 +59,7 @@ def login():
         name = request.form.get("name", "").strip()
         password = request.form.get("password", "").strip()
 
-        restaurant = Restaurant.query.filter_by(name=name).first()
+        restaurant = Restaurant.find_by_name(name)
         if restaurant and restaurant.check_password(password):
             login_user(restaurant)
             flash("Inicio de sesión exitoso.", "success")
@@ -68,7 +84,7 @@ def register():
             flash("Todos los campos son obligatorios (incluyendo la imagen).", "danger")
             return redirect(url_for(REGISTER_ROUTE))
 
-        existing_restaurant = Restaurant.query.filter_by(name=name).first()
+        existing_restaurant = Restaurant.find_by_name(name)
         if existing_restaurant:
             flash("Ese nombre de restaurante ya está registrado. Intenta con otro.", "danger")
             return redirect(url_for(REGISTER_ROUTE))
@@ -77,19 +93,25 @@ def register():
             flash("La contraseña debe tener al menos 8 caracteres, incluyendo una mayúscula, una minúscula y un número.", "danger")
             return redirect(url_for(REGISTER_ROUTE))
 
-        image_url = upload_image_to_supabase(file, folder="restaurants")
-
         new_restaurant = Restaurant(
             name=name,
             schedule=schedule,
             location=location,
             description=description,
-            image=image_url,
         )
         new_restaurant.set_password(password)
 
-        db.session.add(new_restaurant)
-        db.session.commit()
+        try:
+            db.session.add(new_restaurant)
+            # la imagen se sube en segundo plano después del commit
+            upload = upload_queue.stage(file, "restaurants", new_restaurant)
+            db.session.commit()
+        except IntegrityError:
+            # otro registro con el mismo nombre (sin distinguir mayúsculas) entró primero
+            db.session.rollback()
+            flash("Ese nombre de restaurante ya está registrado. Intenta con otro.", "danger")
+            return redirect(url_for(REGISTER_ROUTE))
+        upload_queue.submit(upload.id)
 
         flash("Restaurante registrado con éxito ", "success")
         return redirect(url_for(INDEX_ROUTE))
@@ -100,22 +122,71 @@ def register():
 @bp.route("/dashboard")
 @login_required
 def dashboard():
-    return render_template("dashboard.html", restaurant=current_user)
+    menu_html, hit = render_menu(current_user.id)
+    response = make_response(
+        render_template("dashboard.html", restaurant=current_user, menu_html=menu_html)
+    )
+    response.headers["X-Menu-Cache"] = "hit" if hit else "miss"
+    return response
+
+
+def _response_format():
+    """"json", "html" (solo el fragmento que cambió) o None (redirect al dashboard)."""
+    if request.accept_mimetypes.best_match(["text/html", "application/json"]) == "application/json":
+        return "json"
+    if request.headers.get("X-Requested-With") == "fetch":
+        return "html"
+    return None
+
+
+def _serialize(obj):
+    if isinstance(obj, MenuItem):
+        return {"id": str(obj.id), "category_id": str(obj.category_id), "name": obj.name,
+                "price": obj.price, "description": obj.description, "image": obj.image}
+    return {"id": str(obj.id), "name": obj.category,
+            "items": [_serialize(item) for item in obj.items]}
+
+
+def _respond(message, status=200, template=None, load=None):
+    """Responde una escritura del menú en el formato que pidió el cliente.
+
+    Sin negociación se mantiene el flash + redirect al dashboard. Con
+    Accept: application/json se devuelve {"message", <objeto>}; con
+    X-Requested-With: fetch, el fragmento HTML (template) y el mensaje en
+    X-Message. load() devuelve el contexto del fragmento y solo se llama
+    si hace falta, para no consultar de más en el redirect.
+    """
+    fmt = _response_format()
+    if fmt is None:
+        flash(message, "success" if status < 400 else "danger")
+        return redirect(url_for(DASHBOARD_ROUTE))
+
+    context = load() if load else {}
+    if fmt == "json":
+        data = {name: _serialize(obj) for name, obj in context.items() if isinstance(obj, db.Model)}
+        return jsonify(message=message, **data), status
+
+    response = make_response(render_template(template, **context) if template else "", status)
+    response.headers["X-Message"] = quote(message)
+    return response
 
 
 @bp.route("/add_category", methods=["POST"])
 @login_required
 def add_category():
     category_name = request.form.get("category")
-    if category_name:
-        category = Category(category=category_name, restaurant_id=current_user.id)
-        db.session.add(category)
-        db.session.commit()
-        flash("Categoría agregada correctamente.", "success")
-    return redirect(url_for(DASHBOARD_ROUTE))
+    if not category_name:
+        return _respond("El nombre de la categoría es obligatorio.", 400)
+
+    category = Category(category=category_name, restaurant_id=current_user.id)
+    db.session.add(category)
+    bump_menu_version(current_user.id)
+    db.session.commit()
+    return _respond("Categoría agregada correctamente.", template="_category.html",
+                    load=lambda: {"category": category})
 
 
-@bp.route("/add_item/<string:category_id>", methods=["GET", "POST"])
+@bp.route("/add_item/<uuid:category_id>", methods=["GET", "POST"])
 @login_required
 def add_item(category_id):
     if request.method == "POST":
@@ -124,95 +195,194 @@ def add_item(category_id):
         description = request.form["description"]
         file = request.files.get("image")
 
-        image_url = upload_image_to_supabase(file, folder="menu") if file else None
-
         new_item = MenuItem(
             name=name,
             price=price,
             description=description,
-            image=image_url,
             category_id=category_id
         )
 
         db.session.add(new_item)
+        upload = upload_queue.stage(file, "menu", new_item, current_user.id) if file else None
+        bump_menu_version(current_user.id)
         db.session.commit()
+        if upload:
+            upload_queue.submit(upload.id)
 
-        flash("Plato agregado con éxito", "success")
-        return redirect(url_for(DASHBOARD_ROUTE))
+        return _respond("Plato agregado con éxito", template="_item.html", load=lambda: {"item": new_item})
 
     return render_template("add_item.html", category_id=category_id)
 
 
-@bp.route("/edit_category/<string:category_id>", methods=["POST"])
-@login_required
-def edit_category(category_id):
-    category = Category.query.get_or_404(category_id)
+def _category_context(category):
+    # si el dashboard está colapsado, el fragmento también (sin cargar los platillos)
+    counts = item_counts(current_user.id)
+    if is_collapsed(counts):
+        return {"category": category, "counts": counts}
+    return {"category": category}
+
 
+@bp.route("/categories/<uuid:category_id>/items")
+@login_required
+def category_items(category_id):
+    """Página de platillos de una categoría: fragmento HTML o JSON, con cursor."""
+    category = db.get_or_404(Category, category_id)
     if category.restaurant_id != current_user.id:
-        flash("No tienes permiso para editar esta categoría.", "danger")
-        return redirect(url_for(DASHBOARD_ROUTE))
+        abort(403)
 
-    new_name = request.form.get("category")
-    if new_name:
-        category.category = new_name
+    limit = min(max(request.args.get("limit", current_app.config["DASHBOARD_ITEMS_PAGE_SIZE"], type=int), 1), 200)
+    try:
+        items, next_cursor = load_items_page(category_id, limit, request.args.get("after"))
+    except InvalidCursor as e:
+        return jsonify(message=str(e)), 400
+
+    if _response_format() == "json":
+        return jsonify(items=[_serialize(item) for item in items], next=next_cursor)
+    response = make_response(render_template("_items.html", items=items))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+
+@bp.route("/import_menu", methods=["GET", "POST"])
+@login_required
+def import_menu():
+    if request.method == "POST":
+        file = request.files.get("file")
+        if not file or not file.filename:
+            flash("Selecciona un archivo CSV o JSON.", "danger")
+            return redirect(url_for(IMPORT_ROUTE))
+
+        try:
+            rows = validate_rows(parse_rows(file.stream, file.filename,
+                                            current_app.config["MENU_IMPORT_MAX_BYTES"]))
+        except MenuImportError as e:
+            flash(str(e), "danger")
+            return render_template("import_menu.html", row_errors=e.row_errors), 400
+
+        items, categories = import_rows(current_user.id, rows)
         db.session.commit()
-        flash("Categoría actualizada correctamente ", "success")
+        flash(f"Se importaron {items} platillos ({categories} categorías nuevas).", "success")
+        return redirect(url_for(DASHBOARD_ROUTE))
 
-    return redirect(url_for(DASHBOARD_ROUTE))
+    return render_template("import_menu.html", row_errors=[])
 
 
-@bp.route("/delete_category/<string:category_id>", methods=["POST"])
+@bp.route("/export_menu.<fmt>")
 @login_required
-def delete_category(category_id):
+def export_menu(fmt):
+    if fmt not in EXPORTERS:
+        abort(404)
+
+    body = stream_with_context(EXPORTERS[fmt](current_user.id))
+    response = Response(body, mimetype=FORMATS[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="menu.{fmt}"'
+    return response
+
+
+@bp.route("/edit_category/<uuid:category_id>", methods=["POST"])
+@login_required
+def edit_category(category_id):
     category = Category.query.get_or_404(category_id)
 
     if category.restaurant_id != current_user.id:
-        flash("No tienes permiso para eliminar esta categoría.", "danger")
-        return redirect(url_for(DASHBOARD_ROUTE))
+        return _respond("No tienes permiso para editar esta categoría.", 403)
 
-    db.session.delete(category)
+    new_name = request.form.get("category")
+    if not new_name:
+        return _respond("El nombre de la categoría es obligatorio.", 400)
+
+    category.category = new_name
+    bump_menu_version(current_user.id)
     db.session.commit()
-    flash("Categoría eliminada correctamente 🗑️", "success")
+    return _respond("Categoría actualizada correctamente ", template="_category.html",
+                    load=lambda: _category_context(category))
+
 
-    return redirect(url_for(DASHBOARD_ROUTE))
+def _write_denied(model, row_id, message):
+    # el UPDATE/DELETE no tocó ninguna fila: o no existe o es de otro restaurante
+    db.session.rollback()
+    if db.session.get(model, row_id) is None:
+        abort(404)
+    return _respond(message, 403)
 
 
-@bp.route("/edit_item/<string:item_id>", methods=["POST"])
+@bp.route("/delete_category/<uuid:category_id>", methods=["POST"])
 @login_required
-def edit_item(item_id):
-    item = MenuItem.query.get_or_404(item_id)
+def delete_category(category_id):
+    # los platillos los borra el ON DELETE CASCADE de la base, en la misma sentencia
+    result = db.session.execute(
+        db.delete(Category)
+        .where(Category.id == category_id, Category.restaurant_id == current_user.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        return _write_denied(Category, category_id, "No tienes permiso para eliminar esta categoría.")
+
+    bump_menu_version(current_user.id)
+    db.session.commit()
+    return _respond("Categoría eliminada correctamente 🗑️")
 
-    if item.category.restaurant_id != current_user.id:
-        flash("No tienes permiso para editar este platillo.", "danger")
-        return redirect(url_for(DASHBOARD_ROUTE))
 
-    item.name = request.form.get("name")
-    item.price = request.form.get("price")
-    item.description = request.form.get("description")
+@bp.route("/edit_item/<uuid:item_id>", methods=["POST"])
+@login_required
+def edit_item(item_id):
+    # una sola sentencia: el WHERE verifica que el platillo sea del restaurante
+    result = db.session.execute(
+        db.update(MenuItem)
+        .where(MenuItem.id == item_id, MenuItem.owned_by(current_user.id))
+        .values(
+            name=request.form.get("name"),
+            price=request.form.get("price"),
+            description=request.form.get("description"),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        return _write_denied(MenuItem, item_id, "No tienes permiso para editar este platillo.")
 
     file = request.files.get("image")
-    if file:
-        item.image = upload_image_to_supabase(file, folder="menu_items")
+    upload = upload_queue.stage_item(file, "menu_items", item_id, current_user.id) if file else None
 
+    bump_menu_version(current_user.id)
     db.session.commit()
-    flash("Platillo actualizado correctamente ", "success")
-    return redirect(url_for(DASHBOARD_ROUTE))
+    if upload:
+        upload_queue.submit(upload.id)
+    return _respond("Platillo actualizado correctamente ", template="_item.html",
+                    load=lambda: {"item": db.session.get(MenuItem, item_id)})
 
 
-@bp.route("/delete_item/<string:item_id>", methods=["POST"])
+@bp.route("/edit_items", methods=["POST"])
 @login_required
-def delete_item(item_id):
-    item = MenuItem.query.get_or_404(item_id)
+def edit_items():
+    """Edición por lotes: JSON con una lista de {item_id, name?, price?, description?}."""
+    changes = request.get_json(silent=True)
+    if isinstance(changes, dict):
+        changes = changes.get("changes")
+    if not isinstance(changes, list) or not changes:
+        return jsonify(message="Se esperaba una lista de cambios."), 400
+    if len(changes) > MAX_CHANGES:
+        return jsonify(message=f"Máximo {MAX_CHANGES} cambios por petición."), 400
+
+    results, updated = apply_item_changes(current_user.id, changes)
+    db.session.commit()
+    return jsonify(message=f"{updated} platillos actualizados.", updated=updated, results=results)
 
-    if item.category.restaurant_id != current_user.id:
-        flash("No tienes permiso para eliminar este platillo.", "danger")
-        return redirect(url_for(DASHBOARD_ROUTE))
 
-    db.session.delete(item)
+@bp.route("/delete_item/<uuid:item_id>", methods=["POST"])
+@login_required
+def delete_item(item_id):
+    result = db.session.execute(
+        db.delete(MenuItem)
+        .where(MenuItem.id == item_id, MenuItem.owned_by(current_user.id))
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        return _write_denied(MenuItem, item_id, "No tienes permiso para eliminar este platillo.")
+
+    bump_menu_version(current_user.id)
     db.session.commit()
-    flash("Platillo eliminado correctamente 🗑️", "success")
-
-    return redirect(url_for(DASHBOARD_ROUTE))
+    return _respond("Platillo eliminado correctamente 🗑️")
 
 
 @bp.route("/logout")
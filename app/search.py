@@ -0,0 +1,97 @@
+"""Búsqueda de platillos y restaurantes.
+
+En Postgres usa la columna generada search_vector (tsvector con índice
+GIN, nombre con peso A y descripción con peso B) y pg_trgm sobre el
+nombre para tolerar errores de tipeo. El orden es por relevancia con
+paginación por llave (rank, id): cada página cuesta lo mismo sin
+importar qué tan atrás esté.
+
+En otras bases (SQLite en los tests) cae a un LIKE sin índices.
+"""
+import uuid
+
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from .models import db, Restaurant, Category, MenuItem
+from .pagination import decode_cursor, encode_cursor
+
+SEARCH_CONFIG = "spanish"
+MAX_LIMIT = 50
+
+
+def _match_and_rank(model, q):
+    if db.engine.dialect.name == "postgresql":
+        vector = db.literal_column(f"{model.__table__.fullname}.search_vector", TSVECTOR)
+        query = db.func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        match = db.or_(vector.op("@@")(query), model.name.op("%")(q))
+        # double precision: el cursor devuelve el mismo valor exacto para la comparación
+        rank = db.cast(db.func.ts_rank(vector, query) + db.func.similarity(model.name, q), db.Float)
+        return match, rank
+
+    pattern = f"%{q}%"
+    match = db.or_(model.name.ilike(pattern), model.description.ilike(pattern))
+    rank = db.case((model.name.ilike(pattern), 1.0), else_=0.5)
+    return match, rank
+
+
+def _page(select, rank, limit, after):
+    ranked = select.add_columns(rank.label("rank")).subquery()
+    stmt = (
+        db.select(ranked)
+        .order_by(ranked.c.rank.desc(), ranked.c.id.desc())
+        .limit(limit + 1)
+    )
+    if after:
+        after_rank, after_id = decode_cursor(after, float, uuid.UUID)
+        stmt = stmt.where(db.or_(
+            ranked.c.rank < after_rank,
+            db.and_(ranked.c.rank == after_rank, ranked.c.id < after_id),
+        ))
+
+    rows = db.session.execute(stmt).all()
+    next_cursor = encode_cursor(rows[limit - 1].rank, rows[limit - 1].id) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def search_items(q, limit=20, after=None):
+    """Devuelve (filas, cursor de la página siguiente o None)."""
+    match, rank = _match_and_rank(MenuItem, q)
+    select = (
+        db.select(MenuItem.id, MenuItem.name, MenuItem.price, MenuItem.description,
+                  MenuItem.image, Category.category,
+                  Restaurant.id.label("restaurant_id"), Restaurant.name.label("restaurant_name"))
+        .join(Category, MenuItem.category_id == Category.id)
+        .join(Restaurant, Category.restaurant_id == Restaurant.id)
+        .where(match)
+    )
+    return _page(select, rank, limit, after)
+
+
+def search_restaurants(q, limit=20, after=None):
+    match, rank = _match_and_rank(Restaurant, q)
+    select = (
+        db.select(Restaurant.id, Restaurant.name, Restaurant.description,
+                  Restaurant.location, Restaurant.image)
+        .where(match)
+    )
+    return _page(select, rank, limit, after)
+
+
+SEARCHES = {
+    "items": (search_items, lambda row: {
+        "id": str(row.id),
+        "name": row.name,
+        "price": row.price,
+        "description": row.description,
+        "image": row.image,
+        "category": row.category,
+        "restaurant": {"id": str(row.restaurant_id), "name": row.restaurant_name},
+    }),
+    "restaurants": (search_restaurants, lambda row: {
+        "id": str(row.id),
+        "name": row.name,
+        "description": row.description,
+        "location": row.location,
+        "image": row.image,
+    }),
+}
@@ -0,0 +1,109 @@
+"""Datos sintéticos con forma realista para benchmarks y pruebas de carga.
+
+    flask seed --restaurants 100 --categories 25 --items 40
+
+Nombres y descripciones combinan palabras reales (para que la búsqueda y
+los índices se comporten como con datos de verdad) y los precios siguen
+una distribución log-normal redondeada a precios de carta.
+"""
+import random
+import uuid
+
+import click
+from werkzeug.security import generate_password_hash
+
+from .models import db, Restaurant, Category, MenuItem
+
+CATEGORIES = ["Entradas", "Sopas", "Ensaladas", "Platos fuertes", "Carnes", "Pollo", "Mariscos",
+              "Pastas", "Pizzas", "Hamburguesas", "Sándwiches", "Vegetariano", "Para compartir",
+              "Desayunos", "Infantil", "Postres", "Bebidas calientes", "Bebidas frías", "Jugos",
+              "Cócteles", "Cervezas", "Vinos"]
+DISHES = ["Pizza", "Hamburguesa", "Ensalada", "Lasaña", "Arepa", "Empanada", "Ceviche", "Sopa",
+          "Bandeja", "Tacos", "Burrito", "Sushi", "Ramen", "Pollo", "Churrasco", "Pasta", "Crema",
+          "Filete", "Wrap", "Limonada", "Brownie", "Flan", "Tostadas", "Patacones"]
+STYLES = ["Margarita", "Hawaiana", "Criolla", "Paisa", "Picante", "Vegetariana", "Especial",
+          "de la Casa", "Mixta", "Ranchera", "Napolitana", "Teriyaki", "Gratinada", "Clásica",
+          "BBQ", "al Ajillo", "del Mar", "de Coco"]
+DESCRIPTIONS = ["con queso", "con tomate y albahaca", "con aguacate", "con salsa de ajo",
+                "con papas a la francesa", "con arroz y frijoles", "al horno de leña",
+                "con champiñones", "con maíz tierno", "con cilantro y limón", "con tocineta",
+                "con salsa de la casa", "con ensalada fresca", "servido con pan artesanal"]
+RESTAURANT_WORDS = ["Sabor", "Fogón", "Casa", "Cocina", "Rincón", "Terraza", "Mesa", "Bistró"]
+PLACES = ["Andino", "del Valle", "Costeño", "Paisa", "Bogotano", "Caribe", "del Parque", "Central"]
+CITIES = ["Bogotá", "Medellín", "Cali", "Barranquilla", "Cartagena", "Bucaramanga", "Pereira"]
+
+
+def _price(rng):
+    # la mayoría entre 10 y 40, con cola larga hacia platos caros
+    price = rng.lognormvariate(3.1, 0.45)
+    return max(2.0, round(price * 2) / 2)
+
+
+def _uuid(rng):
+    # sale del rng para que --random-seed repita también los ids (y los nombres que los usan)
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def seed_menu(restaurants, categories, items, batch_size=5000, password="Password123", rng=None):
+    """Inserta restaurants × categories × items filas sintéticas. Devuelve los ids de restaurante."""
+    rng = rng or random.Random()
+    password_hash = generate_password_hash(password)
+    restaurant_rows, category_rows, item_rows = [], [], []
+
+    def flush(model, rows):
+        if rows:
+            db.session.execute(db.insert(model), rows)
+            rows.clear()
+
+    restaurant_ids = []
+    for r in range(restaurants):
+        restaurant_id = _uuid(rng)
+        restaurant_ids.append(restaurant_id)
+        restaurant_rows.append({
+            "id": restaurant_id,
+            "name": f"{rng.choice(RESTAURANT_WORDS)} {rng.choice(PLACES)} {restaurant_id.hex[:8]}",
+            "password_hash": password_hash,
+            "schedule": "11:00 - 22:00",
+            "location": rng.choice(CITIES),
+            "description": f"Restaurante {rng.choice(PLACES).lower()} de comida {rng.choice(STYLES).lower()}",
+        })
+        for c in range(categories):
+            category_id = _uuid(rng)
+            name = CATEGORIES[c % len(CATEGORIES)]
+            if c >= len(CATEGORIES):
+                name = f"{name} {c // len(CATEGORIES) + 1}"
+            category_rows.append({"id": category_id, "category": name, "restaurant_id": restaurant_id})
+            for _ in range(items):
+                item_rows.append({
+                    "id": _uuid(rng),
+                    "name": f"{rng.choice(DISHES)} {rng.choice(STYLES)}",
+                    "price": _price(rng),
+                    "description": rng.choice(DESCRIPTIONS),
+                    "category_id": category_id,
+                })
+                if len(item_rows) >= batch_size:
+                    flush(Restaurant, restaurant_rows)
+                    flush(Category, category_rows)
+                    flush(MenuItem, item_rows)
+    flush(Restaurant, restaurant_rows)
+    flush(Category, category_rows)
+    flush(MenuItem, item_rows)
+    db.session.commit()
+    return restaurant_ids
+
+
+@click.command("seed")
+@click.option("--restaurants", default=10, show_default=True)
+@click.option("--categories", default=10, show_default=True, help="Categorías por restaurante.")
+@click.option("--items", default=20, show_default=True, help="Platillos por categoría.")
+@click.option("--batch-size", default=5000, show_default=True)
+@click.option("--password", default="Password123", show_default=True,
+              help="Contraseña de todos los restaurantes generados.")
+@click.option("--random-seed", type=int, help="Semilla para generar los mismos datos.")
+def seed_command(restaurants, categories, items, batch_size, password, random_seed):
+    """Genera restaurantes, categorías y platillos sintéticos."""
+    restaurant_ids = seed_menu(restaurants, categories, items, batch_size, password,
+                               random.Random(random_seed))
+    click.echo(f"{len(restaurant_ids)} restaurantes, {restaurants * categories} categorías y "
+               f"{restaurants * categories * items} platillos creados.")
+    click.echo("Los snapshots del menú se generan en la primera lectura de cada menú.")
@@ -0,0 +1,172 @@
+"""Snapshot desnormalizado del menú de cada restaurante (tabla menu_snapshots).
+
+Las escrituras solo incrementan menu_version; el snapshot se reconstruye
+cuando se lee y su versión quedó atrás (get_snapshot), así una edición
+cuesta lo mismo con 10 platillos que con 10.000.
+"""
+from datetime import datetime
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .models import db, Restaurant, Category, MenuItem, MenuSnapshot
+
+
+def _image(url, variants):
+    return {"url": url, "variants": variants} if url else None
+
+
+def build_menu_document(restaurant_id):
+    """Arma el documento del menú leyendo las tablas normalizadas.
+
+    Usa consultas Core (no el identity map de la sesión) para ver también
+    los UPDATE/DELETE hechos con sentencias sueltas en esta transacción.
+    """
+    restaurant = db.session.execute(
+        db.select(Restaurant.id, Restaurant.name, Restaurant.schedule, Restaurant.location,
+                  Restaurant.description, Restaurant.image, Restaurant.image_variants,
+                  Restaurant.menu_version)
+        .where(Restaurant.id == restaurant_id)
+    ).one_or_none()
+    if restaurant is None:
+        return None
+
+    categories = db.session.execute(
+        db.select(Category.id, Category.category)
+        .where(Category.restaurant_id == restaurant_id)
+        .order_by(Category.category, Category.id)
+    ).all()
+    items = {category.id: [] for category in categories}
+    for item in db.session.execute(
+        db.select(MenuItem.id, MenuItem.category_id, MenuItem.name, MenuItem.price,
+                  MenuItem.description, MenuItem.image, MenuItem.image_variants)
+        .where(MenuItem.owned_by(restaurant_id))
+        .order_by(MenuItem.name, MenuItem.id)
+    ):
+        items[item.category_id].append({
+            "id": str(item.id),
+            "name": item.name,
+            "price": item.price,
+            "description": item.description,
+            "image": _image(item.image, item.image_variants),
+        })
+
+    return {
+        "id": str(restaurant.id),
+        "name": restaurant.name,
+        "schedule": restaurant.schedule,
+        "location": restaurant.location,
+        "description": restaurant.description,
+        "image": _image(restaurant.image, restaurant.image_variants),
+        "version": restaurant.menu_version,
+        "categories": [
+            {"id": str(category.id), "name": category.category, "items": items[category.id]}
+            for category in categories
+        ],
+    }
+
+
+def rebuild_snapshot(restaurant_id):
+    """Reescribe el snapshot dentro de la transacción actual. El commit lo hace quien llama.
+
+    Es un upsert que nunca reemplaza un snapshot más nuevo: dos lecturas
+    que reconstruyen a la vez, o una lectura que se cruza con una
+    escritura, no pueden dejar una versión anterior.
+    """
+    document = build_menu_document(restaurant_id)
+    if document is None:
+        return None
+
+    insert = postgresql.insert if db.session.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = insert(MenuSnapshot).values(
+        restaurant_id=restaurant_id, version=document["version"], document=document,
+        updated_at=datetime.utcnow(),
+    )
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=[MenuSnapshot.restaurant_id],
+        set_={
+            "version": statement.excluded.version,
+            "document": statement.excluded.document,
+            "updated_at": statement.excluded.updated_at,
+        },
+        where=MenuSnapshot.version <= statement.excluded.version,
+    ))
+    return document
+
+
+def get_snapshot(restaurant_id, version):
+    """Documento del menú en la versión pedida (o una posterior).
+
+    Si el snapshot falta o está atrasado lo reconstruye y confirma: es la
+    única lectura que paga el costo de armar el menú después de escribir.
+    """
+    row = db.session.execute(
+        db.select(MenuSnapshot.version, MenuSnapshot.document)
+        .where(MenuSnapshot.restaurant_id == restaurant_id)
+    ).one_or_none()
+    if row is not None and row.version >= version:
+        return row.document
+
+    document = rebuild_snapshot(restaurant_id)
+    db.session.commit()
+    return document
+
+
+def check_snapshots(restaurant_ids=None):
+    """Compara cada snapshot al día con las tablas. Devuelve [(restaurant_id, problema), ...].
+
+    Un snapshot que falta o está atrasado no es un problema: se reconstruye
+    en la próxima lectura. Sí lo es uno con la versión actual y otro contenido
+    (p. ej. filas cambiadas sin pasar por bump_menu_version).
+    """
+    if restaurant_ids is None:
+        restaurant_ids = db.session.execute(db.select(Restaurant.id)).scalars().all()
+
+    problems = []
+    for restaurant_id in restaurant_ids:
+        expected = build_menu_document(restaurant_id)
+        stored = db.session.get(MenuSnapshot, restaurant_id)
+        if stored is not None and stored.version == expected["version"] and stored.document != expected:
+            problems.append((restaurant_id, "el documento no coincide con las tablas"))
+    return problems
+
+
+menu_cli = AppGroup("menu", help="Snapshots del menú.")
+
+
+def _restaurant_ids(restaurant_id):
+    if restaurant_id:
+        return [restaurant_id]
+    return db.session.execute(db.select(Restaurant.id).order_by(Restaurant.id)).scalars().all()
+
+
+@menu_cli.command("rebuild")
+@click.option("--restaurant", "restaurant_id", type=click.UUID, help="Solo este restaurante.")
+def rebuild_command(restaurant_id):
+    """Reconstruye los snapshots desde las tablas normalizadas."""
+    count = 0
+    for rid in _restaurant_ids(restaurant_id):
+        if rebuild_snapshot(rid) is not None:
+            count += 1
+        # una transacción corta por restaurante
+        db.session.commit()
+    click.echo(f"{count} snapshots reconstruidos.")
+
+
+@menu_cli.command("check")
+@click.option("--restaurant", "restaurant_id", type=click.UUID, help="Solo este restaurante.")
+@click.option("--fix", is_flag=True, help="Reconstruir los snapshots inconsistentes.")
+def check_command(restaurant_id, fix):
+    """Verifica que los snapshots coincidan con las tablas normalizadas."""
+    problems = check_snapshots(_restaurant_ids(restaurant_id))
+    for rid, problem in problems:
+        click.echo(f"{rid}: {problem}")
+        if fix:
+            rebuild_snapshot(rid)
+            db.session.commit()
+
+    if not problems:
+        click.echo("Todos los snapshots están al día.")
+    elif not fix:
+        raise SystemExit(1)
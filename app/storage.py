@@ -0,0 +1,203 @@
+"""Backends de almacenamiento de imágenes, elegidos con STORAGE_BACKEND.
+
+- "supabase" (por defecto): bucket SUPABASE_BUCKET de Supabase Storage.
+- "local": archivos en LOCAL_STORAGE_DIR, servidos por la app en /media/
+  o por un servidor estático en LOCAL_STORAGE_URL.
+- "s3": almacenamiento compatible con S3 (AWS, MinIO, R2...). Necesita
+  boto3; las credenciales se leen como siempre en boto3
+  (AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, ~/.aws...).
+
+Los nombres de los objetos dependen del contenido y nunca cambian, así que
+todos los backends los publican con caché de un año.
+"""
+import io
+import mimetypes
+from abc import ABC, abstractmethod
+import os
+import shutil
+import tempfile
+
+from flask import Blueprint, current_app, send_from_directory
+
+from . import utils
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+MEDIA_ROUTE = "/media"
+
+
+def object_name(data, filename, folder):
+    """Mismo contenido, mismo nombre: volver a subir los mismos bytes no crea otro objeto."""
+    extension = os.path.splitext(filename or "")[1].lower()
+    return f"{folder}/{utils.content_hash(data)}{extension}"
+
+
+class Storage(ABC):
+    """Interfaz de los backends: put recibe un stream binario y devuelve la URL pública."""
+
+    @abstractmethod
+    def put(self, name, stream, content_type):
+        ...
+
+    @abstractmethod
+    def get_url(self, name):
+        ...
+
+    @abstractmethod
+    def delete(self, name):
+        ...
+
+    @property
+    @abstractmethod
+    def location(self):
+        """Identifica dónde quedan los objetos (backend y bucket o carpeta)."""
+
+    def upload(self, file, folder="restaurants"):
+        """Sube un archivo (FileStorage) con nombre según su contenido. Devuelve la URL."""
+        data = file.read()
+        name = object_name(data, file.filename, folder)
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        return self.put(name, io.BytesIO(data), content_type)
+
+
+class LocalStorage(Storage):
+    def __init__(self, root, base_url=MEDIA_ROUTE):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+
+    def path(self, name):
+        path = os.path.abspath(os.path.join(self.root, name))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"nombre de objeto inválido: {name}")
+        return path
+
+    def put(self, name, stream, content_type):
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # se escribe aparte y se renombra: nunca se sirve un archivo a medias
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(stream, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return self.get_url(name)
+
+    def get_url(self, name):
+        return f"{self.base_url}/{name}"
+
+    @property
+    def location(self):
+        return f"local:{self.root}"
+
+    def delete(self, name):
+        try:
+            os.remove(self.path(name))
+        except FileNotFoundError:
+            pass
+
+
+class S3Storage(Storage):
+    def __init__(self, bucket, endpoint_url=None, region=None, public_url=None, client=None):
+        if client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise RuntimeError("STORAGE_BACKEND=s3 necesita boto3 (pip install boto3)") from None
+            client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        self.client = client
+        self.bucket = bucket
+        if public_url:
+            self.public_url = public_url.rstrip("/")
+        elif endpoint_url:
+            self.public_url = f"{endpoint_url.rstrip('/')}/{bucket}"
+        else:
+            self.public_url = f"https://{bucket}.s3.amazonaws.com"
+
+    def put(self, name, stream, content_type):
+        # upload_fileobj sube por partes: no carga el archivo completo si el stream es grande
+        self.client.upload_fileobj(stream, self.bucket, name, ExtraArgs={
+            "ContentType": content_type,
+            "CacheControl": CACHE_CONTROL,
+        })
+        return self.get_url(name)
+
+    def get_url(self, name):
+        return f"{self.public_url}/{name}"
+
+    def delete(self, name):
+        self.client.delete_object(Bucket=self.bucket, Key=name)
+
+    @property
+    def location(self):
+        return f"s3:{self.public_url}"
+
+
+class SupabaseStorage(Storage):
+    """Usa el cliente compartido de app.utils, que se crea en la primera subida."""
+
+    def __init__(self, bucket="images", url=None, key=None):
+        self.bucket = bucket
+        self.url = url
+        self.key = key
+
+    def _bucket(self):
+        return utils.get_supabase(self.url, self.key).storage.from_(self.bucket)
+
+    def put(self, name, stream, content_type):
+        # el SDK de Supabase solo acepta bytes
+        self._bucket().upload(name, stream.read(), {
+            "content-type": content_type,
+            "cache-control": "31536000",
+            "x-upsert": "true",
+        })
+        return self.get_url(name)
+
+    def get_url(self, name):
+        return self._bucket().get_public_url(name)
+
+    def delete(self, name):
+        self._bucket().remove([name])
+
+    @property
+    def location(self):
+        return f"supabase:{self.url}/{self.bucket}"
+
+
+def create_storage(config):
+    backend = config["STORAGE_BACKEND"]
+    if backend == "local":
+        return LocalStorage(config["LOCAL_STORAGE_DIR"], config["LOCAL_STORAGE_URL"] or MEDIA_ROUTE)
+    if backend == "s3":
+        return S3Storage(config["S3_BUCKET"], endpoint_url=config["S3_ENDPOINT_URL"],
+                         region=config["S3_REGION"], public_url=config["S3_PUBLIC_URL"])
+    if backend == "supabase":
+        return SupabaseStorage(config["SUPABASE_BUCKET"], config["SUPABASE_URL"], config["SUPABASE_KEY"])
+    raise ValueError(f"STORAGE_BACKEND desconocido: {backend}")
+
+
+def get_storage():
+    return current_app.extensions["storage"]
+
+
+def upload(file, folder="restaurants"):
+    """Sube con el backend configurado en la app actual."""
+    return get_storage().upload(file, folder)
+
+
+bp = Blueprint("media", __name__)
+
+
+@bp.route(f"{MEDIA_ROUTE}/<path:name>")
+def media(name):
+    response = send_from_directory(get_storage().root, name, max_age=31536000)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def init_app(app):
+    storage = app.extensions["storage"] = create_storage(app.config)
+    # con LOCAL_STORAGE_URL los archivos los sirve otro servidor (nginx, CDN...)
+    if isinstance(storage, LocalStorage) and not app.config["LOCAL_STORAGE_URL"]:
+        app.register_blueprint(bp)
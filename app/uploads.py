@@ -0,0 +1,311 @@
+import io
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import AppGroup
+from PIL import UnidentifiedImageError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from werkzeug.datastructures import FileStorage
+
+from . import storage, utils
+from .cache import user_cache
+from .menu import bump_menu_version
+from .metrics import registry
+from .models import db, Restaurant, MenuItem, ImageUpload, StoredImage
+
+storage_upload_time = registry.histogram(
+    "image_storage_upload_seconds",
+    "Tiempo subiendo cada objeto al almacenamiento configurado (STORAGE_BACKEND).",
+    labelnames=("result",),
+)
+
+# un trabajo 'uploading' sin cambios en este tiempo quedó de un proceso que murió
+STALE_MINUTES = 15
+
+
+class UploadQueue:
+    """Cola de subidas de imágenes fuera del ciclo de la petición.
+
+    La petición guarda el archivo en UPLOAD_SPOOL_DIR y registra un
+    ImageUpload pendiente en la misma transacción que la fila dueña de la
+    imagen. Después del commit, un pool de hilos genera las versiones de la
+    imagen, las sube (con reintentos) y rellena image / image_variants.
+    Si la transacción no se confirma, el archivo guardado se borra.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.executor = None
+        # se puede reemplazar en los tests por un almacenamiento falso
+        self.uploader = None
+        # objetos que no se subieron porque el mismo contenido ya estaba guardado
+        self.dedup_hits = 0
+
+    def init_app(self, app):
+        self.app = app
+        self.spool_dir = app.config["UPLOAD_SPOOL_DIR"]
+        self.max_attempts = app.config["UPLOAD_MAX_ATTEMPTS"]
+        self.retry_delay = app.config["UPLOAD_RETRY_DELAY"]
+        self.image_format = app.config["IMAGE_FORMAT"]
+
+        workers = app.config["UPLOAD_WORKERS"]
+        # con 0 workers las subidas se procesan en el mismo hilo (tests, CLI)
+        self.executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-upload")
+            if workers else None
+        )
+        app.cli.add_command(uploads_cli)
+        if self.executor is not None:
+            # trabajos que un proceso anterior dejó pendientes o a medias
+            self.executor.submit(self._recover)
+
+    def stage(self, file, folder, target, restaurant_id=None):
+        """Guarda el archivo en disco y agrega el trabajo a la sesión actual."""
+        if target.id is None:
+            db.session.flush()
+
+        if isinstance(target, Restaurant):
+            return self._stage(file, folder, "restaurant", target.id, target.id)
+        return self._stage(file, folder, "menu_item", target.id, restaurant_id)
+
+    def stage_item(self, file, folder, item_id, restaurant_id):
+        """Como stage, para un platillo del que solo se conoce el id."""
+        return self._stage(file, folder, "menu_item", item_id, restaurant_id)
+
+    def _stage(self, file, folder, target_type, target_id, restaurant_id):
+        os.makedirs(self.spool_dir, exist_ok=True)
+        staged_path = os.path.join(self.spool_dir, uuid.uuid4().hex)
+        file.save(staged_path)
+        db.session.info.setdefault("staged_uploads", []).append(staged_path)
+
+        job = ImageUpload(
+            id=uuid.uuid4(),
+            target_type=target_type,
+            target_id=target_id,
+            restaurant_id=restaurant_id,
+            folder=folder,
+            filename=file.filename,
+            staged_path=staged_path,
+        )
+        db.session.add(job)
+        return job
+
+    def submit(self, job_id):
+        """Encola el trabajo. Llamar solo después del commit."""
+        if self.executor is None:
+            self._run(job_id)
+        else:
+            self.executor.submit(self._run, job_id)
+
+    def _recover(self):
+        with self.app.app_context():
+            try:
+                self.recover()
+            except SQLAlchemyError:
+                # p. ej. al correr `flask db upgrade` antes de que exista la tabla
+                self.app.logger.warning("no se pudieron recuperar las subidas pendientes", exc_info=True)
+            finally:
+                db.session.remove()
+
+    def recover(self):
+        """Reencola los trabajos a medias y envía todos los pendientes. Devuelve cuántos."""
+        self.requeue_stale(timedelta(minutes=STALE_MINUTES))
+        job_ids = pending_job_ids()
+        for job_id in job_ids:
+            self.submit(job_id)
+        return len(job_ids)
+
+    def _run(self, job_id):
+        with self.app.app_context():
+            try:
+                self.process(job_id)
+            finally:
+                db.session.remove()
+
+    def _claim(self, job_id):
+        # solo un worker (o el CLI) puede tomar cada trabajo
+        result = db.session.execute(
+            db.update(ImageUpload)
+            .where(ImageUpload.id == job_id, ImageUpload.status == ImageUpload.PENDING)
+            .values(status=ImageUpload.UPLOADING, updated_at=datetime.utcnow())
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    def process(self, job_id):
+        if not self._claim(job_id):
+            return None
+
+        job = db.session.get(ImageUpload, job_id)
+        while True:
+            job.attempts += 1
+            db.session.commit()
+            retryable = True
+            try:
+                variants = self._upload(job)
+                error = None if variants else "el almacenamiento no devolvió una URL"
+            except UnidentifiedImageError:
+                variants, error, retryable = None, "el archivo no es una imagen válida", False
+            except Exception as e:
+                variants, error = None, str(e)
+
+            if variants:
+                self._complete(job, variants)
+                return job
+
+            job.last_error = error
+            if not retryable or job.attempts >= self.max_attempts:
+                job.status = ImageUpload.FAILED
+                db.session.commit()
+                return job
+            db.session.commit()
+            time.sleep(self.retry_delay * 2 ** (job.attempts - 1))
+
+    def _upload(self, job):
+        with open(job.staged_path, "rb") as stream:
+            return utils.upload_image_variants(
+                FileStorage(stream=stream, filename=job.filename),
+                folder=job.folder,
+                image_format=self.image_format,
+                uploader=self._store,
+            )
+
+    def _store(self, file, folder):
+        """Sube un objeto salvo que el backend actual ya tenga uno con el mismo contenido."""
+        data = file.read()
+        digest = utils.content_hash(data)
+        location = storage.get_storage().location
+
+        stored = db.session.get(StoredImage, (location, digest))
+        if stored is not None:
+            self.dedup_hits += 1
+            return stored.url
+
+        uploader = self.uploader or storage.upload
+        start, result = time.perf_counter(), "error"
+        try:
+            url = uploader(FileStorage(stream=io.BytesIO(data), filename=file.filename), folder=folder)
+            if url:
+                result = "ok"
+        finally:
+            storage_upload_time.observe(time.perf_counter() - start, result=result)
+        if url:
+            try:
+                db.session.add(StoredImage(storage=location, content_hash=digest, url=url, size=len(data)))
+                db.session.commit()
+            except IntegrityError:
+                # otro worker indexó el mismo contenido al mismo tiempo
+                db.session.rollback()
+        return url
+
+    def _complete(self, job, variants):
+        url = variants["full"]["url"]
+        model = Restaurant if job.target_type == "restaurant" else MenuItem
+        db.session.execute(
+            db.update(model)
+            .where(model.id == job.target_id)
+            .values(image=url, image_variants=variants)
+        )
+        # la imagen también forma parte del menú público (y de su ETag)
+        bump_menu_version(job.restaurant_id)
+
+        job.url = url
+        job.status = ImageUpload.DONE
+        job.last_error = None
+        db.session.commit()
+        if model is Restaurant:
+            # current_user se guarda en caché con la imagen anterior
+            user_cache.invalidate(str(job.target_id))
+
+        try:
+            os.remove(job.staged_path)
+        except OSError:
+            pass
+
+    def requeue_stale(self, older_than):
+        """Devuelve a pendiente los trabajos que quedaron a medias (p. ej. tras un reinicio)."""
+        result = db.session.execute(
+            db.update(ImageUpload)
+            .where(
+                ImageUpload.status == ImageUpload.UPLOADING,
+                ImageUpload.updated_at < datetime.utcnow() - older_than,
+            )
+            .values(status=ImageUpload.PENDING)
+        )
+        db.session.commit()
+        return result.rowcount
+
+    def requeue_failed(self):
+        """Devuelve a pendiente los trabajos fallidos, con los intentos en cero."""
+        result = db.session.execute(
+            db.update(ImageUpload)
+            .where(ImageUpload.status == ImageUpload.FAILED)
+            .values(status=ImageUpload.PENDING, attempts=0, updated_at=datetime.utcnow())
+        )
+        db.session.commit()
+        return result.rowcount
+
+
+upload_queue = UploadQueue()
+
+
+@db.event.listens_for(db.session, "after_commit")
+def _keep_staged_files(session):
+    session.info.pop("staged_uploads", None)
+
+
+@db.event.listens_for(db.session, "after_transaction_end")
+def _remove_staged_files(session, transaction):
+    # la transacción terminó sin commit (rollback o cierre): nadie va a subir estos archivos
+    if transaction.parent is not None:
+        return
+    for staged_path in session.info.pop("staged_uploads", ()):
+        try:
+            os.remove(staged_path)
+        except OSError:
+            pass
+
+
+def pending_job_ids():
+    return db.session.execute(
+        db.select(ImageUpload.id)
+        .where(ImageUpload.status == ImageUpload.PENDING)
+        .order_by(ImageUpload.created_at)
+    ).scalars().all()
+
+uploads_cli = AppGroup("uploads", help="Cola de subida de imágenes.")
+
+
+@uploads_cli.command("process")
+@click.option("--stale-minutes", default=STALE_MINUTES, show_default=True,
+              help="Reintentar trabajos 'uploading' sin cambios en este tiempo.")
+@click.option("--failed", "retry_failed", is_flag=True, help="Reintentar también los trabajos 'failed'.")
+def process_pending(stale_minutes, retry_failed):
+    """Procesa en este proceso todas las subidas pendientes."""
+    requeued = upload_queue.requeue_stale(timedelta(minutes=stale_minutes))
+    if retry_failed:
+        requeued += upload_queue.requeue_failed()
+    job_ids = pending_job_ids()
+
+    done = failed = 0
+    for job_id in job_ids:
+        job = upload_queue.process(job_id)
+        if job is not None and job.status == ImageUpload.DONE:
+            done += 1
+        elif job is not None:
+            failed += 1
+    click.echo(f"{done} subidas completadas, {failed} fallidas, {requeued} recuperadas.")
+
+
+@uploads_cli.command("status")
+def upload_status():
+    """Muestra cuántas subidas hay en cada estado."""
+    rows = db.session.execute(
+        db.select(ImageUpload.status, db.func.count()).group_by(ImageUpload.status)
+    ).all()
+    for status, count in rows:
+        click.echo(f"{status}: {count}")
@@ -1,29 +1,100 @@
-from supabase import create_client
+import hashlib
+import io
 import os
-from dotenv import load_dotenv
-import uuid
+import threading
+from PIL import Image, ImageOps
+from werkzeug.datastructures import FileStorage
 
-load_dotenv()
+# cliente de Supabase, creado en el primer uso (ver get_supabase): importar el
+# SDK y armar el cliente al importar este módulo hacía lento el arranque
+supabase = None
+_supabase_lock = threading.Lock()
 
-url = os.getenv("SUPABASE_URL")
-key = os.getenv("SUPABASE_KEY")
 
-supabase = create_client(url, key)
+def get_supabase(url=None, key=None):
+    """Devuelve el cliente compartido, creándolo con url/key (o SUPABASE_URL/SUPABASE_KEY)."""
+    global supabase
+    if supabase is None:
+        with _supabase_lock:
+            if supabase is None:
+                from supabase import create_client
+                supabase = create_client(url or os.getenv("SUPABASE_URL"), key or os.getenv("SUPABASE_KEY"))
+    return supabase
+
+
+def content_hash(data):
+    """SHA-256 del contenido: mismo contenido, mismo nombre de objeto."""
+    return hashlib.sha256(data).hexdigest()
+
 
 def upload_image_to_supabase(file, folder="restaurants"):
+    """Sube al bucket "images" de Supabase, sin importar STORAGE_BACKEND. Devuelve None si falla."""
+    from .storage import SupabaseStorage
     try:
-        # generar nombre único
-        unique_name = f"{folder}/{uuid.uuid4().hex}_{file.filename}"
-        
-        # leer en bytes
-        file_content = file.read()
-        
-        # subir al bucket (debes tener un bucket llamado restaurant-images en Supabase)
-        supabase.storage.from_("images").upload(unique_name, file_content)
-        
-        # generar URL pública
-        public_url = f"{supabase.storage.from_('images').get_public_url(unique_name)}"
-        return public_url
+        return SupabaseStorage().upload(file, folder)
     except Exception as e:
         print("Error subiendo imagen:", e)
         return None
+
+
+# ancho máximo (px) de cada versión que se guarda de una imagen
+IMAGE_VARIANTS = {
+    "thumbnail": 160,
+    "card": 480,
+    "full": 1600,
+}
+
+
+def process_image(file, image_format="WEBP", quality=80):
+    """Normaliza una imagen y genera sus versiones redimensionadas.
+
+    Aplica la orientación EXIF y vuelve a codificar sin metadatos, así que
+    el EXIF (GPS, cámara...) no se guarda. Nunca amplía la imagen.
+    Devuelve {variante: (bytes, ancho)}.
+    """
+    image = Image.open(file)
+    image = ImageOps.exif_transpose(image)
+
+    if image_format == "JPEG" or image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGB")
+
+    variants = {}
+    for name, max_width in IMAGE_VARIANTS.items():
+        variant = image
+        if image.width > max_width:
+            height = max(1, round(image.height * max_width / image.width))
+            variant = image.resize((max_width, height), Image.LANCZOS)
+        buffer = io.BytesIO()
+        variant.save(buffer, format=image_format, quality=quality)
+        variants[name] = (buffer.getvalue(), variant.width)
+    return variants
+
+
+def upload_image_variants(file, folder="restaurants", image_format="WEBP", uploader=None):
+    """Procesa la imagen y sube cada versión.
+
+    Devuelve {variante: {"url": ..., "width": ...}} o None si alguna subida falla.
+    """
+    uploader = uploader or upload_image_to_supabase
+    extension = "jpg" if image_format == "JPEG" else image_format.lower()
+    stem = os.path.splitext(file.filename or "image")[0]
+
+    variants = {}
+    for name, (data, width) in process_image(file, image_format).items():
+        variant_file = FileStorage(stream=io.BytesIO(data), filename=f"{stem}_{name}.{extension}")
+        url = uploader(variant_file, folder=folder)
+        if not url:
+            return None
+        variants[name] = {"url": url, "width": width}
+    return variants
+
+
+def image_srcset(variants):
+    """Arma el atributo srcset a partir de las versiones guardadas en image_variants."""
+    if not variants:
+        return ""
+    return ", ".join(
+        f"{variants[name]['url']} {variants[name]['width']}w"
+        for name in IMAGE_VARIANTS
+        if name in variants
+    )
@@ -0,0 +1,75 @@
+"""Utilidades compartidas por los benchmarks.
+
+Los benchmarks usan la base configurada en el .env (Postgres) o, con
+--database-url sqlite:///archivo.db, una base SQLite local.
+"""
+import os
+import statistics
+import sys
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app, db  # noqa: E402
+from app.seed import seed_menu  # noqa: E402,F401
+
+
+def make_app(database_url=None):
+    config = {"UPLOAD_WORKERS": 0}
+    sqlite = bool(database_url) and database_url.startswith("sqlite")
+    if database_url:
+        config["SQLALCHEMY_DATABASE_URI"] = database_url
+    if sqlite:
+        config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+            "poolclass": StaticPool,
+            "connect_args": {"check_same_thread": False},
+        }
+
+    app = create_app(config)
+
+    if sqlite:
+        # SQLite no tiene esquemas: el esquema "restaurant" es otra base adjunta
+        path = database_url.split("sqlite:///", 1)[1] if "sqlite:///" in database_url else ""
+        schema_path = f"{path}.restaurant" if path else ":memory:"
+
+        with app.app_context():
+            @event.listens_for(db.engine, "connect")
+            def _attach_schema(dbapi_connection, connection_record):
+                dbapi_connection.execute(f"ATTACH DATABASE '{schema_path}' AS restaurant")
+
+    return app
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+
+    def pick(p):
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    return {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "p50": pick(50),
+        "p95": pick(95),
+        "p99": pick(99),
+        "max": ordered[-1],
+    }
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def format_ms(stats):
+    return "  ".join(
+        f"{name}={stats[name] * 1000:.2f}ms" for name in ("mean", "p50", "p95", "p99", "max")
+    )
@@ -0,0 +1,80 @@
+"""Tiempo de las consultas del dashboard con y sin los índices del menú.
+
+    python -m benchmarks.dashboard_queries --database-url sqlite:///bench.db \
+        --restaurants 100 --categories 25 --items 40
+
+Siembra datos sintéticos (100 × 25 × 40 = 100k platillos por defecto) y mide
+lo que sirve el dashboard para un restaurante (el resumen de categorías con
+load_menu_summary y la primera página de platillos de una categoría con
+load_items_page) con los índices de la migración e13a5c7f8b20 y luego sin
+ellos. En Postgres, --explain imprime el plan.
+"""
+import argparse
+
+from benchmarks.common import format_ms, make_app, percentiles, seed_menu, timed
+from app import db
+from app.menu import load_items_page, load_menu_summary
+from app.models import Category, MenuItem
+
+MENU_INDEXES = [
+    index
+    for model in (Category, MenuItem)
+    for index in model.__table__.indexes
+    if index.name in ("ix_categories_restaurant_id_category", "ix_menu_items_category_id_name")
+]
+
+
+def measure(restaurant_id, page_size, repeat):
+    def run():
+        categories, _ = load_menu_summary(restaurant_id)
+        load_items_page(categories[0].id, page_size)
+        db.session.remove()
+
+    run()  # calentamiento
+    return percentiles(timed(run, repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url")
+    parser.add_argument("--restaurants", type=int, default=100)
+    parser.add_argument("--categories", type=int, default=25)
+    parser.add_argument("--items", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--explain", action="store_true", help="solo Postgres: EXPLAIN ANALYZE")
+    args = parser.parse_args()
+
+    app = make_app(args.database_url)
+    with app.app_context():
+        db.create_all()
+        restaurant_ids = seed_menu(args.restaurants, args.categories, args.items)
+        target = restaurant_ids[len(restaurant_ids) // 2]
+        page_size = app.config["DASHBOARD_ITEMS_PAGE_SIZE"]
+        total = db.session.execute(db.select(db.func.count()).select_from(MenuItem)).scalar()
+        print(f"{total} platillos en total, {args.categories * args.items} en el restaurante medido")
+
+        with_indexes = measure(target, page_size, args.repeat)
+        print(f"con índices: {format_ms(with_indexes)}")
+
+        if args.explain and db.engine.dialect.name == "postgresql":
+            category_id = load_menu_summary(target)[0][0].id
+            plan = db.session.execute(db.text(
+                "EXPLAIN ANALYZE SELECT * FROM restaurant.menu_items "
+                "WHERE category_id = :cid ORDER BY name, id LIMIT :limit"
+            ), {"cid": category_id, "limit": page_size + 1}).scalars().all()
+            print("\n".join(plan))
+
+        for index in MENU_INDEXES:
+            index.drop(db.engine)
+        try:
+            without_indexes = measure(target, page_size, args.repeat)
+            print(f"sin índices: {format_ms(without_indexes)}")
+        finally:
+            for index in MENU_INDEXES:
+                index.create(db.engine)
+
+        print(f"p95: {without_indexes['p95'] / with_indexes['p95']:.1f}x más rápido con índices")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Tiempo de importación y arranque de la app (python -X importtime).
+
+    python -m benchmarks.import_time --repeat 5 --top 15
+
+Cada medición corre en un proceso nuevo, como un worker de gunicorn o un
+comando de flask: importa app, llama a create_app() e imprime los módulos
+que más tardan en importarse. Sale con código 1 si el arranque supera
+BOOT_BUDGET (también lo verifica test/test_import_time.py).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+BOOT = "from app import create_app; create_app()"
+# segundos para importar app y crear la aplicación; holgado para máquinas lentas de CI
+BOOT_BUDGET = float(os.getenv("BOOT_TIME_BUDGET", "2.0"))
+
+_TIMED = (
+    "import time; start = time.perf_counter(); {statement}; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def _run(args):
+    result = subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout, result.stderr
+
+
+def import_times(statement=BOOT):
+    """{módulo: (propio, acumulado)} en segundos, según -X importtime."""
+    _, stderr = _run(["-X", "importtime", "-c", statement])
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(own) / 1e6, int(cumulative) / 1e6)
+    return times
+
+
+def boot_time(statement=BOOT):
+    """Segundos desde el primer import hasta tener la app creada, en un proceso nuevo."""
+    stdout, _ = _run(["-c", _TIMED.format(statement=statement)])
+    return float(stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    samples = [boot_time() for _ in range(args.repeat)]
+    times = import_times()
+    print(f"{'módulo':<40}{'propio':>10}{'acumulado':>12}")
+    for name, (own, cumulative) in sorted(times.items(), key=lambda item: -item[1][1])[:args.top]:
+        print(f"{name:<40}{own * 1000:>8.1f}ms{cumulative * 1000:>10.1f}ms")
+
+    median = statistics.median(samples)
+    print(f"\narranque (import + create_app): mediana {median * 1000:.0f}ms, "
+          f"mínimo {min(samples) * 1000:.0f}ms, presupuesto {BOOT_BUDGET * 1000:.0f}ms")
+    if median > BOOT_BUDGET:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
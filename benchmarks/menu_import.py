@@ -0,0 +1,75 @@
+"""Filas por segundo de la importación masiva del menú.
+
+    python -m benchmarks.menu_import --database-url sqlite:///bench.db --rows 20000
+
+Genera un CSV sintético, lo importa en un restaurante nuevo (parseo +
+validación + inserción + commit) y lo compara con insertar los mismos
+platillos uno por uno con commit, como hace add_item.
+"""
+import argparse
+import io
+import random
+import time
+import uuid
+
+from benchmarks.common import make_app
+from app import db
+from app.menu_import import import_rows, parse_rows, validate_rows
+from app.models import Category, MenuItem, Restaurant
+
+
+def make_csv(rows, categories):
+    lines = ["category,name,price,description,image_url"]
+    for i in range(rows):
+        lines.append(f"Categoría {i % categories},Plato {i},{random.uniform(3, 60):.2f},Descripción del plato,")
+    return "\n".join(lines).encode()
+
+
+def new_restaurant():
+    restaurant = Restaurant(name=f"Import {uuid.uuid4().hex[:8]}", password_hash="x")
+    db.session.add(restaurant)
+    db.session.commit()
+    return restaurant.id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--one-by-one", type=int, default=500,
+                        help="platillos para la comparación fila por fila")
+    args = parser.parse_args()
+
+    app = make_app(args.database_url)
+    with app.app_context():
+        db.create_all()
+        content = make_csv(args.rows, args.categories)
+
+        restaurant_id = new_restaurant()
+        start = time.perf_counter()
+        rows = validate_rows(parse_rows(io.BytesIO(content), "menu.csv"))
+        items, _ = import_rows(restaurant_id, rows)
+        db.session.commit()
+        elapsed = time.perf_counter() - start
+        print(f"importación masiva: {items} filas en {elapsed:.2f}s = {items / elapsed:,.0f} filas/s")
+
+        restaurant_id = new_restaurant()
+        category_ids = {}
+        start = time.perf_counter()
+        for row in rows[:args.one_by_one]:
+            if row["category"] not in category_ids:
+                category = Category(category=row["category"], restaurant_id=restaurant_id)
+                db.session.add(category)
+                db.session.commit()
+                category_ids[row["category"]] = category.id
+            db.session.add(MenuItem(name=row["name"], price=row["price"], description=row["description"],
+                                    category_id=category_ids[row["category"]]))
+            db.session.commit()
+        elapsed = time.perf_counter() - start
+        print(f"uno por uno:        {args.one_by_one} filas en {elapsed:.2f}s = "
+              f"{args.one_by_one / elapsed:,.0f} filas/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Latencia y throughput de las rutas más usadas.
+
+    python -m benchmarks.routes --database-url sqlite:///bench.db \
+        --restaurants 50 --categories 10 --items 20 --repeat 200
+    python -m benchmarks.routes --compare benchmarks/results/routes-20240101T000000.json
+
+Siembra datos con app.seed y mide, con el cliente de pruebas de Flask (sin
+red ni servidor), login (check_password), load_user con la caché de
+usuarios fría y caliente, el dashboard con y sin la caché del menú,
+add_item, edit_item y delete_category. Guarda p50/p95/p99 y throughput en
+un JSON para comparar corridas.
+"""
+import argparse
+import json
+import os
+import subprocess
+from datetime import datetime, timezone
+
+from benchmarks.common import format_ms, make_app, percentiles, seed_menu, timed
+from app import db
+from app.cache import menu_cache, user_cache
+from app.models import Category, MenuItem, Restaurant, load_user
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+PASSWORD = "Password123"
+
+
+def _check(response, status=(200, 302)):
+    if response.status_code not in status:
+        raise SystemExit(f"respuesta inesperada {response.status_code}: {response.get_data(as_text=True)[:200]}")
+
+
+def _login(app, name):
+    client = app.test_client()
+    _check(client.post("/login", data={"name": name, "password": PASSWORD}), (302,))
+    return client
+
+
+def scenarios(app, restaurant_id, repeat):
+    """Devuelve {nombre: muestras en segundos}.
+
+    Se llama sin un app context activo: cada petición abre el suyo y
+    libera la sesión al terminar, como en producción.
+    """
+    with app.app_context():
+        name = db.session.get(Restaurant, restaurant_id).name
+        category_ids = db.session.execute(
+            db.select(Category.id).where(Category.restaurant_id == restaurant_id)
+        ).scalars().all()
+        item_ids = db.session.execute(
+            db.select(MenuItem.id).where(MenuItem.owned_by(restaurant_id))
+        ).scalars().all()
+    client = _login(app, name)
+    results = {}
+
+    def login():
+        _check(app.test_client().post("/login", data={"name": name, "password": PASSWORD}), (302,))
+
+    results["login"] = timed(login, repeat)
+
+    def load_user_cold():
+        user_cache.clear()
+        with app.test_request_context():
+            load_user(str(restaurant_id))
+
+    def load_user_warm():
+        with app.test_request_context():
+            load_user(str(restaurant_id))
+
+    results["load_user_cold"] = timed(load_user_cold, repeat)
+    results["load_user_warm"] = timed(load_user_warm, repeat)
+
+    def dashboard_cold():
+        menu_cache.clear()
+        _check(client.get("/dashboard"), (200,))
+
+    results["dashboard_cold"] = timed(dashboard_cold, repeat)
+    results["dashboard_warm"] = timed(lambda: _check(client.get("/dashboard"), (200,)), repeat)
+
+    counter = iter(range(repeat))
+    results["add_item"] = timed(lambda: _check(client.post(
+        f"/add_item/{category_ids[0]}",
+        data={"name": f"Bench {next(counter)}", "price": "12.5", "description": "Nuevo platillo"},
+    )), repeat)
+
+    counter = iter(range(repeat))
+
+    def edit_item():
+        i = next(counter)
+        _check(client.post(f"/edit_item/{item_ids[i % len(item_ids)]}",
+                           data={"name": f"Editado {i}", "price": "15", "description": "Editado"}))
+
+    results["edit_item"] = timed(edit_item, repeat)
+
+    # categorías desechables, con platillos para que el DELETE también los borre en cascada
+    items_per_category = max(1, len(item_ids) // max(1, len(category_ids)))
+    doomed = []
+    with app.app_context():
+        for i in range(repeat):
+            category = Category(category=f"Borrar {i}", restaurant_id=restaurant_id)
+            db.session.add(category)
+            db.session.flush()
+            db.session.add_all(
+                MenuItem(name=f"Plato {j}", price=10, category_id=category.id)
+                for j in range(items_per_category)
+            )
+            doomed.append(category.id)
+        db.session.commit()
+    doomed_ids = iter(doomed)
+    results["delete_category"] = timed(
+        lambda: _check(client.post(f"/delete_category/{next(doomed_ids)}")), repeat
+    )
+    return results
+
+
+def summarize(samples):
+    stats = percentiles(samples)
+    stats["throughput"] = len(samples) / sum(samples)
+    return stats
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, previous_path):
+    with open(previous_path) as f:
+        previous = json.load(f)["results"]
+    print(f"\ncomparación con {previous_path} (p95):")
+    for name, stats in current.items():
+        if name not in previous:
+            continue
+        before, after = previous[name]["p95"], stats["p95"]
+        print(f"  {name:<16} {before * 1000:8.2f}ms -> {after * 1000:8.2f}ms  ({(after / before - 1) * 100:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url")
+    parser.add_argument("--restaurants", type=int, default=50)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--output", help=f"archivo JSON (por defecto en {RESULTS_DIR})")
+    parser.add_argument("--compare", help="JSON de una corrida anterior")
+    args = parser.parse_args()
+
+    app = make_app(args.database_url)
+    with app.app_context():
+        db.create_all()
+        restaurant_ids = seed_menu(args.restaurants, args.categories, args.items, password=PASSWORD)
+        target = restaurant_ids[len(restaurant_ids) // 2]
+        dialect = db.engine.dialect.name
+    results = {name: summarize(samples) for name, samples in scenarios(app, target, args.repeat).items()}
+
+    for name, stats in results.items():
+        print(f"{name:<16} {format_ms(stats)}  {stats['throughput']:,.0f} req/s")
+
+    started = datetime.now(timezone.utc)
+    output = args.output or os.path.join(RESULTS_DIR, f"routes-{started:%Y%m%dT%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "benchmark": "routes",
+            "created_at": started.isoformat(),
+            "git_revision": _git_revision(),
+            "dialect": dialect,
+            "restaurants": args.restaurants,
+            "categories": args.categories,
+            "items": args.items,
+            "repeat": args.repeat,
+            "results": results,
+        }, f, indent=2)
+    print(f"\nresultados en {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
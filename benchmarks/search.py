@@ -0,0 +1,61 @@
+"""Latencia de /api/search sobre un corpus grande (solo Postgres).
+
+    python -m benchmarks.search --restaurants 1000 --categories 25 --items 40
+
+Usar una base de prueba: siembra restaurants × categories × items
+platillos (1M por defecto) con app.seed (nombres y descripciones con
+palabras reales) en tablas creadas con search_vector y los índices GIN
+de la migración f2b6d0e9a471, y mide search_items para términos exactos, con
+errores de tipeo y la segunda página de resultados.
+"""
+import argparse
+
+from benchmarks.common import format_ms, make_app, percentiles, seed_menu, timed
+from app import db
+from app.search import search_items
+
+QUERIES = ["pizza margarita", "hamburgesa", "lasagna", "ceviche picante", "con champiñones",
+           "ramen teriyaki", "arepa paisa", "sopaa"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url")
+    parser.add_argument("--restaurants", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=25)
+    parser.add_argument("--items", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--skip-seed", action="store_true", help="reusar los datos de una corrida anterior")
+    args = parser.parse_args()
+
+    app = make_app(args.database_url)
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            raise SystemExit("este benchmark necesita Postgres")
+
+        if not args.skip_seed:
+            # create_all también crea search_vector y los índices GIN (ver app/models.py)
+            db.create_all()
+            seed_menu(args.restaurants, args.categories, args.items)
+            db.session.execute(db.text("ANALYZE restaurant.menu_items"))
+            db.session.commit()
+
+        total = db.session.execute(db.text("SELECT count(*) FROM restaurant.menu_items")).scalar()
+        print(f"{total} platillos")
+
+        for q in QUERIES:
+            def first_page():
+                search_items(q, limit=20)
+                db.session.remove()
+
+            rows, cursor = search_items(q, limit=20)
+            first_page()  # calentamiento
+            stats = percentiles(timed(first_page, args.repeat))
+            line = f"{q!r:<22} página 1: {format_ms(stats)}"
+            if cursor:
+                stats = percentiles(timed(lambda: search_items(q, limit=20, after=cursor), args.repeat))
+                line += f"\n{'':<22} página 2: {format_ms(stats)}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Tamaño de índices y latencia de joins: llaves de texto vs. uuid nativo (solo Postgres).
+
+    python -m benchmarks.uuid_keys --restaurants 1000 --categories 20 --items 25
+
+Crea dos esquemas temporales (bench_text y bench_uuid) con la misma forma
+que restaurants/categories/menu_items, los llena con los mismos volúmenes y
+compara el tamaño de los índices de PK/FK y el tiempo del join del menú.
+Los esquemas se borran al terminar.
+"""
+import argparse
+import random
+
+from benchmarks.common import format_ms, make_app, percentiles, timed
+from app import db
+
+SCHEMAS = {"bench_text": "varchar", "bench_uuid": "uuid"}
+
+
+def build(schema, key_type, args):
+    cast = "::text" if key_type == "varchar" else ""
+    statements = [
+        f"DROP SCHEMA IF EXISTS {schema} CASCADE",
+        f"CREATE SCHEMA {schema}",
+        f"CREATE TABLE {schema}.restaurants (id {key_type} PRIMARY KEY, name text)",
+        f"CREATE TABLE {schema}.categories (id {key_type} PRIMARY KEY, "
+        f"restaurant_id {key_type} NOT NULL REFERENCES {schema}.restaurants (id), category text)",
+        f"CREATE TABLE {schema}.menu_items (id {key_type} PRIMARY KEY, "
+        f"category_id {key_type} NOT NULL REFERENCES {schema}.categories (id), name text, price float)",
+        f"INSERT INTO {schema}.restaurants "
+        f"SELECT gen_random_uuid(){cast}, 'Resto ' || g FROM generate_series(1, {args.restaurants}) g",
+        f"INSERT INTO {schema}.categories SELECT gen_random_uuid(){cast}, r.id, 'Categoría ' || g "
+        f"FROM {schema}.restaurants r, generate_series(1, {args.categories}) g",
+        f"INSERT INTO {schema}.menu_items SELECT gen_random_uuid(){cast}, c.id, 'Plato ' || g, random() * 50 "
+        f"FROM {schema}.categories c, generate_series(1, {args.items}) g",
+        f"CREATE INDEX ix_categories_restaurant_id_category ON {schema}.categories (restaurant_id, category)",
+        f"CREATE INDEX ix_menu_items_category_id_name ON {schema}.menu_items (category_id, name)",
+        f"ANALYZE {schema}.restaurants",
+        f"ANALYZE {schema}.categories",
+        f"ANALYZE {schema}.menu_items",
+    ]
+    for statement in statements:
+        db.session.execute(db.text(statement))
+    db.session.commit()
+
+
+def index_sizes(schema):
+    rows = db.session.execute(db.text(
+        "SELECT indexrelname, pg_relation_size(indexrelid) FROM pg_stat_user_indexes "
+        "WHERE schemaname = :schema ORDER BY indexrelname"
+    ), {"schema": schema}).all()
+    return dict(rows)
+
+
+def join_latency(schema, repeat):
+    restaurant_ids = db.session.execute(
+        db.text(f"SELECT id FROM {schema}.restaurants")
+    ).scalars().all()
+    query = db.text(
+        f"SELECT c.category, m.name, m.price FROM {schema}.categories c "
+        f"JOIN {schema}.menu_items m ON m.category_id = c.id "
+        f"WHERE c.restaurant_id = :rid ORDER BY c.category, m.name"
+    )
+    return percentiles(timed(
+        lambda: db.session.execute(query, {"rid": random.choice(restaurant_ids)}).all(), repeat
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url")
+    parser.add_argument("--restaurants", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--items", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    app = make_app(args.database_url)
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            raise SystemExit("este benchmark necesita Postgres")
+        try:
+            results = {}
+            for schema, key_type in SCHEMAS.items():
+                build(schema, key_type, args)
+                results[schema] = (index_sizes(schema), join_latency(schema, args.repeat))
+
+            for schema, (sizes, latency) in results.items():
+                print(f"\n{schema}")
+                for name, size in sizes.items():
+                    print(f"  {name:<45} {size / 1024 / 1024:8.2f} MB")
+                print(f"  {'total índices':<45} {sum(sizes.values()) / 1024 / 1024:8.2f} MB")
+                print(f"  join del menú: {format_ms(latency)}")
+        finally:
+            for schema in SCHEMAS:
+                db.session.execute(db.text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
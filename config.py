@@ -1,40 +1,47 @@
-import psycopg2
-from dotenv import load_dotenv
+"""Prueba de conexión a la base de datos configurada en el .env.
+
+    python config.py
+
+Solo se conecta al ejecutarlo: importar este módulo no abre conexiones.
+"""
 import os
 
-# Load environment variables from .env
-load_dotenv()
-
-# Fetch variables
-USER = os.getenv("user")
-PASSWORD = os.getenv("password")
-HOST = os.getenv("host")
-PORT = os.getenv("port")
-DBNAME = os.getenv("dbname")
-
-# Connect to the database
-try:
-    connection = psycopg2.connect(
-        user=USER,
-        password=PASSWORD,
-        host=HOST,
-        port=PORT,
-        dbname=DBNAME
-    )
-    print("Connection successful!")
-    
-    # Create a cursor to execute SQL queries
-    cursor = connection.cursor()
-    
-    # Example query
-    cursor.execute("SELECT NOW();")
-    result = cursor.fetchone()
-    print("Current Time:", result)
-
-    # Close the cursor and connection
-    cursor.close()
-    connection.close()
-    print("Connection closed.")
-
-except Exception as e:
-    print(f"Failed to connect: {e}")
\ No newline at end of file
+from dotenv import load_dotenv
+
+
+def check_connection():
+    import psycopg2
+
+    # Load environment variables from .env
+    load_dotenv()
+
+    # Connect to the database
+    try:
+        connection = psycopg2.connect(
+            user=os.getenv("user"),
+            password=os.getenv("password"),
+            host=os.getenv("host"),
+            port=os.getenv("port"),
+            dbname=os.getenv("dbname")
+        )
+        print("Connection successful!")
+
+        # Create a cursor to execute SQL queries
+        cursor = connection.cursor()
+
+        # Example query
+        cursor.execute("SELECT NOW();")
+        result = cursor.fetchone()
+        print("Current Time:", result)
+
+        # Close the cursor and connection
+        cursor.close()
+        connection.close()
+        print("Connection closed.")
+
+    except Exception as e:
+        print(f"Failed to connect: {e}")
+
+
+if __name__ == "__main__":
+    check_connection()
@@ -0,0 +1,40 @@
+"""App para pruebas de carga, con el almacenamiento de imágenes reemplazado.
+
+    gunicorn -w 4 --threads 4 -b 127.0.0.1:8000 loadtest.app_stub:app
+
+Igual que run.py, pero el backend de almacenamiento (app.storage) se
+reemplaza por StubStorage: un LocalStorage en LOADTEST_STORAGE_DIR que
+espera LOADTEST_STORAGE_LATENCY segundos por objeto para simular la red.
+Así la carga mide la app y la base de datos, no a Supabase. Con LOADTEST_DATABASE_URL se
+puede apuntar a otra base; con SQLite (sqlite:///loadtest.db) hay que usar
+un solo worker sin hilos (gunicorn -w 1), porque comparten una conexión.
+"""
+import os
+import tempfile
+
+from loadtest.storage import StubStorage
+
+
+def create_stub_app():
+    database_url = os.getenv("LOADTEST_DATABASE_URL")
+    storage = StubStorage(
+        os.getenv("LOADTEST_STORAGE_DIR", os.path.join(tempfile.gettempdir(), "loadtest-storage")),
+        latency=float(os.getenv("LOADTEST_STORAGE_LATENCY", "0.05")),
+    )
+
+    if database_url and database_url.startswith("sqlite"):
+        # una sola conexión compartida: subidas en el mismo hilo y un servidor sin hilos
+        from app import db
+        from benchmarks.common import make_app
+        app = make_app(database_url)
+        with app.app_context():
+            db.create_all()
+    else:
+        from app import create_app
+        app = create_app({"SQLALCHEMY_DATABASE_URI": database_url} if database_url else None)
+    # la cola de subidas usa el backend de la app, igual que con STORAGE_BACKEND
+    app.extensions["storage"] = storage
+    return app
+
+
+app = create_stub_app()
@@ -0,0 +1,215 @@
+"""Generador de carga con sesiones completas de restaurantes.
+
+    python -m loadtest.runner --base-url http://127.0.0.1:8000 \
+        --users 50 --ramp-up 30 --duration 120 --output loadtest.json
+
+Cada usuario virtual es un restaurante nuevo con su propia cookie: se
+registra (con imagen), inicia sesión, abre el dashboard y repite hasta que
+acaba la prueba: crear una categoría, agregar platillos, volver al
+dashboard, editar, borrar un platillo y borrar la categoría. Los usuarios
+arrancan repartidos a lo largo de --ramp-up. Al final imprime latencia
+(p50/p95/p99) y errores por ruta.
+
+Pensado para correr contra loadtest.app_stub (almacenamiento simulado) en
+otra máquina o en otro proceso; solo necesita httpx y Pillow.
+"""
+import argparse
+import asyncio
+import io
+import json
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+
+import httpx
+from PIL import Image
+
+PASSWORD = "Password123"
+JSON = {"Accept": "application/json"}
+DISHES = ["Bandeja paisa", "Ajiaco", "Arepa de choclo", "Ceviche", "Pizza margarita",
+          "Hamburguesa clásica", "Lasaña", "Limonada de coco", "Tres leches", "Empanadas"]
+
+
+def _image():
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 600), tuple(random.randrange(256) for _ in range(3))).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+class UnexpectedResponse(Exception):
+    pass
+
+
+class Stats:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(Counter)
+
+    def record(self, route, elapsed, error=None):
+        self.samples[route].append(elapsed)
+        if error:
+            self.errors[route][error] += 1
+
+    def summary(self, wall_time):
+        report = {}
+        for route, samples in sorted(self.samples.items()):
+            ordered = sorted(samples)
+
+            def pick(p):
+                return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+            report[route] = {
+                "count": len(ordered),
+                "errors": sum(self.errors[route].values()),
+                "error_breakdown": dict(self.errors[route]),
+                "p50": pick(50), "p95": pick(95), "p99": pick(99), "max": ordered[-1],
+                "rps": len(ordered) / wall_time,
+            }
+        return report
+
+
+class Session:
+    """Un restaurante navegando la app."""
+
+    def __init__(self, client, stats, think_time):
+        self.client = client
+        self.stats = stats
+        self.think_time = think_time
+        self.name = f"Carga {uuid.uuid4().hex[:12]}"
+
+    async def request(self, route, method, url, expect=(200,), redirect_to=None, **kwargs):
+        start = time.perf_counter()
+        error = None
+        response = None
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            if response.status_code not in expect:
+                error = f"HTTP {response.status_code}"
+            elif redirect_to and httpx.URL(response.headers.get("location", "")).path != redirect_to:
+                # los formularios fallidos redirigen a la misma página con un flash
+                error = f"redirect a {response.headers.get('location')}"
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+        self.stats.record(route, time.perf_counter() - start, error)
+        if error:
+            raise UnexpectedResponse(f"{route}: {error}")
+        return response
+
+    async def think(self):
+        if self.think_time:
+            await asyncio.sleep(random.uniform(0, self.think_time))
+
+    async def start(self):
+        await self.request("GET /register", "GET", "/register")
+        await self.think()
+        await self.request("POST /register", "POST", "/register", expect=(302,), redirect_to="/", data={
+            "name": self.name, "password": PASSWORD, "schedule": "11:00 - 22:00",
+            "location": "Bogotá", "description": "Restaurante de prueba de carga",
+        }, files={"image": ("logo.jpg", _image(), "image/jpeg")})
+        await self.request("POST /login", "POST", "/login", expect=(302,), redirect_to="/dashboard",
+                           data={"name": self.name, "password": PASSWORD})
+        await self.request("GET /dashboard", "GET", "/dashboard")
+
+    async def iteration(self, items):
+        await self.think()
+        response = await self.request("POST /add_category", "POST", "/add_category", headers=JSON,
+                                      data={"category": random.choice(["Entradas", "Platos fuertes", "Postres"])})
+        category_id = response.json()["category"]["id"]
+
+        item_ids = []
+        for _ in range(items):
+            await self.think()
+            response = await self.request(
+                "POST /add_item", "POST", f"/add_item/{category_id}", headers=JSON,
+                data={"name": random.choice(DISHES), "price": f"{random.uniform(5, 60):.2f}",
+                      "description": "Plato de la casa"},
+            )
+            item_ids.append(response.json()["item"]["id"])
+
+        await self.think()
+        await self.request("GET /dashboard", "GET", "/dashboard")
+        for item_id in item_ids[:2]:
+            await self.think()
+            await self.request("POST /edit_item", "POST", f"/edit_item/{item_id}", headers=JSON, data={
+                "name": random.choice(DISHES), "price": f"{random.uniform(5, 60):.2f}",
+                "description": "Receta nueva",
+            })
+        if item_ids:
+            await self.think()
+            await self.request("POST /delete_item", "POST", f"/delete_item/{item_ids[-1]}", headers=JSON)
+        await self.think()
+        await self.request("POST /delete_category", "POST", f"/delete_category/{category_id}", headers=JSON)
+
+    async def stop(self):
+        await self.request("GET /logout", "GET", "/logout", expect=(302,))
+
+
+async def virtual_user(base_url, stats, delay, deadline, args):
+    await asyncio.sleep(delay)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout) as client:
+        session = Session(client, stats, args.think_time)
+        try:
+            await session.start()
+        except UnexpectedResponse:
+            # sin cuenta no hay nada más que probar para este usuario
+            return
+        while time.monotonic() < deadline:
+            try:
+                await session.iteration(args.items)
+            except UnexpectedResponse:
+                pass
+        try:
+            await session.stop()
+        except UnexpectedResponse:
+            pass
+
+
+async def run(args):
+    stats = Stats()
+    start = time.monotonic()
+    deadline = start + args.ramp_up + args.duration
+    step = args.ramp_up / args.users if args.users else 0
+    await asyncio.gather(*(
+        virtual_user(args.base_url, stats, i * step, deadline, args) for i in range(args.users)
+    ))
+    return stats, time.monotonic() - start
+
+
+def print_report(report, wall_time):
+    print(f"{'ruta':<22}{'reqs':>7}{'errores':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'req/s':>9}")
+    for route, row in report.items():
+        print(f"{route:<22}{row['count']:>7}{row['errors']:>9}"
+              + "".join(f"{row[p] * 1000:>8.1f}ms" for p in ("p50", "p95", "p99"))
+              + f"{row['rps']:>9.1f}")
+    total = sum(row["count"] for row in report.values())
+    errors = sum(row["errors"] for row in report.values())
+    print(f"\n{total} peticiones en {wall_time:.1f}s ({total / wall_time:.1f} req/s), {errors} errores")
+    for route, row in report.items():
+        for error, count in row["error_breakdown"].items():
+            print(f"  {route}: {error} x{count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=20, help="usuarios virtuales concurrentes")
+    parser.add_argument("--ramp-up", type=float, default=10, help="segundos hasta arrancar a todos")
+    parser.add_argument("--duration", type=float, default=60, help="segundos a plena carga")
+    parser.add_argument("--items", type=int, default=5, help="platillos por categoría en cada iteración")
+    parser.add_argument("--think-time", type=float, default=0.5, help="pausa máxima entre acciones")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--output", help="guardar el reporte en JSON")
+    args = parser.parse_args()
+
+    stats, wall_time = asyncio.run(run(args))
+    report = stats.summary(wall_time)
+    print_report(report, wall_time)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"users": args.users, "ramp_up": args.ramp_up, "duration": args.duration,
+                       "wall_time": wall_time, "routes": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import threading
+import time
+
+from app.storage import LocalStorage
+
+
+class StubStorage(LocalStorage):
+    """Almacenamiento local con latencia de red simulada, para no cargar a Supabase."""
+
+    def __init__(self, directory, latency=0.0, base_url="http://storage.stub/images"):
+        super().__init__(directory, base_url)
+        self.latency = latency
+        self.uploads = 0
+        self._lock = threading.Lock()
+
+    def put(self, name, stream, content_type):
+        url = super().put(name, stream, content_type)
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.uploads += 1
+        return url
@@ -0,0 +1,26 @@
+"""Add restaurants.menu_version
+
+Revision ID: 3c1f9a7d2b4e
+Revises: 8ee3e2cd843e
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f9a7d2b4e'
+down_revision = '8ee3e2cd843e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('restaurants', schema='restaurant') as batch_op:
+        batch_op.add_column(sa.Column('menu_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('restaurants', schema='restaurant') as batch_op:
+        batch_op.drop_column('menu_version')
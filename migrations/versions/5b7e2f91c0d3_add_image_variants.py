@@ -0,0 +1,32 @@
+"""Add image_variants to restaurants and menu_items
+
+Revision ID: 5b7e2f91c0d3
+Revises: a41d6e0c5f27
+Create Date: 2026-10-18 14:03:27.904116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e2f91c0d3'
+down_revision = 'a41d6e0c5f27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('restaurants', schema='restaurant') as batch_op:
+        batch_op.add_column(sa.Column('image_variants', sa.JSON(), nullable=True))
+
+    with op.batch_alter_table('menu_items', schema='restaurant') as batch_op:
+        batch_op.add_column(sa.Column('image_variants', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('menu_items', schema='restaurant') as batch_op:
+        batch_op.drop_column('image_variants')
+
+    with op.batch_alter_table('restaurants', schema='restaurant') as batch_op:
+        batch_op.drop_column('image_variants')
@@ -0,0 +1,159 @@
+"""Convert restaurant, category and menu item keys to native UUID
+
+Revision ID: 7f4a0b2c9d15
+Revises: e13a5c7f8b20
+Create Date: 2026-10-19 15:48:31.026114
+
+Online path (Postgres): the new uuid columns are added next to the old
+text ones, kept in sync by triggers, backfilled in small batches and
+indexed concurrently while the app keeps running. Only the final swap
+(drop old column, rename, attach PK/FK) takes ACCESS EXCLUSIVE locks, and
+it does no table scans: NOT NULL is proven by pre-validated CHECK
+constraints and the foreign keys are added NOT VALID and validated after
+the swap commits.
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7f4a0b2c9d15'
+down_revision = 'e13a5c7f8b20'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+# tabla -> columnas de texto que pasan a uuid
+COLUMNS = {
+    'restaurants': ['id'],
+    'categories': ['id', 'restaurant_id'],
+    'menu_items': ['id', 'category_id'],
+}
+
+# índices compuestos que dependen de las llaves foráneas (revisión e13a5c7f8b20)
+FK_INDEXES = {
+    'categories': ('ix_categories_restaurant_id_category', 'restaurant_id', 'category'),
+    'menu_items': ('ix_menu_items_category_id_name', 'category_id', 'name'),
+}
+
+
+def _backfill(table, columns):
+    assignments = ', '.join(f'{col}_uuid = {col}::uuid' for col in columns)
+    if context.is_offline_mode():
+        # con --sql no se puede iterar: se emite una sola actualización
+        op.execute(f'UPDATE restaurant.{table} SET {assignments} WHERE id_uuid IS NULL')
+        return
+
+    bind = op.get_bind()
+    while True:
+        result = bind.execute(sa.text(
+            f'UPDATE restaurant.{table} SET {assignments} '
+            f'WHERE id IN (SELECT id FROM restaurant.{table} WHERE id_uuid IS NULL LIMIT {BATCH_SIZE})'
+        ))
+        if result.rowcount == 0:
+            break
+
+
+def upgrade():
+    # 1. columnas nuevas, sincronizadas por trigger, y relleno por lotes
+    with op.get_context().autocommit_block():
+        for table, columns in COLUMNS.items():
+            for col in columns:
+                op.execute(f'ALTER TABLE restaurant.{table} ADD COLUMN IF NOT EXISTS {col}_uuid uuid')
+
+            assignments = '\n                    '.join(f'NEW.{col}_uuid := NEW.{col}::uuid;' for col in columns)
+            op.execute(f"""
+                CREATE OR REPLACE FUNCTION restaurant.{table}_uuid_sync() RETURNS trigger AS $$
+                BEGIN
+                    {assignments}
+                    RETURN NEW;
+                END
+                $$ LANGUAGE plpgsql
+            """)
+            op.execute(f'DROP TRIGGER IF EXISTS {table}_uuid_sync ON restaurant.{table}')
+            op.execute(f"""
+                CREATE TRIGGER {table}_uuid_sync BEFORE INSERT OR UPDATE ON restaurant.{table}
+                FOR EACH ROW EXECUTE FUNCTION restaurant.{table}_uuid_sync()
+            """)
+
+            _backfill(table, columns)
+
+            # NOT NULL sin escanear bajo bloqueo: CHECK validado ahora, SET NOT NULL en el swap.
+            # Idempotente como el resto del paso 1: si el swap falla (lock_timeout) se puede reintentar.
+            for col in columns:
+                op.execute(f"""
+                    DO $$ BEGIN
+                        ALTER TABLE restaurant.{table} ADD CONSTRAINT {table}_{col}_uuid_nn
+                            CHECK ({col}_uuid IS NOT NULL) NOT VALID;
+                    EXCEPTION WHEN duplicate_object THEN NULL;
+                    END $$
+                """)
+                op.execute(f'ALTER TABLE restaurant.{table} VALIDATE CONSTRAINT {table}_{col}_uuid_nn')
+
+        # 2. índices sobre las columnas nuevas, sin bloquear escrituras
+        for table in COLUMNS:
+            op.execute(f'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {table}_id_uuid_key '
+                       f'ON restaurant.{table} (id_uuid)')
+        for table, (name, fk, order_col) in FK_INDEXES.items():
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name}_uuid '
+                       f'ON restaurant.{table} ({fk}_uuid, {order_col})')
+
+    # 3. swap: solo cambios de catálogo, sin reescribir ni escanear tablas
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute('LOCK TABLE restaurant.restaurants, restaurant.categories, restaurant.menu_items '
+               'IN ACCESS EXCLUSIVE MODE')
+    op.execute('ALTER TABLE restaurant.menu_items DROP CONSTRAINT menu_items_category_id_fkey')
+    op.execute('ALTER TABLE restaurant.categories DROP CONSTRAINT categories_restaurant_id_fkey')
+
+    for table, columns in COLUMNS.items():
+        op.execute(f'DROP TRIGGER {table}_uuid_sync ON restaurant.{table}')
+        op.execute(f'DROP FUNCTION restaurant.{table}_uuid_sync()')
+        op.execute(f'ALTER TABLE restaurant.{table} DROP CONSTRAINT {table}_pkey')
+        for col in columns:
+            op.execute(f'ALTER TABLE restaurant.{table} DROP COLUMN {col}')
+            op.execute(f'ALTER TABLE restaurant.{table} RENAME COLUMN {col}_uuid TO {col}')
+            op.execute(f'ALTER TABLE restaurant.{table} ALTER COLUMN {col} SET NOT NULL')
+            op.execute(f'ALTER TABLE restaurant.{table} DROP CONSTRAINT {table}_{col}_uuid_nn')
+        op.execute(f'ALTER TABLE restaurant.{table} ADD CONSTRAINT {table}_pkey '
+                   f'PRIMARY KEY USING INDEX {table}_id_uuid_key')
+
+    for table, (name, fk, order_col) in FK_INDEXES.items():
+        op.execute(f'ALTER INDEX restaurant.{name}_uuid RENAME TO {name}')
+
+    op.execute('ALTER TABLE restaurant.categories ADD CONSTRAINT categories_restaurant_id_fkey '
+               'FOREIGN KEY (restaurant_id) REFERENCES restaurant.restaurants (id) NOT VALID')
+    op.execute('ALTER TABLE restaurant.menu_items ADD CONSTRAINT menu_items_category_id_fkey '
+               'FOREIGN KEY (category_id) REFERENCES restaurant.categories (id) NOT VALID')
+
+    # la cola de subidas es pequeña: se convierte directamente
+    op.execute('ALTER TABLE restaurant.image_uploads '
+               'ALTER COLUMN id TYPE uuid USING id::uuid, '
+               'ALTER COLUMN target_id TYPE uuid USING target_id::uuid, '
+               'ALTER COLUMN restaurant_id TYPE uuid USING restaurant_id::uuid')
+
+    # 4. validar las llaves foráneas después del commit del swap (SHARE UPDATE EXCLUSIVE)
+    with op.get_context().autocommit_block():
+        op.execute('ALTER TABLE restaurant.categories VALIDATE CONSTRAINT categories_restaurant_id_fkey')
+        op.execute('ALTER TABLE restaurant.menu_items VALIDATE CONSTRAINT menu_items_category_id_fkey')
+
+
+def downgrade():
+    # la vuelta atrás reescribe las tablas con bloqueo: hacerla en una ventana de mantenimiento
+    op.execute('ALTER TABLE restaurant.menu_items DROP CONSTRAINT menu_items_category_id_fkey')
+    op.execute('ALTER TABLE restaurant.categories DROP CONSTRAINT categories_restaurant_id_fkey')
+
+    op.execute('ALTER TABLE restaurant.image_uploads '
+               'ALTER COLUMN id TYPE varchar USING id::text, '
+               'ALTER COLUMN target_id TYPE varchar USING target_id::text, '
+               'ALTER COLUMN restaurant_id TYPE varchar USING restaurant_id::text')
+    for table, columns in COLUMNS.items():
+        op.execute(f'ALTER TABLE restaurant.{table} ' + ', '.join(
+            f'ALTER COLUMN {col} TYPE varchar USING {col}::text' for col in columns
+        ))
+
+    op.execute('ALTER TABLE restaurant.categories ADD CONSTRAINT categories_restaurant_id_fkey '
+               'FOREIGN KEY (restaurant_id) REFERENCES restaurant.restaurants (id)')
+    op.execute('ALTER TABLE restaurant.menu_items ADD CONSTRAINT menu_items_category_id_fkey '
+               'FOREIGN KEY (category_id) REFERENCES restaurant.categories (id)')
@@ -0,0 +1,42 @@
+"""Add image_uploads queue table
+
+Revision ID: a41d6e0c5f27
+Revises: 3c1f9a7d2b4e
+Create Date: 2026-10-18 11:40:02.551873
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41d6e0c5f27'
+down_revision = '3c1f9a7d2b4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('image_uploads',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('target_type', sa.String(length=20), nullable=False),
+    sa.Column('target_id', sa.String(), nullable=False),
+    sa.Column('restaurant_id', sa.String(), nullable=False),
+    sa.Column('folder', sa.String(length=50), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('staged_path', sa.String(length=500), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('url', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    schema='restaurant'
+    )
+    op.create_index('ix_restaurant_image_uploads_status', 'image_uploads', ['status'], unique=False, schema='restaurant')
+
+
+def downgrade():
+    op.drop_index('ix_restaurant_image_uploads_status', table_name='image_uploads', schema='restaurant')
+    op.drop_table('image_uploads', schema='restaurant')
@@ -0,0 +1,46 @@
+"""Cascade category and menu item deletes in the database
+
+Revision ID: b8e21d4f6a93
+Revises: 7f4a0b2c9d15
+Create Date: 2026-10-20 09:12:40.318552
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e21d4f6a93'
+down_revision = '7f4a0b2c9d15'
+branch_labels = None
+depends_on = None
+
+# (tabla, restricción, columna, tabla referenciada)
+FOREIGN_KEYS = [
+    ('categories', 'categories_restaurant_id_fkey', 'restaurant_id', 'restaurants'),
+    ('menu_items', 'menu_items_category_id_fkey', 'category_id', 'categories'),
+]
+
+
+def _replace_foreign_keys(on_delete):
+    # el swap es corto; NOT VALID evita recorrer las tablas con el bloqueo tomado
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    for table, name, column, referred in FOREIGN_KEYS:
+        op.execute(f'ALTER TABLE restaurant.{table} DROP CONSTRAINT {name}')
+        op.execute(f'ALTER TABLE restaurant.{table} ADD CONSTRAINT {name} '
+                   f'FOREIGN KEY ({column}) REFERENCES restaurant.{referred} (id){on_delete} NOT VALID')
+
+
+def _validate_foreign_keys():
+    with op.get_context().autocommit_block():
+        for table, name, _, _ in FOREIGN_KEYS:
+            op.execute(f'ALTER TABLE restaurant.{table} VALIDATE CONSTRAINT {name}')
+
+
+def upgrade():
+    _replace_foreign_keys(' ON DELETE CASCADE')
+    _validate_foreign_keys()
+
+
+def downgrade():
+    _replace_foreign_keys('')
+    _validate_foreign_keys()
@@ -0,0 +1,37 @@
+"""Add menu_snapshots table
+
+Revision ID: c4f7a9e2d318
+Revises: b8e21d4f6a93
+Create Date: 2026-10-20 14:37:02.905113
+
+Después de migrar, correr `flask menu rebuild` para crear los snapshots
+de los restaurantes existentes; mientras tanto el menú público se arma
+desde las tablas.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f7a9e2d318'
+down_revision = 'b8e21d4f6a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('menu_snapshots',
+    sa.Column('restaurant_id', sa.Uuid(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('document', sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), 'postgresql'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurant.restaurants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('restaurant_id'),
+    schema='restaurant'
+    )
+
+
+def downgrade():
+    op.drop_table('menu_snapshots', schema='restaurant')
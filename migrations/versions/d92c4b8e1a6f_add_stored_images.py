@@ -0,0 +1,32 @@
+"""Add stored_images content hash index
+
+Revision ID: d92c4b8e1a6f
+Revises: 5b7e2f91c0d3
+Create Date: 2026-10-18 16:21:55.310482
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd92c4b8e1a6f'
+down_revision = '5b7e2f91c0d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stored_images',
+    sa.Column('storage', sa.String(length=255), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('url', sa.String(length=255), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('storage', 'content_hash'),
+    schema='restaurant'
+    )
+
+
+def downgrade():
+    op.drop_table('stored_images', schema='restaurant')
@@ -0,0 +1,60 @@
+"""Add foreign key / menu order indexes and unique lower(name) index
+
+Revision ID: e13a5c7f8b20
+Revises: d92c4b8e1a6f
+Create Date: 2026-10-19 10:05:12.447390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e13a5c7f8b20'
+down_revision = 'd92c4b8e1a6f'
+branch_labels = None
+depends_on = None
+
+
+def _check_duplicate_names():
+    # el índice es único: con "Foo" y "foo" en la tabla el login no sabría
+    # cuál de los dos elegir. Hay que renombrar a mano antes de migrar.
+    if op.get_context().as_sql:
+        return
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT lower(name) FROM restaurant.restaurants "
+        "GROUP BY lower(name) HAVING count(*) > 1 LIMIT 20"
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "Hay restaurantes cuyo nombre solo difiere en mayúsculas: "
+            + ", ".join(duplicates) + ". Renombrarlos antes de crear ix_restaurants_name_lower."
+        )
+
+
+def upgrade():
+    _check_duplicate_names()
+
+    # CREATE INDEX CONCURRENTLY no bloquea escrituras, pero no puede correr
+    # dentro de una transacción. Si falla, deja un índice INVALID que hay
+    # que borrar antes de reintentar.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_categories_restaurant_id_category', 'categories',
+                        ['restaurant_id', 'category'], unique=False, schema='restaurant',
+                        postgresql_concurrently=True)
+        op.create_index('ix_menu_items_category_id_name', 'menu_items',
+                        ['category_id', 'name'], unique=False, schema='restaurant',
+                        postgresql_concurrently=True)
+        op.create_index('ix_restaurants_name_lower', 'restaurants',
+                        [sa.text('lower(name)')], unique=True, schema='restaurant',
+                        postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_restaurants_name_lower', table_name='restaurants',
+                      schema='restaurant', postgresql_concurrently=True)
+        op.drop_index('ix_menu_items_category_id_name', table_name='menu_items',
+                      schema='restaurant', postgresql_concurrently=True)
+        op.drop_index('ix_categories_restaurant_id_category', table_name='categories',
+                      schema='restaurant', postgresql_concurrently=True)
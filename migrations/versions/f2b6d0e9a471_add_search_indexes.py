@@ -0,0 +1,50 @@
+"""Add full-text and trigram search indexes
+
+Revision ID: f2b6d0e9a471
+Revises: c4f7a9e2d318
+Create Date: 2026-10-21 10:02:17.664130
+
+search_vector es una columna generada (STORED): Postgres la mantiene al
+día en cada INSERT/UPDATE, sin triggers. Agregarla reescribe la tabla con
+bloqueo exclusivo, así que en tablas grandes conviene correrla en una
+ventana de baja carga. Los índices GIN se crean CONCURRENTLY.
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b6d0e9a471'
+down_revision = 'c4f7a9e2d318'
+branch_labels = None
+depends_on = None
+
+TABLES = ['menu_items', 'restaurants']
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table in TABLES:
+        op.execute(
+            f'ALTER TABLE restaurant.{table} ADD COLUMN search_vector tsvector '
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('spanish'::regconfig, coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('spanish'::regconfig, coalesce(description, '')), 'B')"
+            ") STORED"
+        )
+
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.execute(f'CREATE INDEX CONCURRENTLY ix_{table}_search_vector '
+                       f'ON restaurant.{table} USING gin (search_vector)')
+            op.execute(f'CREATE INDEX CONCURRENTLY ix_{table}_name_trgm '
+                       f'ON restaurant.{table} USING gin (name gin_trgm_ops)')
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS restaurant.ix_{table}_name_trgm')
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS restaurant.ix_{table}_search_vector')
+    for table in TABLES:
+        op.execute(f'ALTER TABLE restaurant.{table} DROP COLUMN search_vector')
@@ -1,28 +1,93 @@
-document.addEventListener('DOMContentLoaded', function () {
-  document.querySelectorAll('.delete-btn').forEach(btn => {
-    btn.addEventListener('click', () => {
-      const url = btn.dataset.url;
-      Swal.fire({
-        title: '¿Estás seguro?',
-        text: "¡No podrás revertir esto!",
-        icon: 'warning',
-        showCancelButton: true,
-        confirmButtonColor: '#3085d6',
-        cancelButtonColor: '#d33',
-        confirmButtonText: 'Sí, eliminar',
-        cancelButtonText: 'Cancelar'
-      }).then((result) => {
-        if (result.isConfirmed) {
-          fetch(url, { method: 'POST' })
-            .then(response => {
-              if(response.ok) {
-                Swal.fire('Eliminado!', 'Se eliminó correctamente.', 'success')
-                  .then(() => window.location.href = '/dashboard');
-              }
-            });
-        }
-      });
-    });
+// Las acciones del menú se envían con fetch y el servidor responde solo el
+// fragmento HTML de la categoría o platillo que cambió (ver routes._respond).
+const FETCH_HEADERS = { 'X-Requested-With': 'fetch', 'Accept': 'text/html' };
+
+function serverMessage(response, fallback) {
+  const message = response.headers.get('X-Message');
+  return message ? decodeURIComponent(message) : fallback;
+}
+
+function toast(icon, title) {
+  Swal.fire({ toast: true, position: 'top-end', timer: 2500, showConfirmButton: false, icon, title });
+}
+
+async function send(url, body) {
+  const response = await fetch(url, { method: 'POST', body, headers: FETCH_HEADERS });
+  if (!response.ok) {
+    toast('error', serverMessage(response, 'No se pudo completar la acción.'));
+    return null;
+  }
+  toast('success', serverMessage(response, 'Listo.'));
+  return response.text();
+}
+
+// Formularios de agregar/editar: data-ajax="append" agrega el fragmento al
+// final de data-target, data-ajax="replace" reemplaza data-target.
+document.addEventListener('submit', async function (event) {
+  const form = event.target.closest('form[data-ajax]');
+  if (!form) return;
+  event.preventDefault();
+
+  const html = await send(form.action, new FormData(form));
+  const target = document.querySelector(form.dataset.target);
+  if (html === null || !target) return;
+
+  if (form.dataset.ajax === 'append') {
+    target.insertAdjacentHTML('beforeend', html);
+    form.reset();
+  } else {
+    target.outerHTML = html;
+  }
+});
+
+// Botones de eliminar: confirmación y luego se quita data-target del DOM.
+document.addEventListener('click', function (event) {
+  const btn = event.target.closest('.delete-btn');
+  if (!btn) return;
+
+  Swal.fire({
+    title: '¿Estás seguro?',
+    text: "¡No podrás revertir esto!",
+    icon: 'warning',
+    showCancelButton: true,
+    confirmButtonColor: '#3085d6',
+    cancelButtonColor: '#d33',
+    confirmButtonText: 'Sí, eliminar',
+    cancelButtonText: 'Cancelar'
+  }).then(async (result) => {
+    if (!result.isConfirmed) return;
+    const html = await send(btn.dataset.url);
+    const target = document.querySelector(btn.dataset.target);
+    if (html !== null && target) target.remove();
   });
 });
 
+// Menús grandes: las categorías vienen colapsadas y sus platillos se piden
+// por páginas (cursor en X-Next-Cursor) la primera vez que se abren.
+async function loadItems(panel) {
+  const url = new URL(panel.dataset.itemsUrl, window.location.origin);
+  if (panel.dataset.next) url.searchParams.set('after', panel.dataset.next);
+
+  const response = await fetch(url, { headers: FETCH_HEADERS });
+  if (!response.ok) {
+    toast('error', 'No se pudieron cargar los platillos.');
+    return;
+  }
+  panel.querySelector('.items').insertAdjacentHTML('beforeend', await response.text());
+  panel.dataset.next = response.headers.get('X-Next-Cursor') || '';
+  panel.dataset.loaded = 'true';
+  panel.querySelector('.load-more').hidden = !panel.dataset.next;
+}
+
+// toggle no burbujea: se escucha en la fase de captura
+document.addEventListener('toggle', function (event) {
+  const panel = event.target;
+  if (panel.matches('details.items-panel') && panel.open && !panel.dataset.loaded) {
+    loadItems(panel);
+  }
+}, true);
+
+document.addEventListener('click', function (event) {
+  const button = event.target.closest('.load-more');
+  if (button) loadItems(button.closest('details.items-panel'));
+});
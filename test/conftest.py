@@ -1,10 +1,17 @@
+import io
 import sys
 import os
 import pytest
+from contextlib import contextmanager
+from flask import g
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from app import create_app
+from app import create_app, db
+from app.models import Category, MenuItem, Restaurant
+from app.query_budget import QueryBudget
 
 @pytest.fixture
 def app():
@@ -19,5 +26,151 @@ def client(app):
             yield client
 
 
+# -----------------------
+# Base de datos local (SQLite en memoria)
+# -----------------------
 
+def _attach_restaurant_schema(dbapi_connection, connection_record):
+    # SQLite no maneja esquemas: adjuntamos una base en memoria llamada "restaurant"
+    dbapi_connection.execute("ATTACH DATABASE ':memory:' AS restaurant")
+    # SQLite no aplica las llaves foráneas (ni ON DELETE CASCADE) si no se activan
+    dbapi_connection.execute("PRAGMA foreign_keys = ON")
 
+
+@pytest.fixture
+def db_app(tmp_path):
+    app = create_app({
+        "TESTING": True,
+        "WTF_CSRF_ENABLED": False,
+        "UPLOAD_WORKERS": 0,
+        "UPLOAD_RETRY_DELAY": 0,
+        "UPLOAD_SPOOL_DIR": str(tmp_path / "uploads"),
+        "SQLALCHEMY_DATABASE_URI": "sqlite://",
+        "SQLALCHEMY_ENGINE_OPTIONS": {
+            "poolclass": StaticPool,
+            "connect_args": {"check_same_thread": False},
+        },
+    })
+
+    @app.teardown_request
+    def _end_request(exc):
+        # el contexto de la app queda abierto durante el test: limpiamos lo que
+        # Flask limpiaría al terminar cada petición
+        g.pop("_login_user", None)
+        db.session.remove()
+
+    with app.app_context():
+        event.listen(db.engine, "connect", _attach_restaurant_schema)
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def db_client(db_app):
+    with db_app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def restaurant(db_app):
+    restaurant = Restaurant(name="Resto Test", schedule="8-4",
+                            location="Bogotá", description="desc")
+    restaurant.set_password("Password123")
+    db.session.add(restaurant)
+    db.session.commit()
+    return restaurant
+
+
+@pytest.fixture
+def other_restaurant(db_app):
+    """Un segundo restaurante, para probar permisos entre restaurantes"""
+    other = Restaurant(name="Otro Resto")
+    other.set_password("Password123")
+    db.session.add(other)
+    db.session.commit()
+    return other
+
+
+@pytest.fixture
+def add_category(db_app):
+    """Uso: add_category(restaurant_id, items=3, name="Entradas") -> Category
+
+    items es una cantidad ("Plato 0", "Plato 1"...) o una lista de nombres o de
+    dicts con los campos del platillo (por defecto price=10, description="desc").
+    """
+    def factory(restaurant_id, items=0, name="Entradas"):
+        if isinstance(items, int):
+            items = [f"Plato {i}" for i in range(items)]
+        category = Category(category=name, restaurant_id=restaurant_id)
+        category.items = [
+            MenuItem(**{"price": 10, "description": "desc",
+                        **(item if isinstance(item, dict) else {"name": item})})
+            for item in items
+        ]
+        db.session.add(category)
+        db.session.commit()
+        # carga los ids: la categoría se sigue usando después de que cada petición cierra la sesión
+        [item.id for item in category.items]
+        return category
+
+    return factory
+
+
+def make_image(width=2000, height=1500, image_format="JPEG", exif=None):
+    """Genera los bytes de una imagen de prueba"""
+    from PIL import Image
+    buffer = io.BytesIO()
+    image = Image.new("RGB", (width, height), (200, 80, 40))
+    if exif is not None:
+        image.save(buffer, format=image_format, exif=exif)
+    else:
+        image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class FakeStorage:
+    """Almacenamiento local en memoria que reemplaza a Supabase en los tests"""
+
+    def __init__(self, failures=0):
+        self.objects = {}
+        self.failures = failures
+
+    def upload(self, file, folder="restaurants"):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("storage timeout")
+        name = f"{folder}/{file.filename}"
+        self.objects[name] = file.read()
+        return f"http://fake-storage/{name}"
+
+
+@pytest.fixture
+def fake_storage(db_app):
+    from app.uploads import upload_queue
+    storage = FakeStorage()
+    upload_queue.uploader = storage.upload
+    yield storage
+    upload_queue.uploader = None
+
+
+def login_as(client, restaurant):
+    """Simula el login guardando el id del restaurante en la sesión"""
+    restaurant_id = getattr(restaurant, "id", restaurant)
+    with client.session_transaction() as sess:
+        sess["_user_id"] = str(restaurant_id)
+        sess["_fresh"] = True
+
+
+@contextmanager
+def count_queries():
+    """Junta las sentencias SQL ejecutadas dentro del bloque"""
+    with QueryBudget() as budget:
+        yield budget.statements
+
+
+@pytest.fixture
+def query_budget(db_app):
+    """Uso: with query_budget(4): client.get(...) -- falla si hay más consultas"""
+    return QueryBudget
@@ -0,0 +1,74 @@
+import uuid
+
+from app import db
+from app.models import MenuItem
+from conftest import count_queries, login_as
+
+
+def test_batch_edit_updates_all_items(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    item_ids = [item.id for item in add_category(restaurant_id, 20).items]
+    login_as(db_client, restaurant_id)
+
+    changes = [{"item_id": str(item_id), "price": 12.5} for item_id in item_ids]
+    changes[0]["name"] = "Plato estrella"
+    with count_queries() as statements:
+        response = db_client.post("/edit_items", json=changes)
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data["updated"] == 20
+    assert {r["status"] for r in data["results"]} == {"updated"}
+
+    ownership = [s for s in statements if "JOIN restaurant.categories" in s]
+    assert len(ownership) == 1
+    db.session.expire_all()
+    assert {item.price for item in db.session.query(MenuItem)} == {12.5}
+    assert db.session.get(MenuItem, item_ids[0]).name == "Plato estrella"
+
+
+def test_batch_edit_reports_per_item_results(db_client, restaurant, other_restaurant, add_category):
+    restaurant_id = restaurant.id
+    own_id = add_category(restaurant_id, 1).items[0].id
+    other_id = add_category(other_restaurant.id, 1).items[0].id
+    login_as(db_client, restaurant_id)
+
+    response = db_client.post("/edit_items", json={"changes": [
+        {"item_id": str(own_id), "price": 8},
+        {"item_id": str(other_id), "price": 1},
+        {"item_id": str(uuid.uuid4()), "price": 1},
+        {"item_id": str(own_id), "price": 9},
+        {"item_id": "no-es-uuid", "price": 1},
+        {"item_id": str(own_id), "price": -3},
+    ]})
+
+    statuses = [r["status"] for r in response.get_json()["results"]]
+    assert statuses == ["updated", "forbidden", "not_found", "invalid", "invalid", "invalid"]
+    db.session.expire_all()
+    assert db.session.get(MenuItem, own_id).price == 8
+    assert db.session.get(MenuItem, other_id).price == 10
+
+
+def test_batch_edit_requires_a_list(db_client, restaurant):
+    login_as(db_client, restaurant)
+    assert db_client.post("/edit_items", json={"changes": []}).status_code == 400
+    assert db_client.post("/edit_items", data="no es json").status_code == 400
+
+
+def test_batch_edit_rejects_wrong_types(db_client, restaurant, add_category):
+    item_ids = [add_category(restaurant.id, 1).items[0].id]
+    login_as(db_client, restaurant)
+
+    response = db_client.post("/edit_items", json={"changes": [
+        {"item_id": str(item_ids[0]), "name": 123},
+        {"item_id": str(item_ids[0]), "name": ["x"]},
+        {"item_id": str(item_ids[0]), "description": {"a": 1}},
+        {"item_id": str(item_ids[0]), "description": ["x"]},
+        {"item_id": str(item_ids[0]), "description": None},
+    ]})
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert [r["status"] for r in results] == ["invalid"] * 4 + ["updated"]
+    db.session.expire_all()
+    assert db.session.get(MenuItem, item_ids[0]).description is None
@@ -0,0 +1,50 @@
+from app import db
+from app.models import Restaurant, Category, MenuItem
+from conftest import count_queries, login_as
+
+
+def _deletes(statements):
+    return [s for s in statements if s.lstrip().upper().startswith("DELETE")]
+
+
+def test_delete_category_is_one_statement(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    category_id = add_category(restaurant_id, 50).id
+    login_as(db_client, restaurant_id)
+
+    with count_queries() as statements:
+        response = db_client.post(f"/delete_category/{category_id}")
+    assert response.status_code == 302
+
+    # los platillos los borra la base, no una sentencia por fila
+    assert len(_deletes(statements)) == 1
+    # ni la categoría ni sus platillos se cargan antes de borrar
+    before = statements[:statements.index(_deletes(statements)[0])]
+    assert not any("restaurant.menu_items" in s or "restaurant.categories" in s for s in before)
+    assert db.session.get(Category, category_id) is None
+    assert db.session.query(MenuItem).count() == 0
+
+
+def test_delete_category_of_other_restaurant_is_denied(db_client, restaurant, other_restaurant, add_category):
+    category_id = add_category(other_restaurant.id, 1).id
+    login_as(db_client, restaurant)
+
+    response = db_client.post(f"/delete_category/{category_id}", follow_redirects=True)
+
+    assert "No tienes permiso para eliminar esta categoría." in response.get_data(as_text=True)
+    assert db.session.get(Category, category_id) is not None
+
+
+def test_delete_restaurant_cascades_in_database(db_app, restaurant, add_category):
+    restaurant_id = restaurant.id
+    add_category(restaurant_id, 50)
+    add_category(restaurant_id, 50)
+    db.session.expire_all()
+
+    with count_queries() as statements:
+        db.session.delete(db.session.get(Restaurant, restaurant_id))
+        db.session.commit()
+
+    assert len(_deletes(statements)) == 1
+    assert db.session.query(Category).count() == 0
+    assert db.session.query(MenuItem).count() == 0
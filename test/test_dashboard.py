@@ -0,0 +1,66 @@
+from app import db
+from app.cache import user_cache
+from app.menu import bump_menu_version
+from conftest import count_queries, login_as
+
+
+def _add_categories(add_category, restaurant_id, count, items_per_category=3):
+    for i in range(count):
+        add_category(restaurant_id, name=f"Categoría {i}", items=[
+            {"name": f"Plato {i}-{j}", "price": 10 + j} for j in range(items_per_category)
+        ])
+    bump_menu_version(restaurant_id)
+    db.session.commit()
+
+
+def _dashboard_query_count(client):
+    user_cache.clear()
+    with count_queries() as statements:
+        response = client.get("/dashboard")
+    assert response.status_code == 200
+    return len(statements)
+
+
+def test_dashboard_renders_menu(db_client, restaurant, add_category):
+    login_as(db_client, restaurant)
+    _add_categories(add_category, restaurant.id, 2)
+
+    html = db_client.get("/dashboard").get_data(as_text=True)
+    assert "Categoría 1" in html
+    assert "Plato 1-2" in html
+
+
+def test_dashboard_query_count_is_flat(db_client, restaurant, add_category):
+    """El número de consultas no debe crecer con el número de categorías"""
+    restaurant_id = restaurant.id
+    login_as(db_client, restaurant)
+    _add_categories(add_category, restaurant_id, 1)
+    few = _dashboard_query_count(db_client)
+
+    _add_categories(add_category, restaurant_id, 40)
+    many = _dashboard_query_count(db_client)
+
+    assert many == few
+    assert many <= 4
+
+
+def test_dashboard_uses_image_srcset(db_client, restaurant, add_category):
+    login_as(db_client, restaurant)
+    add_category(restaurant.id, [{"name": "Pizza", "image": "http://img/full.webp", "image_variants": {
+        "thumbnail": {"url": "http://img/thumb.webp", "width": 160},
+        "full": {"url": "http://img/full.webp", "width": 1600},
+    }}])
+
+    html = db_client.get("/dashboard").get_data(as_text=True)
+    assert 'src="http://img/thumb.webp"' in html
+    assert 'srcset="http://img/thumb.webp 160w, http://img/full.webp 1600w"' in html
+
+
+def test_dashboard_menu_is_ordered(db_client, restaurant, add_category):
+    login_as(db_client, restaurant)
+    for name in ("Postres", "Bebidas"):
+        add_category(restaurant.id, ["Zumo", "Agua"], name=name)
+
+    html = db_client.get("/dashboard").get_data(as_text=True)
+    assert html.index("Bebidas") < html.index("Postres")
+    assert html.index("<strong>Agua</strong>") < html.index("<strong>Zumo</strong>")
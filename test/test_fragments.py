@@ -0,0 +1,90 @@
+from urllib.parse import unquote
+
+from conftest import login_as
+
+FETCH = {"X-Requested-With": "fetch", "Accept": "text/html"}
+JSON = {"Accept": "application/json"}
+
+
+def test_add_category_returns_fragment(db_client, restaurant):
+    login_as(db_client, restaurant)
+
+    response = db_client.post("/add_category", data={"category": "Postres"}, headers=FETCH)
+
+    body = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert body.lstrip().startswith('<div class="category-box" id="category-')
+    assert "<html" not in body
+    assert unquote(response.headers["X-Message"]) == "Categoría agregada correctamente."
+
+
+def test_edit_item_returns_json(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    category = add_category(restaurant_id, ["Pizza"])
+    category_id, item_id = category.id, category.items[0].id
+    login_as(db_client, restaurant_id)
+
+    response = db_client.post(f"/edit_item/{item_id}", headers=JSON, data={
+        "name": "Pizza Doble", "price": "15", "description": "Con queso"})
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "message": "Platillo actualizado correctamente ",
+        "item": {"id": str(item_id), "category_id": str(category_id), "name": "Pizza Doble",
+                 "price": 15.0, "description": "Con queso", "image": None},
+    }
+
+
+def test_add_item_fragment_is_single_item(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    category_id = add_category(restaurant_id, ["Pizza"]).id
+    login_as(db_client, restaurant_id)
+
+    response = db_client.post(f"/add_item/{category_id}", headers=FETCH,
+                              data={"name": "Flan", "price": "6", "description": ""})
+
+    body = response.get_data(as_text=True)
+    assert body.lstrip().startswith('<li id="item-')
+    assert "Flan" in body and "Pizza" not in body
+
+
+def test_delete_item_fetch_returns_empty_body(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    item_id = add_category(restaurant_id, ["Pizza"]).items[0].id
+    login_as(db_client, restaurant_id)
+
+    response = db_client.post(f"/delete_item/{item_id}", headers=FETCH)
+
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == ""
+    assert unquote(response.headers["X-Message"]) == "Platillo eliminado correctamente 🗑️"
+
+
+def test_denied_write_returns_403_for_fetch(db_client, restaurant, other_restaurant, add_category):
+    item_id = add_category(other_restaurant.id, ["Pizza"]).items[0].id
+    login_as(db_client, restaurant)
+
+    response = db_client.post(f"/delete_item/{item_id}", headers=JSON)
+
+    assert response.status_code == 403
+    assert response.get_json()["message"] == "No tienes permiso para eliminar este platillo."
+
+
+def test_form_post_still_redirects(db_client, restaurant):
+    login_as(db_client, restaurant)
+
+    response = db_client.post("/add_category", data={"category": "Postres"})
+
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/dashboard")
+
+
+def test_item_delete_button_targets_item(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    item_id = add_category(restaurant_id, ["Pizza"]).items[0].id
+    login_as(db_client, restaurant_id)
+
+    body = db_client.get("/dashboard").get_data(as_text=True)
+
+    assert f'data-url="/delete_item/{item_id}"' in body
+    assert f'data-target="#item-{item_id}"' in body
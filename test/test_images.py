@@ -0,0 +1,46 @@
+import io
+
+from PIL import Image
+
+from app.utils import IMAGE_VARIANTS, image_srcset, process_image, upload_image_variants
+from conftest import FakeStorage, make_image
+
+
+def test_process_image_downscales_and_strips_exif():
+    exif = Image.Exif()
+    exif[0x010F] = "CámaraDePrueba"   # Make
+    source = make_image(3000, 2000, exif=exif)
+
+    variants = process_image(io.BytesIO(source))
+
+    assert set(variants) == set(IMAGE_VARIANTS)
+    for name, (data, width) in variants.items():
+        image = Image.open(io.BytesIO(data))
+        assert image.format == "WEBP"
+        assert image.width == width == IMAGE_VARIANTS[name]
+        assert not image.getexif()
+    assert len(variants["thumbnail"][0]) < len(source)
+
+
+def test_process_image_never_upscales():
+    variants = process_image(io.BytesIO(make_image(300, 200, image_format="PNG")), "JPEG")
+
+    assert variants["thumbnail"][1] == 160
+    assert variants["card"][1] == 300
+    assert variants["full"][1] == 300
+    assert Image.open(io.BytesIO(variants["full"][0])).format == "JPEG"
+
+
+def test_upload_image_variants_and_srcset():
+    storage = FakeStorage()
+    file = io.BytesIO(make_image())
+    file.filename = "plato.jpg"
+
+    variants = upload_image_variants(file, folder="menu", uploader=storage.upload)
+
+    assert variants["card"] == {"url": "http://fake-storage/menu/plato_card.webp", "width": 480}
+    assert image_srcset(variants) == (
+        "http://fake-storage/menu/plato_thumbnail.webp 160w, "
+        "http://fake-storage/menu/plato_card.webp 480w, "
+        "http://fake-storage/menu/plato_full.webp 1600w"
+    )
@@ -0,0 +1,38 @@
+import importlib
+import sys
+
+from app import utils
+from benchmarks.import_time import BOOT, BOOT_BUDGET, boot_time, import_times
+
+
+def test_boot_does_not_create_supabase_client():
+    modules = import_times(BOOT)
+
+    assert "app.routes" in modules
+    # el SDK se importa en la primera subida, no al arrancar
+    assert "supabase" not in modules
+
+
+def test_boot_time_within_budget():
+    # el mejor de tres: el presupuesto es para el código, no para el ruido de la máquina
+    assert min(boot_time() for _ in range(3)) < BOOT_BUDGET
+
+
+def test_importing_config_does_not_connect(mocker):
+    connect = mocker.patch("psycopg2.connect")
+    sys.modules.pop("config", None)
+
+    importlib.import_module("config")
+
+    connect.assert_not_called()
+
+
+def test_supabase_client_created_once_on_first_use(mocker, monkeypatch):
+    monkeypatch.setattr(utils, "supabase", None)
+    create_client = mocker.patch("supabase.create_client")
+
+    first = utils.get_supabase("http://supabase.local", "key")
+    second = utils.get_supabase()
+
+    assert first is second is create_client.return_value
+    create_client.assert_called_once_with("http://supabase.local", "key")
@@ -0,0 +1,74 @@
+import uuid
+
+from app import db
+from app.models import MenuItem
+from conftest import count_queries, login_as
+
+
+def _item_writes(statements):
+    return [s for s in statements
+            if s.lstrip().startswith(("UPDATE restaurant.menu_items", "DELETE FROM restaurant.menu_items"))]
+
+
+def _reads_menu_before(statements, write):
+    before = statements[:statements.index(write)]
+    return any("restaurant.menu_items" in s or "restaurant.categories" in s for s in before)
+
+
+def test_edit_item_is_single_statement(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    item_id = add_category(restaurant_id, ["Pizza"]).items[0].id
+    login_as(db_client, restaurant_id)
+
+    with count_queries() as statements:
+        response = db_client.post(f"/edit_item/{item_id}", data={
+            "name": "Pizza Doble", "price": "15", "description": "Con queso"})
+    assert response.status_code == 302
+
+    # sin SELECT previo del platillo ni de su categoría
+    assert len(_item_writes(statements)) == 1
+    assert not _reads_menu_before(statements, _item_writes(statements)[0])
+
+    item = db.session.get(MenuItem, item_id)
+    assert (item.name, item.price, item.description) == ("Pizza Doble", 15, "Con queso")
+
+
+def test_delete_item_is_single_statement(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    item_id = add_category(restaurant_id, ["Pizza"]).items[0].id
+    login_as(db_client, restaurant_id)
+
+    with count_queries() as statements:
+        db_client.post(f"/delete_item/{item_id}")
+
+    assert len(_item_writes(statements)) == 1
+    assert not _reads_menu_before(statements, _item_writes(statements)[0])
+    assert db.session.get(MenuItem, item_id) is None
+
+
+def test_edit_item_of_other_restaurant_is_denied(db_client, restaurant, other_restaurant, add_category):
+    item_id = add_category(other_restaurant.id, ["Pizza"]).items[0].id
+    login_as(db_client, restaurant)
+
+    response = db_client.post(f"/edit_item/{item_id}", data={
+        "name": "Hackeado", "price": "1", "description": "x"}, follow_redirects=True)
+
+    assert "No tienes permiso para editar este platillo." in response.get_data(as_text=True)
+    assert db.session.get(MenuItem, item_id).name == "Pizza"
+
+
+def test_delete_item_of_other_restaurant_is_denied(db_client, restaurant, other_restaurant, add_category):
+    item_id = add_category(other_restaurant.id, ["Pizza"]).items[0].id
+    login_as(db_client, restaurant)
+
+    response = db_client.post(f"/delete_item/{item_id}", follow_redirects=True)
+
+    assert "No tienes permiso para eliminar este platillo." in response.get_data(as_text=True)
+    assert db.session.get(MenuItem, item_id) is not None
+
+
+def test_missing_item_returns_404(db_client, restaurant):
+    login_as(db_client, restaurant)
+
+    assert db_client.post(f"/edit_item/{uuid.uuid4()}", data={"name": "x"}).status_code == 404
+    assert db_client.post(f"/delete_item/{uuid.uuid4()}").status_code == 404
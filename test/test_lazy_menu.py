@@ -0,0 +1,72 @@
+from app.pagination import encode_cursor
+from conftest import login_as
+
+FETCH = {"X-Requested-With": "fetch", "Accept": "text/html"}
+
+
+def test_large_menu_renders_collapsed(db_app, db_client, restaurant, add_category):
+    db_app.config["DASHBOARD_COLLAPSE_ITEMS"] = 5
+    restaurant_id = restaurant.id
+    category_id = add_category(restaurant_id, 12).id
+    login_as(db_client, restaurant_id)
+
+    html = db_client.get("/dashboard").get_data(as_text=True)
+
+    assert "12 platillos" in html
+    assert f'data-items-url="/categories/{category_id}/items"' in html
+    assert "Plato 0" not in html
+
+
+def test_small_menu_renders_items(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    add_category(restaurant_id, 3)
+    login_as(db_client, restaurant_id)
+
+    html = db_client.get("/dashboard").get_data(as_text=True)
+
+    assert "Plato 0" in html
+    assert "items-panel" not in html
+
+
+def test_items_keyset_pagination(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    category_id = add_category(restaurant_id, 7).id
+    login_as(db_client, restaurant_id)
+
+    names, cursor = [], None
+    while True:
+        url = f"/categories/{category_id}/items?limit=3" + (f"&after={cursor}" if cursor else "")
+        data = db_client.get(url, headers={"Accept": "application/json"}).get_json()
+        names.extend(item["name"] for item in data["items"])
+        cursor = data["next"]
+        if cursor is None:
+            break
+
+    assert names == [f"Plato {i}" for i in range(7)]
+
+
+def test_items_page_with_tampered_cursor(db_client, restaurant, add_category):
+    category_id = add_category(restaurant.id, 2).id
+    login_as(db_client, restaurant)
+
+    response = db_client.get(f"/categories/{category_id}/items?after={encode_cursor('a', 5)}")
+    assert response.status_code == 400
+
+
+def test_items_page_fragment(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    category_id = add_category(restaurant_id, 4).id
+    login_as(db_client, restaurant_id)
+
+    response = db_client.get(f"/categories/{category_id}/items?limit=2", headers=FETCH)
+
+    body = response.get_data(as_text=True)
+    assert body.count('<li id="item-') == 2
+    assert "X-Next-Cursor" in response.headers
+
+
+def test_items_page_of_other_restaurant_is_forbidden(db_client, restaurant, other_restaurant, add_category):
+    category_id = add_category(other_restaurant.id, 1).id
+    login_as(db_client, restaurant)
+
+    assert db_client.get(f"/categories/{category_id}/items").status_code == 403
@@ -0,0 +1,60 @@
+import asyncio
+import io
+
+import httpx
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from loadtest.storage import StubStorage
+from loadtest.runner import Session, Stats, UnexpectedResponse
+
+
+def test_stub_storage_writes_by_content(tmp_path):
+    storage = StubStorage(str(tmp_path))
+
+    url = storage.upload(FileStorage(stream=io.BytesIO(b"abc"), filename="foto.JPG"), folder="menu")
+    again = storage.upload(FileStorage(stream=io.BytesIO(b"abc"), filename="otra.jpg"), folder="menu")
+
+    assert url == again
+    assert url.startswith("http://storage.stub/images/menu/") and url.endswith(".jpg")
+    assert (tmp_path / url.split("/images/", 1)[1]).read_bytes() == b"abc"
+    assert storage.uploads == 2
+
+
+def test_stats_breaks_down_errors_per_route():
+    stats = Stats()
+    for elapsed in (0.01, 0.02, 0.03, 0.04):
+        stats.record("POST /add_item", elapsed)
+    stats.record("POST /add_item", 0.5, "HTTP 500")
+    stats.record("GET /dashboard", 0.01, "ConnectTimeout")
+
+    report = stats.summary(wall_time=2)
+
+    assert report["POST /add_item"]["count"] == 5
+    assert report["POST /add_item"]["errors"] == 1
+    assert report["POST /add_item"]["error_breakdown"] == {"HTTP 500": 1}
+    assert report["POST /add_item"]["p95"] == 0.5
+    assert report["POST /add_item"]["max"] == 0.5
+    assert report["POST /add_item"]["rps"] == 2.5
+    assert report["GET /dashboard"]["error_breakdown"] == {"ConnectTimeout": 1}
+
+
+def test_failed_registration_is_reported_on_register():
+    def handler(request):
+        if request.method == "POST":
+            # un registro fallido vuelve al formulario con un flash
+            return httpx.Response(302, headers={"location": "/register"})
+        return httpx.Response(200)
+
+    async def start(stats):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler),
+                                     base_url="http://app.test") as client:
+            await Session(client, stats, think_time=0).start()
+
+    stats = Stats()
+    with pytest.raises(UnexpectedResponse, match="POST /register: redirect a /register"):
+        asyncio.run(start(stats))
+
+    report = stats.summary(wall_time=1)
+    assert report["POST /register"]["errors"] == 1
+    assert "POST /login" not in report
@@ -1,4 +1,6 @@
 import pytest
+from sqlalchemy.exc import IntegrityError
+from app import db
 from app.models import Restaurant
 
 
@@ -10,36 +12,21 @@ def client(app):
     return app.test_client()  # Retornamos el cliente de pruebas de Flask
 
 
-def test_login_invalid_credentials(client, mocker):
-    # Creamos un restaurante ficticio en memoria
-    fake_restaurant = Restaurant(name="RestFail", schedule="9-5",
-                                 location="TestCity", description="test", image="url")
-    fake_restaurant.set_password("Password123")  # Asignamos una contraseña válida
-
-    # Simulamos que la consulta devuelve este restaurante
-    mocker.patch("app.models.Restaurant.query.filter_by",
-                 return_value=mocker.Mock(first=lambda: fake_restaurant))
-    # Simulamos que la verificación de contraseña siempre falla
-    mocker.patch.object(fake_restaurant, "check_password", return_value=False)
-
-    # Intentamos hacer login con credenciales incorrectas
-    response = client.post("/login",
-                           data={"name": "RestFail", "password": "wrong"},
-                           follow_redirects=True)
+def test_login_invalid_credentials(db_client, restaurant):
+    # El restaurante existe, pero la contraseña no coincide
+    response = db_client.post("/login",
+                              data={"name": "Resto Test", "password": "wrong"},
+                              follow_redirects=True)
 
     # Verificamos que el sistema muestra un mensaje de error de credenciales
     assert "incorrectos" in response.data.decode("utf-8")
 
 
-def test_login_nonexistent_user(client, mocker):
-    # Simulamos que la consulta no encuentra ningún restaurante
-    mocker.patch("app.models.Restaurant.query.filter_by",
-                 return_value=mocker.Mock(first=lambda: None))
-
+def test_login_nonexistent_user(db_client, restaurant):
     # Intentamos hacer login con un usuario que no existe
-    response = client.post("/login",
-                           data={"name": "NoExiste", "password": "1234"},
-                           follow_redirects=True)
+    response = db_client.post("/login",
+                              data={"name": "NoExiste", "password": "Password123"},
+                              follow_redirects=True)
 
     # Verificamos que aparece el mensaje de credenciales incorrectas
     assert "incorrectos" in response.data.decode("utf-8")
@@ -56,3 +43,20 @@ def test_logout(client, mocker):
 
     # Verificamos que aparece el mensaje de cierre de sesión
     assert "Sesión cerrada" in response.data.decode("utf-8")
+
+
+def test_login_is_case_insensitive(db_client, restaurant):
+    # El nombre se busca con lower(name), respaldado por ix_restaurants_name_lower
+    response = db_client.post("/login",
+                              data={"name": "resto TEST", "password": "Password123"},
+                              follow_redirects=True)
+
+    assert "Inicio de sesión exitoso" in response.data.decode("utf-8")
+
+
+def test_names_unique_ignoring_case(db_app, restaurant):
+    # ix_restaurants_name_lower es único: el login por lower(name) nunca es ambiguo
+    db.session.add(Restaurant(name="RESTO test", password_hash="x"))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
@@ -0,0 +1,56 @@
+import uuid
+
+from conftest import count_queries, login_as
+
+EMPANADAS = {"name": "Empanadas", "price": 8.5, "description": "De carne"}
+
+
+def test_menu_api_is_public_json(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    add_category(restaurant_id, [EMPANADAS])
+
+    response = db_client.get(f"/api/restaurants/{restaurant_id}/menu")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'"{restaurant_id}-0"'
+    assert "public" in response.headers["Cache-Control"]
+    assert "max-age=30" in response.headers["Cache-Control"]
+    data = response.get_json()
+    assert data["name"] == "Resto Test"
+    assert data["categories"][0]["name"] == "Entradas"
+    assert data["categories"][0]["items"][0] == {
+        "id": data["categories"][0]["items"][0]["id"],
+        "name": "Empanadas", "price": 8.5, "description": "De carne", "image": None,
+    }
+
+
+def test_menu_api_not_modified_skips_menu_tables(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    add_category(restaurant_id, [EMPANADAS])
+    etag = db_client.get(f"/api/restaurants/{restaurant_id}/menu").headers["ETag"]
+
+    with count_queries() as statements:
+        response = db_client.get(f"/api/restaurants/{restaurant_id}/menu",
+                                 headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert len(statements) == 1
+    assert "categories" not in statements[0] and "menu_items" not in statements[0]
+
+
+def test_menu_api_etag_changes_after_write(db_client, restaurant):
+    restaurant_id = restaurant.id
+    etag = db_client.get(f"/api/restaurants/{restaurant_id}/menu").headers["ETag"]
+
+    login_as(db_client, restaurant_id)
+    db_client.post("/add_category", data={"category": "Postres"})
+
+    response = db_client.get(f"/api/restaurants/{restaurant_id}/menu", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert [c["name"] for c in response.get_json()["categories"]] == ["Postres"]
+
+
+def test_menu_api_unknown_restaurant(db_client):
+    assert db_client.get(f"/api/restaurants/{uuid.uuid4()}/menu").status_code == 404
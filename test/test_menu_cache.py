@@ -0,0 +1,39 @@
+from app.cache import LRUCache, menu_cache
+from conftest import login_as
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")          # "a" pasa a ser el más reciente
+    cache.set("c", 3)       # se desaloja "b"
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+    assert len(cache) == 2
+
+
+def test_dashboard_menu_is_cached(db_client, restaurant):
+    login_as(db_client, restaurant)
+
+    first = db_client.get("/dashboard")
+    second = db_client.get("/dashboard")
+
+    assert first.headers["X-Menu-Cache"] == "miss"
+    assert second.headers["X-Menu-Cache"] == "hit"
+    assert menu_cache.stats()["hits"] == 1
+
+
+def test_write_routes_invalidate_menu_cache(db_client, restaurant):
+    login_as(db_client, restaurant)
+    db_client.get("/dashboard")
+
+    db_client.post("/add_category", data={"category": "Postres"})
+    response = db_client.get("/dashboard")
+
+    assert response.headers["X-Menu-Cache"] == "miss"
+    assert "Postres" in response.get_data(as_text=True)
@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+
+from app import db
+from app import menu_export
+from app.models import MenuItem
+from conftest import login_as
+
+
+def _items(count):
+    # precios con decimales para revisar cómo se exportan
+    return [{"name": f"Plato {i}", "price": i + 0.5} for i in range(count)]
+
+
+def test_export_csv(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    add_category(restaurant_id, _items(3))
+    login_as(db_client, restaurant_id)
+
+    response = db_client.get("/export_menu.csv")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    assert "attachment" in response.headers["Content-Disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row["name"] for row in rows] == ["Plato 0", "Plato 1", "Plato 2"]
+    assert rows[1] == {"category": "Entradas", "name": "Plato 1", "price": "1.5",
+                       "description": "desc", "image_url": ""}
+
+
+def test_export_ndjson_only_includes_own_menu(db_client, restaurant, other_restaurant, add_category):
+    restaurant_id = restaurant.id
+    add_category(other_restaurant.id, _items(3), name="Ajena")
+    add_category(restaurant_id, _items(2))
+    login_as(db_client, restaurant_id)
+
+    response = db_client.get("/export_menu.ndjson")
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 2
+    assert {line["category"] for line in lines} == {"Entradas"}
+
+
+def test_export_is_streamed_in_chunks(db_client, restaurant, add_category, monkeypatch):
+    restaurant_id = restaurant.id
+    monkeypatch.setattr(menu_export, "YIELD_PER", 2)
+    add_category(restaurant_id, _items(5))
+    login_as(db_client, restaurant_id)
+
+    response = db_client.get("/export_menu.ndjson", buffered=False)
+    chunks = [chunk for chunk in response.response if chunk]
+    response.close()
+
+    assert response.is_streamed
+    assert len(chunks) == 3
+
+
+def test_export_round_trips_through_import(db_client, restaurant, add_category):
+    restaurant_id = restaurant.id
+    add_category(restaurant_id, _items(3))
+    login_as(db_client, restaurant_id)
+    exported = db_client.get("/export_menu.csv").get_data()
+
+    db_client.post("/import_menu", data={"file": (io.BytesIO(exported), "menu.csv")},
+                   content_type="multipart/form-data")
+
+    assert db.session.query(MenuItem).count() == 6
+
+
+def test_export_unknown_format(db_client, restaurant):
+    login_as(db_client, restaurant)
+    assert db_client.get("/export_menu.xml").status_code == 404
@@ -0,0 +1,103 @@
+import io
+import json
+
+from app import db
+from app.models import Category, MenuItem
+from conftest import count_queries, login_as
+
+
+def _upload(client, content, filename):
+    return client.post("/import_menu", data={"file": (io.BytesIO(content.encode()), filename)},
+                       content_type="multipart/form-data", follow_redirects=True)
+
+
+def test_import_csv(db_client, restaurant):
+    restaurant_id = restaurant.id
+    db.session.add(Category(category="Entradas", restaurant_id=restaurant_id))
+    db.session.commit()
+    login_as(db_client, restaurant_id)
+
+    csv_content = (
+        "category,name,price,description,image_url\n"
+        "Entradas,Empanadas,8.5,De carne,\n"
+        "Postres,Flan,6,,https://cdn.example.com/flan.jpg\n"
+    )
+    response = _upload(db_client, csv_content, "menu.csv")
+
+    assert "Se importaron 2 platillos (1 categorías nuevas)." in response.get_data(as_text=True)
+    assert db.session.query(Category).filter_by(restaurant_id=restaurant_id).count() == 2
+    flan = db.session.query(MenuItem).filter_by(name="Flan").one()
+    assert flan.price == 6
+    assert flan.image == "https://cdn.example.com/flan.jpg"
+    assert flan.category.category == "Postres"
+
+
+def test_import_nested_json(db_client, restaurant):
+    login_as(db_client, restaurant)
+    content = json.dumps({"categories": [
+        {"category": "Bebidas", "items": [{"name": "Limonada", "price": 4}, {"name": "Café", "price": 3}]},
+    ]})
+
+    response = _upload(db_client, content, "menu.json")
+
+    assert response.status_code == 200
+    assert db.session.query(MenuItem).count() == 2
+
+
+def test_import_reports_row_errors_and_inserts_nothing(db_client, restaurant):
+    login_as(db_client, restaurant)
+    csv_content = (
+        "category,name,price\n"
+        "Entradas,Empanadas,8.5\n"
+        ",Sin categoría,3\n"
+        "Postres,Flan,gratis\n"
+    )
+
+    response = _upload(db_client, csv_content, "menu.csv")
+    body = response.get_data(as_text=True)
+
+    assert response.status_code == 400
+    assert "Fila 3: falta la categoría" in body
+    assert "Fila 4: el precio debe ser un número mayor o igual a 0" in body
+    assert db.session.query(MenuItem).count() == 0
+
+
+def test_import_rejects_unknown_format(db_client, restaurant):
+    login_as(db_client, restaurant)
+
+    response = _upload(db_client, "name,price\n", "menu.txt")
+
+    assert response.status_code == 400
+    assert "El archivo debe ser .csv o .json." in response.get_data(as_text=True)
+
+
+def test_import_rejects_oversized_csv_field(db_client, restaurant):
+    login_as(db_client, restaurant)
+
+    response = _upload(db_client, "category,name,price,description\nEntradas,Sopa,5," + "x" * 200000, "menu.csv")
+
+    assert response.status_code == 400
+    assert "CSV inválido en la fila 2" in response.get_data(as_text=True)
+    assert MenuItem.query.count() == 0
+
+
+def test_import_rejects_files_over_the_limit(db_app, db_client, restaurant):
+    db_app.config["MENU_IMPORT_MAX_BYTES"] = 1024
+    login_as(db_client, restaurant)
+
+    response = _upload(db_client, "category,name,price\n" + "Entradas,Sopa,5\n" * 100, "menu.csv")
+
+    assert response.status_code == 400
+    assert "El archivo supera el máximo" in response.get_data(as_text=True)
+
+
+def test_import_uses_batched_inserts(db_client, restaurant):
+    login_as(db_client, restaurant)
+    rows = "\n".join(f"Categoría {i % 5},Plato {i},{i}" for i in range(500))
+
+    with count_queries() as statements:
+        _upload(db_client, "category,name,price\n" + rows, "menu.csv")
+
+    inserts = [s for s in statements if s.lstrip().startswith("INSERT INTO restaurant.menu_items")]
+    assert len(inserts) == 1
+    assert db.session.query(MenuItem).count() == 500
@@ -0,0 +1,26 @@
+import uuid
+
+import pytest
+
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    item_id = uuid.uuid4()
+
+    assert decode_cursor(encode_cursor("Pizza", item_id), str, uuid.UUID) == ("Pizza", item_id)
+    assert decode_cursor(encode_cursor(3, item_id), float, uuid.UUID) == (3.0, item_id)
+
+
+@pytest.mark.parametrize("values, types", [
+    (("a", 5), (str, uuid.UUID)),
+    ((5, str(uuid.uuid4())), (str, uuid.UUID)),
+    (("1.5", str(uuid.uuid4())), (float, uuid.UUID)),
+    ((True, str(uuid.uuid4())), (float, uuid.UUID)),
+    (("a", None), (str, uuid.UUID)),
+    (("a", "no-es-uuid"), (str, uuid.UUID)),
+])
+def test_cursor_with_wrong_types_is_invalid(values, types):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor(*values), *types)
+
@@ -0,0 +1,58 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app.pool import (TimedQueuePool, checked_out, checkout_wait, checkouts,
+                      engine_options_from_env, instrument_pool)
+
+
+def test_default_pool_profile_from_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "12")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "4")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "300")
+
+    options = engine_options_from_env()
+
+    assert options["poolclass"] is TimedQueuePool
+    assert options["pool_size"] == 12
+    assert options["max_overflow"] == 4
+    assert options["pool_recycle"] == 300
+    assert options["pool_pre_ping"] is True
+
+
+def test_pgbouncer_profile_disables_local_pool(monkeypatch):
+    monkeypatch.setenv("DB_POOL_PROFILE", "pgbouncer")
+
+    options = engine_options_from_env()
+
+    assert options == {"poolclass": NullPool, "pool_pre_ping": False}
+
+
+def test_pool_events_are_exported():
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=1, max_overflow=0)
+    instrument_pool(engine)
+    waits_before = checkout_wait.count()
+    checkouts_before = checkouts.value()
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        in_use = checked_out.value()
+    assert checked_out.value() == in_use - 1
+    assert checkouts.value() == checkouts_before + 1
+    assert checkout_wait.count() == waits_before + 1
+
+
+def test_metrics_endpoint(db_client, restaurant):
+    response = db_client.get("/metrics")
+
+    body = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert "# TYPE db_pool_checkouts_total counter" in body
+    assert "# TYPE db_pool_checkout_wait_seconds histogram" in body
+
+
+def test_metrics_endpoint_token(db_app, db_client):
+    db_app.config["METRICS_TOKEN"] = "secreto"
+
+    assert db_client.get("/metrics").status_code == 401
+    response = db_client.get("/metrics", headers={"Authorization": "Bearer secreto"})
+    assert response.status_code == 200
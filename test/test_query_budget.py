@@ -0,0 +1,87 @@
+import logging
+
+import pytest
+
+from app import db
+from app.cache import user_cache
+from app.models import Category
+from app.query_budget import QueryBudget, QueryBudgetExceeded, repeated_statements
+from conftest import login_as
+
+# consultas por petición con la caché de usuarios fría, sin importar el tamaño del menú.
+# Escribir: usuario + la escritura + menu_version; el snapshot se arma al leerlo.
+BUDGETS = {
+    "dashboard": 4,
+    "edit_item": 3,
+    "delete_item": 3,
+    "delete_category": 3,
+}
+
+
+def _add_menu(add_category, restaurant_id, categories, items):
+    for i in range(categories):
+        category = add_category(restaurant_id, [f"Plato {i}-{j}" for j in range(items)], name=f"Categoría {i}")
+    return category.id, category.items[0].id
+
+
+@pytest.mark.parametrize("categories, items", [(2, 2), (30, 20), (4, 300)])
+def test_routes_stay_within_budget(db_client, restaurant, add_category, query_budget, categories, items):
+    restaurant_id = restaurant.id
+    category_id, item_id = _add_menu(add_category, restaurant_id, categories, items)
+    login_as(db_client, restaurant_id)
+
+    requests = [
+        ("dashboard", lambda: db_client.get("/dashboard")),
+        ("edit_item", lambda: db_client.post(f"/edit_item/{item_id}",
+                                             data={"name": "Pizza", "price": "12", "description": ""})),
+        ("delete_item", lambda: db_client.post(f"/delete_item/{item_id}")),
+        ("delete_category", lambda: db_client.post(f"/delete_category/{category_id}")),
+    ]
+    for route, send in requests:
+        user_cache.clear()
+        with query_budget(BUDGETS[route]):
+            assert send().status_code < 400
+
+
+def test_budget_exceeded_lists_statements(db_app):
+    with pytest.raises(QueryBudgetExceeded) as error:
+        with QueryBudget(1):
+            db.session.execute(db.text("SELECT 1"))
+            db.session.execute(db.text("SELECT 2"))
+
+    assert "2 consultas SQL, el presupuesto es 1" in str(error.value)
+    assert "SELECT 2" in str(error.value)
+
+
+def test_budget_as_decorator(db_app, restaurant, add_category):
+    _add_menu(add_category, restaurant.id, 3, 1)
+
+    @QueryBudget(1)
+    def lazy_loads():
+        for category in Category.query.all():
+            len(category.items)
+
+    with pytest.raises(QueryBudgetExceeded):
+        lazy_loads()
+
+
+def test_repeated_statements():
+    statements = ["SELECT a WHERE id = ?"] * 3 + ["SELECT b"]
+    assert repeated_statements(statements, 3) == [("SELECT a WHERE id = ?", 3)]
+    assert repeated_statements(statements, 4) == []
+
+
+def test_n_plus_one_is_logged(db_app, db_client, restaurant, add_category, caplog):
+    db_app.config.update(N_PLUS_ONE_LOG=True, N_PLUS_ONE_THRESHOLD=3)
+
+    @db_app.route("/n-plus-one")
+    def n_plus_one():
+        for category in Category.query.all():
+            len(category.items)
+        return "ok"
+
+    _add_menu(add_category, restaurant.id, 4, 1)
+    with caplog.at_level(logging.WARNING):
+        db_client.get("/n-plus-one")
+
+    assert any("Posible N+1 en n_plus_one" in record.getMessage() for record in caplog.records)
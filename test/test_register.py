@@ -1,6 +1,7 @@
 import io
 import pytest
 from app.models import Restaurant
+from conftest import make_image
 
 
 @pytest.fixture
@@ -11,18 +12,7 @@ def client(app):
     return app.test_client()  # Cliente de pruebas de Flask
 
 
-def test_register_restaurant(client, mocker):
-    # Simulamos que la función de subida de imágenes devuelve una URL falsa
-    mocker.patch("app.routes.upload_image_to_supabase",
-                 return_value="http://fake.url/image.png")
-
-    # Simulamos que no existe ningún restaurante con el mismo nombre
-    mocker.patch("app.models.Restaurant.query.filter_by",
-                 return_value=mocker.Mock(first=lambda: None))
-    # Evitamos que realmente se inserte en la BD
-    mocker.patch("app.db.session.add")
-    mocker.patch("app.db.session.commit")
-
+def test_register_restaurant(db_client, fake_storage):
     # Datos válidos para registrar un restaurante
     data = {
         "name": "NuevoRest",
@@ -30,16 +20,20 @@ def test_register_restaurant(client, mocker):
         "schedule": "8-4",
         "location": "Bogotá",
         "description": "Un restaurante nuevo",
-        "image": (io.BytesIO(b"fake-image-data"), "resto.png"),
+        "image": (io.BytesIO(make_image()), "resto.png"),
     }
     # Enviamos la petición POST al endpoint de registro
-    response = client.post("/register",
-                           data=data,
-                           content_type="multipart/form-data",
-                           follow_redirects=True)
+    response = db_client.post("/register",
+                              data=data,
+                              content_type="multipart/form-data",
+                              follow_redirects=True)
 
     # Verificamos que aparece el mensaje de éxito
     assert "Restaurante registrado con éxito" in response.data.decode("utf-8")
+    # La imagen pasa por la cola de subidas y queda en el almacenamiento
+    restaurant = Restaurant.find_by_name("NuevoRest")
+    assert restaurant.image == "http://fake-storage/restaurants/resto_full.webp"
+    assert "restaurants/resto_full.webp" in fake_storage.objects
 
 
 def test_register_missing_fields(client):
@@ -58,11 +52,7 @@ def test_register_missing_fields(client):
     assert "Todos los campos son obligatorios" in response.data.decode("utf-8")
 
 
-def test_register_invalid_password(client, mocker):
-    # Simulamos que no existe ningún restaurante con el mismo nombre
-    mocker.patch("app.models.Restaurant.query.filter_by",
-                 return_value=mocker.Mock(first=lambda: None))
-
+def test_register_invalid_password(db_client):
     # Datos con contraseña débil (no cumple requisitos)
     data = {
         "name": "WeakRest",
@@ -73,26 +63,20 @@ def test_register_invalid_password(client, mocker):
         "image": (io.BytesIO(b"fake"), "weak.png"),
     }
     # Enviamos la petición POST con datos inválidos
-    response = client.post("/register",
-                           data=data,
-                           content_type="multipart/form-data",
-                           follow_redirects=True)
+    response = db_client.post("/register",
+                              data=data,
+                              content_type="multipart/form-data",
+                              follow_redirects=True)
 
-    # Verificamos que aparece el mensaje de contraseña inválida
+    # Verificamos que aparece el mensaje de contraseña inválida y no se guardó nada
     assert "La contraseña debe tener" in response.data.decode("utf-8")
+    assert Restaurant.query.count() == 0
 
 
-def test_register_duplicate_restaurant(client, mocker):
-    # Creamos un restaurante ficticio que ya existe en la BD
-    fake_restaurant = Restaurant(name="Duplicado", schedule="9-5",
-                                 location="City", description="desc", image="url")
-    # Simulamos que la consulta devuelve ese restaurante existente
-    mocker.patch("app.models.Restaurant.query.filter_by",
-                 return_value=mocker.Mock(first=lambda: fake_restaurant))
-
-    # Datos que intentan registrar un restaurante duplicado
+def test_register_duplicate_restaurant(db_client, restaurant):
+    # Datos que intentan registrar un restaurante que ya existe en la BD
     data = {
-        "name": "Duplicado",
+        "name": "Resto Test",
         "password": "Password123",
         "schedule": "9-5",
         "location": "Medellín",
@@ -100,10 +84,29 @@ def test_register_duplicate_restaurant(client, mocker):
         "image": (io.BytesIO(b"fake-img"), "dup.png"),
     }
     # Enviamos la petición POST con datos duplicados
-    response = client.post("/register",
-                           data=data,
-                           content_type="multipart/form-data",
-                           follow_redirects=True)
+    response = db_client.post("/register",
+                              data=data,
+                              content_type="multipart/form-data",
+                              follow_redirects=True)
 
     # Verificamos que aparece el mensaje de restaurante ya registrado
     assert "ya está registrado" in response.data.decode("utf-8")
+    assert Restaurant.query.count() == 1
+
+
+def test_register_same_name_other_case_race(db_client, restaurant, mocker):
+    # la verificación previa no vio al otro restaurante: el índice único lo frena
+    mocker.patch("app.routes.Restaurant.find_by_name", return_value=None)
+    data = {
+        "name": "RESTO TEST",
+        "password": "Password123",
+        "schedule": "8-4",
+        "location": "Bogotá",
+        "description": "Otro",
+        "image": (io.BytesIO(b"img"), "resto.jpg"),
+    }
+    response = db_client.post("/register", data=data, content_type="multipart/form-data",
+                              follow_redirects=True)
+
+    assert "ya está registrado" in response.get_data(as_text=True)
+    assert Restaurant.query.count() == 1
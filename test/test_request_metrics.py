@@ -0,0 +1,67 @@
+import io
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.cache import menu_cache
+from app.instrumentation import db_queries, db_query_errors, request_duration, request_queries
+from app.models import Category, Restaurant
+from app.uploads import storage_upload_time
+from conftest import login_as, make_image
+
+
+def test_request_latency_and_queries_are_recorded(db_client, restaurant):
+    login_as(db_client, restaurant)
+    requests_before = request_duration.count(endpoint="main.dashboard", method="GET", status=200)
+    queries_before = db_queries.value(endpoint="main.dashboard")
+    menu_cache.clear()
+
+    db_client.get("/dashboard")
+
+    assert request_duration.count(endpoint="main.dashboard", method="GET", status=200) == requests_before + 1
+    assert request_queries.count(endpoint="main.dashboard") >= 1
+    assert db_queries.value(endpoint="main.dashboard") > queries_before
+
+
+def test_metrics_exports_request_sql_upload_and_cache_metrics(db_client, restaurant):
+    db_client.get("/nada")
+    body = db_client.get("/metrics").get_data(as_text=True)
+
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_request_duration_seconds_count{endpoint="unmatched",method="GET",status="404"}' in body
+    assert "# TYPE http_request_db_queries histogram" in body
+    assert "# TYPE db_query_seconds_total counter" in body
+    assert "# TYPE image_storage_upload_seconds histogram" in body
+    assert 'cache_hits_total{cache="menu"}' in body
+    assert 'cache_entries{cache="user"}' in body
+
+
+def test_storage_upload_time_is_recorded(db_client, restaurant, fake_storage):
+    before = storage_upload_time.count(result="ok")
+    login_as(db_client, restaurant)
+
+    db_client.post("/add_category", data={"category": "Entradas"})
+    category_id = Category.query.one().id
+    db_client.post(f"/add_item/{category_id}", data={
+        "name": "Pizza", "price": "10", "description": "",
+        "image": (io.BytesIO(make_image(400, 300)), "pizza.jpg"),
+    }, content_type="multipart/form-data")
+
+    assert storage_upload_time.count(result="ok") > before
+
+
+def test_failed_statements_are_counted(db_app, restaurant):
+    queries_before = db_queries.value(endpoint="background")
+    errors_before = db_query_errors.value(endpoint="background")
+
+    db.session.add(Restaurant(name="Resto Test", password_hash="x"))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+    assert db_query_errors.value(endpoint="background") == errors_before + 1
+    assert db_queries.value(endpoint="background") == queries_before + 1
+    with db.engine.connect() as connection:
+        # nada queda colgado en la conexión del pool
+        assert "_query_start" not in connection.connection.info
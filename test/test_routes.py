@@ -3,6 +3,7 @@ import pytest
 from app import create_app, db
 from app.models import Category, MenuItem, Restaurant
 from app.forms import RegisterForm, LoginForm
+from conftest import login_as, make_image
 
 
 @pytest.fixture
@@ -88,33 +89,25 @@ def test_delete_category(client, mocker):
 # Ítems
 # -----------------------
 
-def test_add_item(client, mocker):
-    fake_restaurant = mocker.Mock()
-    fake_restaurant.id = "fake-id-123"
-
-    mocker.patch("flask_login.utils._get_user", return_value=fake_restaurant)
-    mocker.patch("app.routes.upload_image_to_supabase",
-                 return_value="http://fake-url.com/image.png")
-
-    fake_category = Category(category="Entradas", restaurant_id=fake_restaurant.id)
-    fake_category.id = "cat-123"
-
-    mocker.patch("app.models.Category.query.get", return_value=fake_category)
-    mocker.patch("app.db.session.add")
-    mocker.patch("app.db.session.commit")
+def test_add_item(db_client, restaurant, add_category, fake_storage):
+    login_as(db_client, restaurant)
+    category = add_category(restaurant.id)
 
     data = {
         "name": "Pizza",
         "price": "12.5",
         "description": "Muy rica",
-        "image": (io.BytesIO(b"fake-image-data"), "pizza.png"),
+        "image": (io.BytesIO(make_image()), "pizza.png"),
     }
 
-    response = client.post(f"/add_item/{fake_category.id}",
-                           data=data,
-                           content_type="multipart/form-data",
-                           follow_redirects=True)
+    response = db_client.post(f"/add_item/{category.id}",
+                              data=data,
+                              content_type="multipart/form-data",
+                              follow_redirects=True)
     assert "Plato agregado con éxito" in response.data.decode("utf-8")
+    # la imagen se sube con la cola, no desde la ruta
+    assert MenuItem.query.one().image == "http://fake-storage/menu/pizza_full.webp"
+    assert "menu/pizza_full.webp" in fake_storage.objects
 
 
 def test_edit_item_no_permission(client, mocker):
@@ -139,43 +132,28 @@ def test_edit_item_no_permission(client, mocker):
 # Autenticación
 # -----------------------
 
-def test_login_invalid_credentials(client, mocker):
-    fake_restaurant = Restaurant(name="RestFail", schedule="9-5",
-                                 location="TestCity", description="test", image="url")
-    fake_restaurant.set_password("Password123")
-
-    mocker.patch("app.models.Restaurant.query.filter_by",
-                 return_value=mocker.Mock(first=lambda: fake_restaurant))
-    mocker.patch.object(fake_restaurant, "check_password", return_value=False)
-
-    response = client.post("/login",
-                           data={"name": "RestFail", "password": "wrong"},
-                           follow_redirects=True)
+def test_login_invalid_credentials(db_client, restaurant):
+    response = db_client.post("/login",
+                              data={"name": "Resto Test", "password": "wrong"},
+                              follow_redirects=True)
     assert "incorrectos" in response.data.decode("utf-8")
 
 
-def test_register_restaurant(client, mocker):
-    mocker.patch("app.routes.upload_image_to_supabase",
-                 return_value="http://fake.url/image.png")
-
-    mocker.patch("app.models.Restaurant.query.filter_by",
-                 return_value=mocker.Mock(first=lambda: None))
-    mocker.patch("app.db.session.add")
-    mocker.patch("app.db.session.commit")
-
+def test_register_restaurant(db_client, fake_storage):
     data = {
         "name": "NuevoRest",
         "password": "Password123",
         "schedule": "8-4",
         "location": "Bogotá",
         "description": "Un restaurante nuevo",
-        "image": (io.BytesIO(b"fake-image-data"), "resto.png"),
+        "image": (io.BytesIO(make_image()), "resto.png"),
     }
-    response = client.post("/register",
-                           data=data,
-                           content_type="multipart/form-data",
-                           follow_redirects=True)
+    response = db_client.post("/register",
+                              data=data,
+                              content_type="multipart/form-data",
+                              follow_redirects=True)
     assert "Restaurante registrado con éxito" in response.data.decode("utf-8")
+    assert Restaurant.find_by_name("NuevoRest").image == "http://fake-storage/restaurants/resto_full.webp"
 
 
 def test_register_missing_fields(client):
@@ -190,9 +168,7 @@ def test_register_missing_fields(client):
     assert "Todos los campos son obligatorios" in response.data.decode("utf-8")
 
 
-def test_register_invalid_password(client, mocker):
-    mocker.patch("app.models.Restaurant.query.filter_by",
-                 return_value=mocker.Mock(first=lambda: None))
+def test_register_invalid_password(db_client):
     data = {
         "name": "WeakRest",
         "password": "weak",
@@ -201,10 +177,10 @@ def test_register_invalid_password(client, mocker):
         "description": "Desc",
         "image": (io.BytesIO(b"fake"), "weak.png"),
     }
-    response = client.post("/register",
-                           data=data,
-                           content_type="multipart/form-data",
-                           follow_redirects=True)
+    response = db_client.post("/register",
+                              data=data,
+                              content_type="multipart/form-data",
+                              follow_redirects=True)
     assert "La contraseña debe tener" in response.data.decode("utf-8")
 
 
@@ -220,25 +196,20 @@ def test_logout(client, mocker):
 # Extra - Cobertura
 # -----------------------
 
-def test_register_duplicate_restaurant(client, mocker):
+def test_register_duplicate_restaurant(db_client, restaurant):
     """Registro falla si el nombre ya existe"""
-    fake_restaurant = Restaurant(name="Duplicado", schedule="9-5",
-                                 location="City", description="desc", image="url")
-    mocker.patch("app.models.Restaurant.query.filter_by",
-                 return_value=mocker.Mock(first=lambda: fake_restaurant))
-
     data = {
-        "name": "Duplicado",
+        "name": "Resto Test",
         "password": "Password123",
         "schedule": "9-5",
         "location": "Medellín",
         "description": "resto",
         "image": (io.BytesIO(b"fake-img"), "dup.png"),
     }
-    response = client.post("/register",
-                           data=data,
-                           content_type="multipart/form-data",
-                           follow_redirects=True)
+    response = db_client.post("/register",
+                              data=data,
+                              content_type="multipart/form-data",
+                              follow_redirects=True)
     assert "ya está registrado" in response.data.decode("utf-8")
 
 
@@ -258,14 +229,11 @@ def test_delete_category_no_permission(client, mocker):
     assert "No tienes permiso" in response.data.decode("utf-8")
 
 
-def test_login_nonexistent_user(client, mocker):
+def test_login_nonexistent_user(db_client, restaurant):
     """Login con usuario inexistente"""
-    mocker.patch("app.models.Restaurant.query.filter_by",
-                 return_value=mocker.Mock(first=lambda: None))
-
-    response = client.post("/login",
-                           data={"name": "NoExiste", "password": "1234"},
-                           follow_redirects=True)
+    response = db_client.post("/login",
+                              data={"name": "NoExiste", "password": "Password123"},
+                              follow_redirects=True)
     assert "incorrectos" in response.data.decode("utf-8")
 
 
@@ -289,6 +257,7 @@ def test_add_item_invalid_category(client, mocker):
                            follow_redirects=True)
     assert "Categoría no encontrada" in response.data.decode("utf-8")
 
+import hashlib
 import io
 import pytest
 from app.utils import upload_image_to_supabase
@@ -328,25 +297,24 @@ def test_upload_image_exception(mocker):
 
 
 def test_upload_image_generates_unique_name(mocker):
-    """El nombre generado debe contener el folder y el nombre original"""
+    """El nombre generado es folder/<sha256 del contenido><extensión>"""
     fake_file = io.BytesIO(b"more-bytes")
     fake_file.filename = "foto.png"
 
     mock_storage = mocker.Mock()
     mock_storage.upload.return_value = True
-    mock_storage.get_public_url.return_value = "http://fake/foto.png"
+    mock_storage.get_public_url.side_effect = lambda name: f"http://fake/{name}"
 
     mock_client = mocker.Mock()
     mock_client.storage.from_.return_value = mock_storage
 
     mocker.patch("app.utils.supabase", mock_client)
-    mock_uuid = mocker.patch("app.utils.uuid.uuid4", return_value=mocker.Mock(hex="abc123"))
 
     result = upload_image_to_supabase(fake_file, folder="custom-folder")
 
-    assert "custom-folder" in result
-    assert "foto.png" in result
-    mock_uuid.assert_called_once()
+    expected = f"custom-folder/{hashlib.sha256(b'more-bytes').hexdigest()}.png"
+    assert result == f"http://fake/{expected}"
+    assert mock_storage.upload.call_args.args[0] == expected
 
 
 def test_upload_image_reads_file(mocker):
@@ -0,0 +1,69 @@
+from app import db
+from app.models import Restaurant
+from app.pagination import encode_cursor
+
+
+def test_search_items_ranks_name_matches_first(db_client, restaurant, add_category):
+    add_category(restaurant.id, [
+        {"name": "Lasaña", "description": "Con salsa de pizza"},
+        {"name": "Pizza Margarita", "description": "Tomate y albahaca"},
+        {"name": "Ensalada", "description": "Verde"},
+    ], name="Platos")
+
+    data = db_client.get("/api/search?q=pizza").get_json()
+
+    assert [r["name"] for r in data["results"]] == ["Pizza Margarita", "Lasaña"]
+    assert data["results"][0]["restaurant"]["name"] == "Resto Test"
+    assert data["results"][0]["category"] == "Platos"
+    assert data["next"] is None
+
+
+def test_search_keyset_pagination(db_client, restaurant, add_category):
+    add_category(restaurant.id, [{"name": f"Pizza {i}", "description": ""} for i in range(5)])
+
+    seen, cursor = [], None
+    while True:
+        url = "/api/search?q=pizza&limit=2" + (f"&after={cursor}" if cursor else "")
+        data = db_client.get(url).get_json()
+        seen.extend(r["id"] for r in data["results"])
+        cursor = data["next"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == 5
+
+
+def test_search_restaurants(db_client, restaurant):
+    other = Restaurant(name="Pizzería Napoli", password_hash="x", description="Horno de leña")
+    db.session.add(other)
+    db.session.commit()
+
+    data = db_client.get("/api/search?q=napoli&type=restaurants").get_json()
+
+    assert [r["name"] for r in data["results"]] == ["Pizzería Napoli"]
+
+
+def test_search_validates_parameters(db_client):
+    assert db_client.get("/api/search").status_code == 400
+    assert db_client.get("/api/search?q=x&type=otros").status_code == 400
+    assert db_client.get("/api/search?q=x&after=basura").status_code == 400
+    # forma válida pero con tipos equivocados
+    assert db_client.get(f"/api/search?q=x&after={encode_cursor('1', 5)}").status_code == 400
+
+
+def test_create_all_adds_search_columns_only_on_postgres(db_app):
+    from sqlalchemy import create_mock_engine
+
+    statements = []
+    engine = create_mock_engine("postgresql+psycopg2://", lambda sql, *a, **kw: statements.append(
+        str(sql.compile(dialect=engine.dialect))))
+    db.metadata.create_all(engine, checkfirst=False)
+
+    ddl = "\n".join(statements)
+    for table in ("menu_items", "restaurants"):
+        assert f"ALTER TABLE restaurant.{table} ADD COLUMN search_vector tsvector" in ddl
+        assert f"ix_{table}_search_vector ON restaurant.{table} USING gin (search_vector)" in ddl
+        assert f"ix_{table}_name_trgm ON restaurant.{table} USING gin (name gin_trgm_ops)" in ddl
+    # en SQLite (db_app) la tabla se creó sin la columna
+    columns = db.session.execute(db.text("PRAGMA restaurant.table_info(menu_items)")).all()
+    assert "search_vector" not in {column.name for column in columns}
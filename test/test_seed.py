@@ -0,0 +1,50 @@
+import random
+
+from app import db
+from app.models import Category, MenuItem, Restaurant
+from app.seed import seed_menu
+
+
+def _count(model):
+    return db.session.execute(db.select(db.func.count()).select_from(model)).scalar()
+
+
+def test_seed_command_generates_menus(db_app):
+    result = db_app.test_cli_runner().invoke(
+        args=["seed", "--restaurants", "3", "--categories", "4", "--items", "5", "--batch-size", "7"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "3 restaurantes, 12 categorías y 60 platillos creados." in result.output
+    assert (_count(Restaurant), _count(Category), _count(MenuItem)) == (3, 12, 60)
+
+
+def test_seed_menu_realistic_values(db_app):
+    restaurant_ids = seed_menu(2, 30, 10, rng=random.Random(1))
+
+    restaurant = db.session.get(Restaurant, restaurant_ids[0])
+    assert restaurant.check_password("Password123")
+    names = db.session.execute(
+        db.select(Category.category).where(Category.restaurant_id == restaurant.id)
+    ).scalars().all()
+    # los nombres se repiten con sufijo cuando hay más categorías que nombres base
+    assert len(set(names)) == 30
+
+    prices = db.session.execute(db.select(MenuItem.price)).scalars().all()
+    assert all(price >= 2 and price * 2 == int(price * 2) for price in prices)
+    assert 10 < sorted(prices)[len(prices) // 2] < 40
+
+
+def test_seed_menu_same_seed_same_ids(db_app):
+    first = seed_menu(2, 2, 2, rng=random.Random(7))
+    names = db.session.execute(db.select(Restaurant.name).order_by(Restaurant.name)).scalars().all()
+    db.session.execute(db.delete(MenuItem))
+    db.session.execute(db.delete(Category))
+    db.session.execute(db.delete(Restaurant))
+    db.session.commit()
+
+    assert seed_menu(2, 2, 2, rng=random.Random(7)) == first
+    assert db.session.execute(
+        db.select(Restaurant.name).order_by(Restaurant.name)
+    ).scalars().all() == names
+    assert all(restaurant_id.version == 4 for restaurant_id in first)
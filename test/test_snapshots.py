@@ -0,0 +1,92 @@
+from app import db
+from app.cache import menu_cache
+from app.models import Category, MenuItem, MenuSnapshot
+from app.snapshots import build_menu_document, check_snapshots, rebuild_snapshot
+from conftest import count_queries, login_as
+
+
+def _snapshot(restaurant_id):
+    db.session.expire_all()
+    return db.session.get(MenuSnapshot, restaurant_id)
+
+
+def test_writes_leave_snapshot_stale_until_read(db_client, restaurant):
+    restaurant_id = restaurant.id
+    login_as(db_client, restaurant_id)
+
+    db_client.post("/add_category", data={"category": "Entradas"})
+    category_id = db.session.query(Category).one().id
+    with count_queries() as statements:
+        db_client.post(f"/add_item/{category_id}", data={"name": "Empanadas", "price": "8", "description": ""})
+    # escribir no arma el menú ni toca el snapshot
+    assert not any("menu_snapshots" in s for s in statements)
+    assert _snapshot(restaurant_id) is None
+
+    db_client.get(f"/api/restaurants/{restaurant_id}/menu")
+    snapshot = _snapshot(restaurant_id)
+    assert snapshot.version == 2
+    assert snapshot.document["categories"][0]["items"][0]["name"] == "Empanadas"
+    assert check_snapshots([restaurant_id]) == []
+
+    item_id = db.session.query(MenuItem).one().id
+    db_client.post(f"/delete_item/{item_id}")
+    assert _snapshot(restaurant_id).version == 2
+    response = db_client.get(f"/api/restaurants/{restaurant_id}/menu")
+    assert response.get_json()["categories"][0]["items"] == []
+    assert _snapshot(restaurant_id).version == 3
+
+
+def test_rebuild_never_replaces_newer_snapshot(db_app, restaurant):
+    restaurant_id = restaurant.id
+    rebuild_snapshot(restaurant_id)
+    db.session.execute(db.update(MenuSnapshot).values(version=5))
+    db.session.commit()
+
+    rebuild_snapshot(restaurant_id)
+    db.session.commit()
+
+    assert _snapshot(restaurant_id).version == 5
+
+
+def test_menu_api_reads_snapshot_row(db_client, restaurant):
+    restaurant_id = restaurant.id
+    login_as(db_client, restaurant_id)
+    db_client.post("/add_category", data={"category": "Entradas"})
+    db_client.get(f"/api/restaurants/{restaurant_id}/menu")  # reconstruye el snapshot
+    menu_cache.clear()
+
+    with count_queries() as statements:
+        response = db_client.get(f"/api/restaurants/{restaurant_id}/menu")
+
+    assert response.get_json()["categories"][0]["name"] == "Entradas"
+    assert not any("restaurant.categories" in s or "restaurant.menu_items" in s for s in statements)
+
+
+def test_check_detects_inconsistent_snapshot(db_app, restaurant):
+    restaurant_id = restaurant.id
+    rebuild_snapshot(restaurant_id)
+    # una fila cambiada sin pasar por bump_menu_version
+    db.session.add(Category(category="Sin versión", restaurant_id=restaurant_id))
+    db.session.commit()
+
+    assert check_snapshots([restaurant_id]) == [(restaurant_id, "el documento no coincide con las tablas")]
+
+
+def test_rebuild_and_check_commands(db_app, restaurant):
+    restaurant_id = restaurant.id
+    runner = db_app.test_cli_runner()
+
+    result = runner.invoke(args=["menu", "rebuild"])
+    assert "1 snapshots reconstruidos." in result.output
+    assert _snapshot(restaurant_id).document == build_menu_document(restaurant_id)
+
+    db.session.add(Category(category="Entradas", restaurant_id=restaurant_id))
+    db.session.commit()
+    result = runner.invoke(args=["menu", "check"])
+    assert result.exit_code == 1
+    assert "no coincide" in result.output
+
+    result = runner.invoke(args=["menu", "check", "--fix"])
+    result = runner.invoke(args=["menu", "check"])
+    assert result.exit_code == 0
+    assert "Todos los snapshots están al día." in result.output
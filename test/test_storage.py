@@ -0,0 +1,147 @@
+import io
+import os
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from app import create_app, storage
+from app.models import ImageUpload, MenuItem, Restaurant
+from app.storage import CACHE_CONTROL, LocalStorage, S3Storage, Storage, SupabaseStorage, create_storage
+from app.utils import content_hash
+from conftest import login_as, make_image
+
+
+def _file(data=b"bytes", filename="Foto.PNG"):
+    return FileStorage(stream=io.BytesIO(data), filename=filename)
+
+
+@pytest.fixture
+def local_storage(db_app, tmp_path):
+    backend = db_app.extensions["storage"] = LocalStorage(str(tmp_path / "media"))
+    db_app.register_blueprint(storage.bp)
+    return backend
+
+
+def test_backend_selected_by_config(tmp_path):
+    assert isinstance(create_app().extensions["storage"], SupabaseStorage)
+
+    app = create_app({"STORAGE_BACKEND": "local", "LOCAL_STORAGE_DIR": str(tmp_path)})
+    assert isinstance(app.extensions["storage"], LocalStorage)
+    assert "media.media" in app.view_functions
+
+    config = dict(app.config, STORAGE_BACKEND="ftp")
+    with pytest.raises(ValueError):
+        create_storage(config)
+
+
+def test_incomplete_backend_fails_on_construction():
+    class OnlyPut(Storage):
+        def put(self, name, stream, content_type):
+            return name
+
+    with pytest.raises(TypeError):
+        OnlyPut()
+
+
+def test_location_identifies_backend_and_bucket(tmp_path, mocker):
+    locations = {
+        LocalStorage(str(tmp_path / "a")).location,
+        LocalStorage(str(tmp_path / "b")).location,
+        S3Storage("menus", client=mocker.Mock()).location,
+        S3Storage("fotos", client=mocker.Mock()).location,
+        SupabaseStorage("menus", "http://supabase").location,
+    }
+    # el índice de contenido (stored_images) se separa por location
+    assert len(locations) == 5
+
+
+def test_local_storage_put_and_delete(tmp_path):
+    backend = LocalStorage(str(tmp_path), base_url="https://cdn.example.com/")
+
+    url = backend.upload(_file(), folder="menu")
+
+    name = f"menu/{content_hash(b'bytes')}.png"
+    assert url == f"https://cdn.example.com/{name}"
+    assert (tmp_path / name).read_bytes() == b"bytes"
+    backend.delete(name)
+    assert not (tmp_path / name).exists()
+    backend.delete(name)  # borrar algo que no existe no falla
+
+    with pytest.raises(ValueError):
+        backend.put("../fuera.png", io.BytesIO(b"x"), "image/png")
+
+
+def test_register_stores_image_locally(db_client, local_storage):
+    response = db_client.post("/register", data={
+        "name": "LocalRest", "password": "Password123", "schedule": "8-4",
+        "location": "Bogotá", "description": "desc",
+        "image": (io.BytesIO(make_image()), "resto.jpg"),
+    }, content_type="multipart/form-data")
+    assert response.status_code == 302
+
+    assert ImageUpload.query.one().status == ImageUpload.DONE
+    restaurant = Restaurant.query.filter_by(name="LocalRest").one()
+    assert restaurant.image.startswith("/media/restaurants/")
+
+    response = db_client.get(restaurant.image)
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == CACHE_CONTROL
+    assert response.data[:4] == b"RIFF"  # WEBP
+    assert db_client.get("/media/restaurants/no-existe.webp").status_code == 404
+
+
+def test_switching_backend_uploads_again(db_app, db_client, restaurant, add_category, local_storage, tmp_path):
+    category_id = add_category(restaurant.id).id
+    login_as(db_client, restaurant)
+    image = make_image()
+
+    def add_item(name):
+        db_client.post(f"/add_item/{category_id}", data={
+            "name": name, "price": "10", "description": "desc",
+            "image": (io.BytesIO(image), "plato.jpg"),
+        }, content_type="multipart/form-data")
+        return MenuItem.query.filter_by(name=name).one().image
+
+    first = add_item("Primero")
+    other = db_app.extensions["storage"] = LocalStorage(str(tmp_path / "otro"), base_url="http://otro")
+    second = add_item("Segundo")
+
+    # los mismos bytes se suben al backend nuevo en lugar de reusar la URL del anterior
+    assert first.startswith("/media/menu/")
+    assert second == "http://otro/" + first.removeprefix("/media/")
+    assert os.path.exists(other.path(first.removeprefix("/media/")))
+
+
+def test_s3_storage_uploads_with_cache_headers(mocker):
+    client = mocker.Mock()
+    backend = S3Storage("menus", endpoint_url="http://minio:9000", client=client)
+
+    url = backend.upload(_file(), folder="menu")
+
+    name = f"menu/{content_hash(b'bytes')}.png"
+    assert url == f"http://minio:9000/menus/{name}"
+    stream, bucket, key = client.upload_fileobj.call_args.args
+    assert (stream.read(), bucket, key) == (b"bytes", "menus", name)
+    assert client.upload_fileobj.call_args.kwargs["ExtraArgs"] == {
+        "ContentType": "image/png", "CacheControl": CACHE_CONTROL,
+    }
+    backend.delete(name)
+    client.delete_object.assert_called_once_with(Bucket="menus", Key=name)
+
+    public = S3Storage("menus", public_url="https://img.example.com/", client=client)
+    assert public.get_url("a.png") == "https://img.example.com/a.png"
+
+
+def test_supabase_storage_uses_shared_client(mocker):
+    bucket = mocker.Mock()
+    bucket.get_public_url.side_effect = lambda name: f"http://fake/{name}"
+    mock_client = mocker.Mock()
+    mock_client.storage.from_.return_value = bucket
+    mocker.patch("app.utils.supabase", mock_client)
+
+    url = SupabaseStorage("fotos").upload(_file(), folder="menu")
+
+    assert url == f"http://fake/menu/{content_hash(b'bytes')}.png"
+    mock_client.storage.from_.assert_called_with("fotos")
+    SupabaseStorage("fotos").delete("menu/a.png")
+    bucket.remove.assert_called_once_with(["menu/a.png"])
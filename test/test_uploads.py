@@ -0,0 +1,188 @@
+import io
+import os
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from werkzeug.datastructures import FileStorage
+
+from app import db
+from app.models import ImageUpload, MenuItem, Restaurant, StoredImage
+from app.uploads import upload_queue
+from app.utils import content_hash, upload_image_to_supabase
+from conftest import login_as, make_image
+
+
+def test_register_uploads_image_in_background(db_client, fake_storage):
+    data = {
+        "name": "NuevoRest",
+        "password": "Password123",
+        "schedule": "8-4",
+        "location": "Bogotá",
+        "description": "Un restaurante nuevo",
+        "image": (io.BytesIO(make_image()), "resto.jpg"),
+    }
+    response = db_client.post("/register", data=data,
+                              content_type="multipart/form-data", follow_redirects=True)
+    assert "Restaurante registrado con éxito" in response.get_data(as_text=True)
+
+    restaurant = Restaurant.query.filter_by(name="NuevoRest").first()
+    job = ImageUpload.query.one()
+    assert job.status == ImageUpload.DONE
+    assert job.target_id == restaurant.id
+    assert restaurant.image == "http://fake-storage/restaurants/resto_full.webp"
+    assert set(restaurant.image_variants) == {"thumbnail", "card", "full"}
+    assert restaurant.image_variants["card"]["width"] == 480
+    assert "restaurants/resto_thumbnail.webp" in fake_storage.objects
+    # el archivo temporal se borra al terminar
+    assert not os.path.exists(job.staged_path)
+
+
+def test_add_item_retries_failed_uploads(db_client, restaurant, add_category, fake_storage):
+    login_as(db_client, restaurant)
+    category_id = add_category(restaurant.id).id
+    fake_storage.failures = 2
+
+    db_client.post(f"/add_item/{category_id}", data={
+        "name": "Pizza",
+        "price": "12.5",
+        "description": "Muy rica",
+        "image": (io.BytesIO(make_image()), "pizza.png"),
+    }, content_type="multipart/form-data")
+
+    job = ImageUpload.query.one()
+    assert job.status == ImageUpload.DONE
+    assert job.attempts == 3
+    assert MenuItem.query.one().image == "http://fake-storage/menu/pizza_full.webp"
+
+
+def test_upload_marked_failed_after_max_attempts(db_client, restaurant, add_category, fake_storage):
+    login_as(db_client, restaurant)
+    category_id = add_category(restaurant.id).id
+    fake_storage.failures = 10
+
+    db_client.post(f"/add_item/{category_id}", data={
+        "name": "Pizza",
+        "price": "12.5",
+        "description": "Muy rica",
+        "image": (io.BytesIO(make_image()), "pizza.png"),
+    }, content_type="multipart/form-data")
+
+    job = ImageUpload.query.one()
+    assert job.status == ImageUpload.FAILED
+    assert job.attempts == upload_queue.max_attempts
+    assert "storage timeout" in job.last_error
+    # el platillo queda guardado sin imagen y el archivo sigue disponible para reintentar
+    assert MenuItem.query.one().image is None
+    assert os.path.exists(job.staged_path)
+
+
+def test_failed_uploads_can_be_retried_from_cli(db_app, db_client, restaurant, add_category, fake_storage):
+    login_as(db_client, restaurant)
+    category_id = add_category(restaurant.id).id
+    fake_storage.failures = upload_queue.max_attempts
+
+    db_client.post(f"/add_item/{category_id}", data={
+        "name": "Pizza",
+        "price": "12.5",
+        "description": "Muy rica",
+        "image": (io.BytesIO(make_image()), "pizza.png"),
+    }, content_type="multipart/form-data")
+    assert ImageUpload.query.one().status == ImageUpload.FAILED
+
+    runner = db_app.test_cli_runner()
+    # sin --failed los trabajos fallidos no se tocan
+    assert "0 subidas completadas" in runner.invoke(args=["uploads", "process"]).output
+    result = runner.invoke(args=["uploads", "process", "--failed"])
+
+    assert "1 subidas completadas, 0 fallidas, 1 recuperadas." in result.output
+    db.session.expire_all()
+    job = ImageUpload.query.one()
+    assert job.status == ImageUpload.DONE
+    assert job.attempts == 1
+    assert MenuItem.query.one().image == "http://fake-storage/menu/pizza_full.webp"
+
+
+def test_invalid_image_is_not_retried(db_client, restaurant, add_category, fake_storage):
+    login_as(db_client, restaurant)
+    category_id = add_category(restaurant.id).id
+
+    db_client.post(f"/add_item/{category_id}", data={
+        "name": "Pizza",
+        "price": "12.5",
+        "description": "Muy rica",
+        "image": (io.BytesIO(b"no-es-una-imagen"), "pizza.png"),
+    }, content_type="multipart/form-data")
+
+    job = ImageUpload.query.one()
+    assert job.status == ImageUpload.FAILED
+    assert job.attempts == 1
+    assert fake_storage.objects == {}
+
+
+def test_identical_images_are_uploaded_once(db_client, restaurant, add_category, fake_storage):
+    login_as(db_client, restaurant)
+    category_id = add_category(restaurant.id).id
+    photo = make_image()
+    upload_queue.dedup_hits = 0
+
+    for name in ("Pizza", "Pizza grande"):
+        db_client.post(f"/add_item/{category_id}", data={
+            "name": name,
+            "price": "12.5",
+            "description": "Muy rica",
+            "image": (io.BytesIO(photo), f"{name}.jpg"),
+        }, content_type="multipart/form-data")
+
+    first, second = MenuItem.query.order_by(MenuItem.name).all()
+    assert first.image_variants == second.image_variants
+    # solo se subieron las tres versiones de la primera imagen
+    assert len(fake_storage.objects) == 3
+    assert upload_queue.dedup_hits == 3
+    assert StoredImage.query.count() == 3
+
+
+def test_staged_file_removed_when_commit_fails(db_app, db_client, restaurant, add_category, fake_storage, mocker):
+    login_as(db_client, restaurant)
+    category_id = add_category(restaurant.id).id
+    mocker.patch("app.routes.db.session.commit", side_effect=OperationalError("COMMIT", {}, Exception("caída")))
+
+    with pytest.raises(OperationalError):
+        db_client.post(f"/add_item/{category_id}", data={
+            "name": "Pizza", "price": "12.5", "description": "Muy rica",
+            "image": (io.BytesIO(make_image()), "pizza.png"),
+        }, content_type="multipart/form-data")
+
+    # el archivo se guardó antes del commit; al no confirmarse, se borra
+    assert os.listdir(db_app.config["UPLOAD_SPOOL_DIR"]) == []
+    assert ImageUpload.query.count() == 0
+
+
+def test_recover_submits_jobs_left_pending(db_app, restaurant, add_category, fake_storage):
+    category = add_category(restaurant.id, ["Pizza"])
+    item = category.items[0]
+    # un proceso anterior guardó el trabajo pero murió antes de enviarlo
+    job = upload_queue.stage(FileStorage(io.BytesIO(make_image()), "pizza.jpg"), "menu", item, restaurant.id)
+    db.session.commit()
+
+    assert upload_queue.recover() == 1
+
+    db.session.expire_all()
+    assert db.session.get(ImageUpload, job.id).status == ImageUpload.DONE
+    assert db.session.get(MenuItem, item.id).image == "http://fake-storage/menu/pizza_full.webp"
+
+
+def test_upload_image_to_supabase_uses_content_hash(mocker):
+    mock_storage = mocker.Mock()
+    mock_storage.get_public_url.side_effect = lambda name: f"http://fake/{name}"
+    mock_client = mocker.Mock()
+    mock_client.storage.from_.return_value = mock_storage
+    mocker.patch("app.utils.supabase", mock_client)
+
+    file = io.BytesIO(b"same-bytes")
+    file.filename = "Foto.PNG"
+    url = upload_image_to_supabase(file, folder="menu")
+
+    assert url == f"http://fake/menu/{content_hash(b'same-bytes')}.png"
+    name, data, options = mock_storage.upload.call_args.args
+    assert data == b"same-bytes"
+    assert options["content-type"] == "image/png"
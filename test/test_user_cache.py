@@ -0,0 +1,105 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app import db
+from app.cache import user_cache
+from app.models import Restaurant, SessionUser
+from conftest import login_as
+
+
+@contextmanager
+def restaurant_lookups():
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "FROM restaurant.restaurants" in statement and "password_hash" in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def test_cached_user_skips_primary_key_lookup(db_client, restaurant):
+    login_as(db_client, restaurant)
+
+    with restaurant_lookups() as lookups:
+        db_client.get("/dashboard")
+        db_client.get("/dashboard")
+
+    assert len(lookups) == 1
+    assert user_cache.stats()["hits"] == 1
+
+
+def test_session_user_is_detached_copy(db_client, restaurant):
+    login_as(db_client, restaurant)
+    db_client.get("/dashboard")
+
+    user = user_cache.get(str(restaurant.id))
+    assert isinstance(user, SessionUser)
+    assert user.get_id() == str(restaurant.id)
+    assert user.name == "Resto Test"
+    assert not hasattr(user, "password_hash")
+
+
+def test_profile_update_invalidates_cached_user(db_client, restaurant):
+    restaurant_id = restaurant.id
+    login_as(db_client, restaurant)
+    db_client.get("/dashboard")
+
+    db.session.get(Restaurant, restaurant_id).location = "Medellín"
+    db.session.commit()
+
+    assert user_cache.get(str(restaurant_id)) is None
+    assert "Medellín" in db_client.get("/dashboard").get_data(as_text=True)
+
+
+def test_user_cache_can_be_disabled(db_app, db_client, restaurant):
+    db_app.config["USER_CACHE_ENABLED"] = False
+    login_as(db_client, restaurant)
+
+    with restaurant_lookups() as lookups:
+        db_client.get("/dashboard")
+        db_client.get("/dashboard")
+
+    assert len(lookups) == 2
+    assert len(user_cache) == 0
+
+
+def test_malformed_session_id_is_anonymous(db_client):
+    with db_client.session_transaction() as session:
+        session["_user_id"] = "no-es-un-uuid"
+        session["_fresh"] = True
+
+    response = db_client.get("/dashboard")
+    assert response.status_code == 302
+
+
+def test_cached_user_invalidated_on_commit_not_flush(db_client, restaurant):
+    restaurant_id = restaurant.id
+    login_as(db_client, restaurant)
+    db_client.get("/dashboard")
+
+    db.session.get(Restaurant, restaurant_id).location = "Medellín"
+    db.session.flush()
+    # otra petición que lea antes del commit vuelve a cachear la fila vieja
+    assert user_cache.get(str(restaurant_id)) is not None
+    db.session.commit()
+
+    assert user_cache.get(str(restaurant_id)) is None
+
+
+def test_rollback_keeps_cached_user(db_client, restaurant):
+    restaurant_id = restaurant.id
+    login_as(db_client, restaurant)
+    db_client.get("/dashboard")
+
+    db.session.get(Restaurant, restaurant_id).location = "Medellín"
+    db.session.flush()
+    db.session.rollback()
+    db.session.commit()
+
+    assert user_cache.get(str(restaurant_id)).location != "Medellín"